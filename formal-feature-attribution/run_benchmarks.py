@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de desempenho dos métodos de atribuição
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from attribution_benchmark import (BENCHMARKS, DEFAULT_ESTIMATORS, DEFAULT_FEATURES, DEFAULT_INSTANCES,
+                                   compare_results, load_results, run_benchmarks, save_results)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks dos métodos de atribuição')
+    parser.add_argument('--features', nargs='+', type=int, default=list(DEFAULT_FEATURES))
+    parser.add_argument('--estimators', nargs='+', type=int, default=list(DEFAULT_ESTIMATORS))
+    parser.add_argument('--instances', nargs='+', type=int, default=list(DEFAULT_INSTANCES))
+    parser.add_argument('--benchmarks', nargs='+', default=None,
+                        help=f"Nomes ou prefixos (ex.: approx.); disponíveis: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Execuções cronometradas por ponto (vale a menor)')
+    parser.add_argument('--output', default=None,
+                        help='Arquivo JSON de saída (padrão: data/benchmarks/benchmark_<data>.json)')
+    parser.add_argument('--compare', default=None,
+                        help='JSON de uma execução anterior; regressões encerram com código 1')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Aumento relativo tolerado na comparação')
+    
+    args = parser.parse_args()
+    
+    results = run_benchmarks(args.features, args.estimators, args.instances,
+                             benchmarks=args.benchmarks, repeat=args.repeat)
+    
+    output = args.output or os.path.join(
+        'data', 'benchmarks', f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    save_results(results, output)
+    print(f"\n✅ Resultados salvos em: {output}")
+    
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results, args.threshold)
+        if not regressions:
+            print(f"✅ Nenhuma regressão em relação a {args.compare}")
+            return 0
+        print(f"⚠️  {len(regressions)} regressões em relação a {args.compare}:")
+        for r in regressions:
+            print(f"   {r['benchmark']} f={r['n_features']} e={r['n_estimators']} n={r['n_instances']} "
+                  f"{r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} ({r['ratio']:.2f}x)")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,26 +4,86 @@ Script principal para executar todos os experimentos
 """
 
 import argparse
-from src.experiments.section_5_1 import run_section_5_1
-from src.experiments.section_5_2 import run_section_5_2
-from src.utils.visualization import generate_final_report
+import os
+import sys
+from src.results_store import ResultsStore
+
+# Os módulos de src se importam sem o prefixo "src."; o profiler ativado aqui
+# precisa ser o mesmo módulo que eles usam
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+import profiling
+
+def run(args, store):
+    # Seções (scikit-learn, XGBoost, LIME, matplotlib) importadas só quando usadas
+    results_5_1 = None
+    if args.section in ['5.1', 'all']:
+        from src.experiments.section_5_1 import run_section_5_1
+        print("Executando experimentos da Seção 5.1")
+        results_5_1 = run_section_5_1(n_jobs=args.n_jobs, store=store, datasets=args.datasets)
+    
+    if args.section in ['5.2', 'all']:
+        from src.experiments.section_5_2 import run_section_5_2
+        print("Executando experimentos da Seção 5.2")
+        run_section_5_2(results_5_1, store=store)
+    
+    if args.section == 'img':
+        from src.experiments.images import DEFAULT_CHECKPOINTS, run_image_experiment
+        checkpoints = args.checkpoints or list(DEFAULT_CHECKPOINTS)
+        for dataset_name in args.image_datasets:
+            run_image_experiment(dataset_name, instances=args.instances, checkpoints=checkpoints,
+                                 output_dir=args.plots_dir or os.path.join(args.output_dir, 'plots', 'img'),
+                                 store=store)
+        return
+    
+    from src.utils.visualization import generate_report_from_store
+    generate_report_from_store(store, args.output_dir)
 
 def main():
     parser = argparse.ArgumentParser(description='Reprodução dos experimentos')
-    parser.add_argument('--section', choices=['5.1', '5.2', 'all'], default='all')
+    parser.add_argument('--section', choices=['5.1', '5.2', 'all', 'img'], default='all')
     parser.add_argument('--output-dir', default='data/results/')
+    parser.add_argument('--n-jobs', type=int, default=1,
+                        help='Processos para explicar instâncias em paralelo')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Descarta resultados gravados em vez de retomar a execução')
+    parser.add_argument('--datasets', nargs='+', default=None,
+                        help='Datasets da Seção 5.1 (sintéticos ou de datasets/tabular, ex.: compas)')
+    parser.add_argument('--image-datasets', nargs='+', default=['10,10_mnist_1v3'],
+                        help="Datasets de imagens para --section img (ex.: 10,10_mnist_1v7 ou 10,10_digits_1v3)")
+    parser.add_argument('--instances', nargs='+', type=int, default=[7],
+                        help='Instâncias de teste explicadas em --section img')
+    parser.add_argument('--checkpoints', nargs='+', type=float, default=None,
+                        help='Instantes (segundos) registrados em --section img '
+                             '(padrão: DEFAULT_CHECKPOINTS de src/experiments/images.py, 10 e 1200)')
+    parser.add_argument('--plots-dir', default=None,
+                        help='Diretório dos mapas de calor de --section img (padrão: <output-dir>/plots/img; '
+                             'plots/img na raiz do repositório guarda os PDFs de referência)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Registra tempos por etapa e chamadas ao modelo em profile.json e '
+                             'trace.json (Chrome trace) em --output-dir')
     
     args = parser.parse_args()
     
-    if args.section in ['5.1', 'all']:
-        print("Executando experimentos da Seção 5.1")
-        results_5_1 = run_section_5_1()
-    
-    if args.section in ['5.2', 'all']:
-        print("Executando experimentos da Seção 5.2")
-        results_5_2 = run_section_5_2(results_5_1)
+    # Resultados são gravados à medida que são calculados; uma nova execução
+    # retoma do ponto em que a anterior parou
+    store_path = os.path.join(args.output_dir, 'results.jsonl')
+    if args.fresh and os.path.exists(store_path):
+        os.remove(store_path)
+    store = ResultsStore(store_path)
     
-    generate_final_report(results_5_1, results_5_2, args.output_dir)
+    # Com --n-jobs > 1, as etapas executadas nos processos do pool não são registradas
+    profiler = profiling.enable() if args.profile else None
+    try:
+        run(args, store)
+    finally:
+        if profiler is not None:
+            profiling.disable()
+            os.makedirs(args.output_dir, exist_ok=True)
+            profiler.save_json(os.path.join(args.output_dir, 'profile.json'))
+            profiler.save_trace(os.path.join(args.output_dir, 'trace.json'))
+            print("\n⏱️  PERFIL DE EXECUÇÃO")
+            print(profiler.report())
+            print(f"   Perfil salvo em: {os.path.join(args.output_dir, 'profile.json')} e trace.json")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,17 +1,20 @@
+import hashlib
+import threading
 import numpy as np
-from sklearn.metrics import accuracy_score
-from sklearn.inspection import permutation_importance
-import lime
-import lime.lime_tabular
-from typing import List, Optional
+from typing import Dict, List, Optional
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from profiling import timed
+from shapley import SamplingShapley, sample_background
+from tree_shap import TreeSHAP
 
 
 class ApproximationMethods:
     """
     Implementa métodos de aproximação para comparação com FFA:
     - LIME
-    - SHAP (aproximação)
+    - SHAP (TreeSHAP exato em modelos de árvores; amostragem nos demais)
     - Permutation Importance
     """
     
@@ -19,9 +22,81 @@ class ApproximationMethods:
         self.model = model
         self.feature_names = feature_names
         self.n_features = len(feature_names)
+        self._tree_shap = None
+        self._tree_shap_checked = False
+        self._lime_explainers = {}
+    
+    def _permuted_scores(self, work: np.ndarray, X: np.ndarray, y: np.ndarray, feature: int,
+                         n_repeats: int, seed: int) -> np.ndarray:
+        """
+        Acurácias das n_repeats permutações de uma feature
+        
+        work é uma cópia de X reaproveitada entre as features: a coluna da
+        feature recebe cada permutação e volta ao valor original no final.
+        """
+        rng = np.random.RandomState(seed)
+        n = len(X)
+        scores = np.empty(n_repeats)
+        
+        try:
+            for r in range(n_repeats):
+                work[:, feature] = X[rng.permutation(n), feature]
+                scores[r] = np.mean(np.asarray(self.model.predict(work)) == y)
+        finally:
+            work[:, feature] = X[:, feature]
+        
+        return scores
+    
+    @timed('permutation')
+    def permutation_scores(self, X: np.ndarray, y: np.ndarray, n_repeats: int = 10,
+                           n_jobs: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Importância por permutação com n_repeats permutações por feature
+        
+        Args:
+            X: Dados de entrada
+            y: Labels
+            n_repeats: Número de permutações de cada feature
+            n_jobs: Threads avaliando features em paralelo (o modelo precisa
+                aceitar predict concorrente; cada thread tem a própria cópia de X)
+        
+        Returns:
+            dict: 'mean' e 'std' (queda de acurácia por feature),
+                'importances' (n_features, n_repeats) e 'baseline' (acurácia original)
+        """
+        from sklearn.metrics import accuracy_score
+        
+        X = np.asarray(X)
+        y = np.asarray(y)
+        n_repeats = max(1, n_repeats)
+        baseline = accuracy_score(y, self.model.predict(X))
+        # Sementes sorteadas antes da paralelização: resultado independe de n_jobs
+        seeds = np.random.randint(2 ** 31 - 1, size=self.n_features)
+        
+        # Uma única cópia de X por thread, reaproveitada em todas as features
+        workers = threading.local()
+        
+        def run(feature):
+            if not hasattr(workers, 'work'):
+                workers.work = X.copy()
+            return self._permuted_scores(workers.work, X, y, feature, n_repeats, int(seeds[feature]))
+        
+        if n_jobs > 1:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                permuted = list(executor.map(run, range(self.n_features)))
+        else:
+            permuted = [run(feature) for feature in range(self.n_features)]
+        
+        importances = baseline - np.array(permuted)
+        return {
+            'mean': importances.mean(axis=1),
+            'std': importances.std(axis=1),
+            'importances': importances,
+            'baseline': baseline
+        }
     
     def permutation_importance(self, X: np.ndarray, y: np.ndarray, 
-                             n_repeats: int = 10) -> np.ndarray:
+                             n_repeats: int = 10, n_jobs: int = 1) -> np.ndarray:
         """
         Calcula importância por permutação
         
@@ -29,36 +104,113 @@ class ApproximationMethods:
             X: Dados de entrada
             y: Labels
             n_repeats: Número de repetições
-            
+            n_jobs: Threads avaliando features em paralelo
+        
         Returns:
             np.ndarray: Scores de importância normalizados
         """
         try:
-            # Implementação simplificada para controle
-            baseline_score = accuracy_score(y, self.model.predict(X))
-            importances = np.zeros(self.n_features)
-            
-            for i in range(self.n_features):
-                X_permuted = X.copy()
-                # Permuta a feature i
-                X_permuted[:, i] = np.random.permutation(X_permuted[:, i])
-                permuted_score = accuracy_score(y, self.model.predict(X_permuted))
-                importances[i] = max(0, baseline_score - permuted_score)
+            importances = np.maximum(0, self.permutation_scores(X, y, n_repeats, n_jobs)['mean'])
             
             # Normaliza
             if np.sum(importances) > 0:
                 importances = importances / np.sum(importances)
             else:
                 importances = np.ones(self.n_features) / self.n_features
-                
-            return importances
             
+            return importances
+        
         except Exception as e:
             warnings.warn(f"Erro em permutation importance: {e}")
             return np.ones(self.n_features) / self.n_features
     
+    def lime_explainer(self, X: np.ndarray, seed: int = 42) -> 'lime.lime_tabular.LimeTabularExplainer':
+        """
+        Explicador LIME dos dados X, construído uma única vez por conjunto
+        
+        As estatísticas de treino e os quartis do discretizador são calculados
+        na construção; o explicador é reaproveitado enquanto X não mudar.
+        A semente é restaurada a cada uso, de modo que cada instância recebe a
+        mesma vizinhança que receberia de um explicador novo.
+        
+        Args:
+            X: Dados de entrada
+            seed: Semente da amostragem da vizinhança
+        
+        Returns:
+            LimeTabularExplainer: Explicador em cache
+        """
+        import lime.lime_tabular
+        
+        X = np.ascontiguousarray(X)
+        key = (X.shape, X.dtype.str, hashlib.sha1(X.tobytes()).hexdigest())
+        explainer = self._lime_explainers.get(key)
+        if explainer is None:
+            explainer = lime.lime_tabular.LimeTabularExplainer(
+                X,
+                feature_names=self.feature_names,
+                class_names=self._class_names(),
+                mode='classification',
+                random_state=seed
+            )
+            self._lime_explainers[key] = explainer
+        self._reseed_lime(explainer, seed)
+        return explainer
+    
+    def _class_names(self) -> Optional[List[str]]:
+        # Nomes exibidos pelo LIME; sem classes_ o LIME numera as colunas de predict_proba
+        classes = getattr(self.model, 'classes_', None)
+        return None if classes is None else [f'class_{c}' for c in classes]
+    
+    def _class_indices(self, X: np.ndarray, classes) -> np.ndarray:
+        # Todas as colunas de predict_proba quando classes não é informado
+        if classes is None:
+            return np.arange(self.model.predict_proba(X[:1]).shape[1])
+        return np.asarray(classes, dtype=int).reshape(-1)
+    
+    @staticmethod
+    def _reseed_lime(explainer, seed: int):
+        # Explicador, LimeBase e discretizador compartilham um único gerador
+        random_state = np.random.RandomState(seed)
+        explainer.random_state = explainer.base.random_state = random_state
+        if explainer.discretizer is not None:
+            explainer.discretizer.random_state = random_state
+    
+    @staticmethod
+    def _lime_sampler(explainer):
+        """
+        Amostrador interno do LIME (o mesmo usado por explain_instance)
+        
+        O método privado __data_inverse é o da versão fixada em
+        requirements.txt (lime==0.2.0.1); se ele mudar, a avaliação em lote
+        não pode reproduzir explain_instance e falha em vez de devolver
+        atribuições uniformes.
+        
+        Raises:
+            RuntimeError: Se a versão instalada do LIME não tem o amostrador
+        """
+        sample = getattr(explainer, '_LimeTabularExplainer__data_inverse', None)
+        if sample is None:
+            raise RuntimeError("LIME em lote requer lime==0.2.0.1: "
+                               "LimeTabularExplainer.__data_inverse não existe na versão instalada")
+        return sample
+    
+    def _lime_scores(self, local_exp) -> np.ndarray:
+        """
+        Converte pares (índice da feature, peso) de uma explicação em scores normalizados
+        """
+        lime_scores = np.zeros(self.n_features)
+        for i, score in local_exp:
+            lime_scores[i] = abs(score)
+        
+        # Normaliza
+        if np.sum(lime_scores) > 0:
+            return lime_scores / np.sum(lime_scores)
+        return np.ones(self.n_features) / self.n_features
+    
+    @timed('lime')
     def lime_attribution(self, X: np.ndarray, instance_idx: int, 
-                        num_features: Optional[int] = None) -> np.ndarray:
+                        num_features: Optional[int] = None, target: int = 1) -> np.ndarray:
         """
         Calcula atribuição usando LIME
         
@@ -66,98 +218,235 @@ class ApproximationMethods:
             X: Dados de entrada
             instance_idx: Índice da instância a explicar
             num_features: Número de features para incluir na explicação
-            
+            target: Classe explicada
+        
         Returns:
             np.ndarray: Scores de atribuição do LIME
         """
         if num_features is None:
             num_features = self.n_features
-            
+        
         try:
-            explainer = lime.lime_tabular.LimeTabularExplainer(
-                X,
-                feature_names=self.feature_names,
-                class_names=['class_0', 'class_1'],
-                mode='classification',
-                random_state=42
-            )
-            
-            instance = X[instance_idx]
+            explainer = self.lime_explainer(X)
             exp = explainer.explain_instance(
-                instance,
+                X[instance_idx],
                 self.model.predict_proba,
+                labels=(target,),
                 num_features=num_features
             )
             
-            # Converte para array de scores
-            lime_scores = np.zeros(self.n_features)
-            for feature, score in exp.as_list():
-                for i, name in enumerate(self.feature_names):
-                    if name in feature:
-                        lime_scores[i] = abs(score)
-                        break
-            
-            # Normaliza
-            if np.sum(lime_scores) > 0:
-                lime_scores = lime_scores / np.sum(lime_scores)
-            else:
-                lime_scores = np.ones(self.n_features) / self.n_features
-            
-            return lime_scores
-            
+            # Features pelo índice, não pelo nome exibido
+            return self._lime_scores(exp.as_map()[target])
+        
         except Exception as e:
             warnings.warn(f"Erro no LIME: {e}")
             return np.ones(self.n_features) / self.n_features
     
+    def lime_attributions(self, X: np.ndarray, instance_indices, num_features: Optional[int] = None,
+                          num_samples: int = 5000, batch_size: int = 20, target: int = 1) -> np.ndarray:
+        """
+        LIME de várias instâncias com as vizinhanças avaliadas em lote
+        
+        Equivale a chamar lime_attribution em cada instância (ver
+        lime_class_attributions).
+        
+        Args:
+            X: Dados de entrada
+            instance_indices: Índices das instâncias a explicar
+            num_features: Número de features para incluir na explicação
+            num_samples: Tamanho da vizinhança de cada instância
+            batch_size: Número de instâncias por chamada a predict_proba
+            target: Classe explicada
+        
+        Returns:
+            np.ndarray: Scores (n_instances, n_features) do LIME
+        """
+        return self.lime_class_attributions(X, instance_indices, [target], num_features,
+                                            num_samples, batch_size)[:, 0]
+    
+    @timed('lime')
+    def lime_class_attributions(self, X: np.ndarray, instance_indices, classes=None,
+                                num_features: Optional[int] = None, num_samples: int = 5000,
+                                batch_size: int = 20) -> np.ndarray:
+        """
+        LIME de várias instâncias e várias classes com as vizinhanças avaliadas em lote
+        
+        As vizinhanças de até batch_size instâncias são concatenadas e
+        avaliadas em uma única chamada a predict_proba; a explicação de cada
+        classe é então ajustada sobre a coluna correspondente da mesma fatia
+        de probabilidades, como faz o LIME com vários labels.
+        
+        Args:
+            X: Dados de entrada
+            instance_indices: Índices das instâncias a explicar
+            classes: Índices das classes (colunas de predict_proba; padrão: todas)
+            num_features: Número de features para incluir na explicação
+            num_samples: Tamanho da vizinhança de cada instância
+            batch_size: Número de instâncias por chamada a predict_proba
+        
+        Returns:
+            np.ndarray: Scores (n_instances, n_classes, n_features) do LIME
+        
+        Raises:
+            RuntimeError: Se a versão instalada do LIME não é compatível (ver _lime_sampler)
+        """
+        from sklearn.metrics import pairwise_distances
+        
+        if num_features is None:
+            num_features = self.n_features
+        indices = [int(i) for i in instance_indices]
+        classes = self._class_indices(X, classes)
+        attributions = np.ones((len(indices), len(classes), self.n_features)) / self.n_features
+        
+        explainer = self.lime_explainer(X)
+        sample = self._lime_sampler(explainer)
+        
+        try:
+            for start in range(0, len(indices), max(1, batch_size)):
+                neighbourhoods = []
+                for idx in indices[start:start + batch_size]:
+                    self._reseed_lime(explainer, 42)
+                    neighbourhoods.append(sample(X[idx], num_samples))
+                probs = self.model.predict_proba(np.vstack([inverse for _, inverse in neighbourhoods]))
+                
+                for k, (data, _) in enumerate(neighbourhoods):
+                    scaled = (data - explainer.scaler.mean_) / explainer.scaler.scale_
+                    distances = pairwise_distances(scaled, scaled[0].reshape(1, -1)).ravel()
+                    for c, label in enumerate(classes):
+                        _, local_exp, _, _ = explainer.base.explain_instance_with_data(
+                            scaled,
+                            probs[k * num_samples:(k + 1) * num_samples],
+                            distances,
+                            label,
+                            num_features,
+                            feature_selection=explainer.feature_selection
+                        )
+                        attributions[start + k, c] = self._lime_scores(local_exp)
+        
+        except Exception as e:
+            warnings.warn(f"Erro no LIME: {e}")
+        
+        return attributions
+    
+    def shapley_values(self, X: np.ndarray, instance_idx: int, num_samples: int = 50,
+                       background: Optional[np.ndarray] = None, antithetic: bool = True,
+                       target: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Valores de Shapley estimados por amostragem de permutações
+        
+        Args:
+            X: Dados de entrada
+            instance_idx: Índice da instância a explicar
+            num_samples: Número de permutações amostradas
+            background: Linhas de referência (padrão: até 100 linhas de X)
+            antithetic: Usa pares de permutações invertidas
+            target: Classe cuja probabilidade é explicada
+        
+        Returns:
+            dict: Valores, variância e erro padrão do estimador (ver SamplingShapley.explain)
+        """
+        if background is None:
+            background = sample_background(X)
+        estimator = SamplingShapley(self.model, background)
+        return estimator.explain(X[instance_idx], target=target, n_permutations=num_samples,
+                                 antithetic=antithetic)
+    
+    def tree_explainer(self) -> Optional[TreeSHAP]:
+        """
+        TreeSHAP do modelo, construído uma única vez (None se o modelo não é de árvores)
+        """
+        if not self._tree_shap_checked:
+            self._tree_shap_checked = True
+            try:
+                self._tree_shap = TreeSHAP(self.model)
+            except ValueError:
+                self._tree_shap = None
+        return self._tree_shap
+    
+    def tree_shap_values(self, X: np.ndarray, instance_indices=None, target: int = 1) -> np.ndarray:
+        """
+        Valores de Shapley exatos (TreeSHAP) de várias instâncias de uma vez
+        
+        Args:
+            X: Dados de entrada
+            instance_indices: Índices das instâncias (padrão: todas as linhas de X)
+            target: Classe explicada
+        
+        Returns:
+            np.ndarray: (n_instances, n_features); margem em XGBoost,
+                probabilidade em florestas do scikit-learn
+        """
+        explainer = self.tree_explainer()
+        if explainer is None:
+            raise ValueError(f"TreeSHAP requer um modelo de árvores: {type(self.model).__name__}")
+        rows = X if instance_indices is None else X[np.asarray(instance_indices)]
+        return explainer.explain(rows, target=target)
+    
     def shap_approximation(self, X: np.ndarray, instance_idx: int, 
-                          num_samples: int = 50) -> np.ndarray:
+                          num_samples: int = 50, background: Optional[np.ndarray] = None,
+                          antithetic: bool = True, exact: bool = True, target: int = 1) -> np.ndarray:
         """
-        Aproximação do SHAP baseada em valores de baseline
+        Atribuição SHAP: TreeSHAP exato em modelos de árvores, senão
+        aproximação por amostragem de permutações
         
         Args:
             X: Dados de entrada
             instance_idx: Índice da instância a explicar
-            num_samples: Número de amostras para cálculo
-            
+            num_samples: Número de permutações amostradas
+            background: Linhas de referência (padrão: até 100 linhas de X)
+            antithetic: Usa pares de permutações invertidas
+            exact: Usa TreeSHAP quando o modelo é de árvores (num_samples,
+                background e antithetic são ignorados)
+            target: Classe explicada
+        
         Returns:
-            np.ndarray: Scores de atribuição aproximados
+            np.ndarray: Magnitudes normalizadas dos valores de Shapley
         """
+        return self.shap_class_attributions(X, [instance_idx], [target], num_samples, background,
+                                            antithetic, exact)[0, 0]
+    
+    @timed('shap')
+    def shap_class_attributions(self, X: np.ndarray, instance_indices, classes=None,
+                                num_samples: int = 50, background: Optional[np.ndarray] = None,
+                                antithetic: bool = True, exact: bool = True) -> np.ndarray:
+        """
+        Atribuição SHAP de várias instâncias e várias classes
+        
+        Com TreeSHAP, uma única passagem pelas árvores fornece todas as
+        classes; na amostragem, as coalizões de cada instância são avaliadas
+        uma vez e as contribuições de todas as classes saem da mesma matriz
+        de probabilidades.
+        
+        Args:
+            X: Dados de entrada
+            instance_indices: Índices das instâncias a explicar
+            classes: Índices das classes (colunas de predict_proba; padrão: todas)
+            num_samples, background, antithetic, exact: Ver shap_approximation
+        
+        Returns:
+            np.ndarray: Magnitudes normalizadas (n_instances, n_classes, n_features)
+        """
+        indices = np.asarray([int(i) for i in instance_indices], dtype=int)
+        classes = self._class_indices(X, classes)
+        
         try:
-            baseline = np.median(X, axis=0)
-            instance = X[instance_idx]
-            original_pred = self.model.predict_proba([instance])[0, 1]
-            attributions = np.zeros(self.n_features)
-            
-            for i in range(self.n_features):
-                total_effect = 0
-                valid_samples = 0
-                
-                for _ in range(num_samples):
-                    # Cria instância híbrida
-                    hybrid_instance = instance.copy()
-                    hybrid_instance[i] = baseline[i]
-                    
-                    try:
-                        hybrid_pred = self.model.predict_proba([hybrid_instance])[0, 1]
-                        effect = abs(original_pred - hybrid_pred)
-                        total_effect += effect
-                        valid_samples += 1
-                    except:
-                        continue
-                
-                if valid_samples > 0:
-                    attributions[i] = total_effect / valid_samples
-                else:
-                    attributions[i] = 0.0
-            
-            # Normaliza
-            if np.sum(attributions) > 0:
-                attributions = attributions / np.sum(attributions)
+            if exact and self.tree_explainer() is not None:
+                attributions = np.abs(self.tree_explainer().explain_classes(X[indices], classes))
             else:
-                attributions = np.ones(self.n_features) / self.n_features
-            
-            return attributions
+                if background is None:
+                    background = sample_background(X)
+                estimator = SamplingShapley(self.model, background)
+                attributions = np.abs(np.stack([
+                    estimator.explain_classes(X[idx], classes, n_permutations=num_samples,
+                                              antithetic=antithetic)['values']
+                    for idx in indices
+                ]))
             
+            # Normaliza; vetores nulos viram uniformes
+            totals = attributions.sum(axis=2, keepdims=True)
+            uniform = np.ones_like(attributions) / self.n_features
+            return np.divide(attributions, totals, out=uniform, where=totals > 0)
+        
         except Exception as e:
             warnings.warn(f"Erro no SHAP: {e}")
-            return np.ones(self.n_features) / self.n_features
\ No newline at end of file
+            return np.ones((len(indices), len(classes), self.n_features)) / self.n_features
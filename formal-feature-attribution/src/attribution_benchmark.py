@@ -0,0 +1,274 @@
+import json
+import os
+import platform
+import time
+import tracemalloc
+import numpy as np
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from sklearn.datasets import make_classification
+from xgboost import XGBClassifier
+
+from approximation_methods import ApproximationMethods
+from formal_ffa import FormalFFA, HeuristicFFA
+from profiling import ProfiledModel
+
+
+# Grade padrão: número de features, de árvores e de instâncias explicadas
+DEFAULT_FEATURES = (6, 12, 100)
+DEFAULT_ESTIMATORS = (10, 50)
+DEFAULT_INSTANCES = (1, 10)
+
+
+class CountingModel(ProfiledModel):
+    """
+    Envolve um modelo e conta as chamadas e linhas de predict/predict_proba
+    """
+    
+    def __init__(self, model):
+        super().__init__(model, 'benchmark')
+    
+    def reset(self):
+        self.calls = 0
+        self.rows = 0
+
+
+def make_case(n_features: int, n_estimators: int, n_samples: int = 1000, seed: int = 0) -> Dict:
+    """
+    Dataset sintético em [0, 1] e modelo XGBoost de um ponto da grade
+    
+    Returns:
+        dict: X, y, model (CountingModel), feature_names e feature_bounds
+    """
+    X, y = make_classification(
+        n_samples=n_samples,
+        n_features=n_features,
+        n_informative=min(n_features, 5),
+        n_redundant=0,
+        random_state=seed
+    )
+    X = (X - X.min(axis=0)) / (X.max(axis=0) - X.min(axis=0))
+    model = XGBClassifier(n_estimators=n_estimators, max_depth=3, learning_rate=0.1,
+                          eval_metric='logloss', random_state=seed)
+    model.fit(X, y)
+    
+    return {
+        'X': X,
+        'y': y,
+        'model': CountingModel(model),
+        'feature_names': [f'F{i}' for i in range(n_features)],
+        'feature_bounds': [(0.0, 1.0)] * n_features
+    }
+
+
+def _benchmarks() -> Dict[str, Callable[[Dict, np.ndarray], Callable[[], object]]]:
+    """
+    Cada benchmark recebe o caso e os índices das instâncias e devolve a
+    função medida (a construção dos explicadores fica fora da medição)
+    """
+    def targets(case, indices):
+        return case['model'].model.predict(case['X'][indices])
+    
+    def compute_ffa(case, indices):
+        ffa = FormalFFA(case['model'], case['feature_bounds'])
+        labels = targets(case, indices)
+        return lambda: [ffa.compute_ffa(case['X'][i], int(t), n_combinations=10)
+                        for i, t in zip(indices, labels)]
+    
+    def check_axp(case, indices):
+        # Sem cache de veredictos: mede a verificação em si
+        ffa = FormalFFA(case['model'], case['feature_bounds'], cache_size=None)
+        labels = targets(case, indices)
+        half = set(range(0, ffa.n_features, 2))
+        return lambda: [ffa.check_axp(case['X'][i], half, int(t), n_samples=100)
+                        for i, t in zip(indices, labels)]
+    
+    def heuristic(case, indices):
+        ffa = HeuristicFFA(case['model'], case['feature_names'], len(case['feature_names']),
+                           case['feature_bounds'])
+        labels = targets(case, indices)
+        return lambda: [ffa.compute(case['X'][i], int(t)) for i, t in zip(indices, labels)]
+    
+    def approx(method):
+        def build(case, indices):
+            methods = ApproximationMethods(case['model'], case['feature_names'])
+            X, y = case['X'], case['y']
+            calls = {
+                'permutation_importance': lambda: methods.permutation_importance(X, y, n_repeats=5),
+                'permutation_scores': lambda: methods.permutation_scores(X, y, n_repeats=5),
+                'lime_attribution': lambda: [methods.lime_attribution(X, i) for i in indices],
+                'lime_attributions': lambda: methods.lime_attributions(X, indices),
+                'shapley_values': lambda: [methods.shapley_values(X, i) for i in indices],
+                'tree_shap_values': lambda: methods.tree_shap_values(X, indices),
+                'shap_approximation': lambda: [methods.shap_approximation(X, i) for i in indices]
+            }
+            if method.startswith('lime'):
+                methods.lime_explainer(X)
+            if method in ('tree_shap_values', 'shap_approximation'):
+                methods.tree_explainer()
+            return calls[method]
+        return build
+    
+    benchmarks = {
+        'formal.compute_ffa': compute_ffa,
+        'formal.check_axp': check_axp,
+        'heuristic.compute': heuristic
+    }
+    for method in ('permutation_importance', 'permutation_scores', 'lime_attribution',
+                   'lime_attributions', 'shapley_values', 'tree_shap_values', 'shap_approximation'):
+        benchmarks[f'approx.{method}'] = approx(method)
+    return benchmarks
+
+
+BENCHMARKS = tuple(_benchmarks())
+
+
+def _measure(build: Callable, case: Dict, indices: np.ndarray, repeat: int, seed: int) -> Dict:
+    """
+    Tempos de repeat execuções, chamadas ao modelo da primeira e pico de
+    memória de uma execução extra sob tracemalloc
+    """
+    model = case['model']
+    times = []
+    for r in range(max(1, repeat)):
+        np.random.seed(seed)
+        function = build(case, indices)
+        model.reset()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+        if r == 0:
+            calls, rows = model.calls, model.rows
+    
+    # Medida separada: tracemalloc deixa a execução mais lenta
+    np.random.seed(seed)
+    function = build(case, indices)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'wall_time': min(times),
+        'mean_time': float(np.mean(times)),
+        'per_instance': min(times) / len(indices),
+        'model_calls': calls,
+        'rows_scored': rows,
+        'peak_memory': peak
+    }
+
+
+def run_benchmarks(features: Sequence[int] = DEFAULT_FEATURES,
+                   estimators: Sequence[int] = DEFAULT_ESTIMATORS,
+                   instances: Sequence[int] = DEFAULT_INSTANCES,
+                   benchmarks: Optional[Iterable[str]] = None, repeat: int = 3,
+                   seed: int = 0, verbose: bool = True) -> List[Dict]:
+    """
+    Executa os benchmarks em toda a grade de parâmetros
+    
+    Args:
+        features: Números de features dos datasets sintéticos
+        estimators: Números de árvores do modelo
+        instances: Números de instâncias explicadas por execução
+        benchmarks: Nomes (ou prefixos, ex.: 'approx.') a executar; None executa todos
+        repeat: Execuções cronometradas por ponto (vale a menor)
+        seed: Semente de dados, modelo e amostragem
+        verbose: Imprime cada resultado
+    
+    Returns:
+        List[Dict]: Um registro por (benchmark, n_features, n_estimators, n_instances)
+    """
+    registry = _benchmarks()
+    names = [name for name in registry
+             if benchmarks is None or any(name.startswith(prefix) for prefix in benchmarks)]
+    results = []
+    
+    for n_features in features:
+        for n_estimators in estimators:
+            case = make_case(n_features, n_estimators, seed=seed)
+            for n_instances in instances:
+                indices = np.arange(n_instances)
+                for name in names:
+                    record = {
+                        'benchmark': name,
+                        'n_features': n_features,
+                        'n_estimators': n_estimators,
+                        'n_instances': n_instances
+                    }
+                    record.update(_measure(registry[name], case, indices, repeat, seed))
+                    results.append(record)
+                    if verbose:
+                        print(f"{name:<30} f={n_features:<4} e={n_estimators:<4} n={n_instances:<4} "
+                              f"{record['wall_time'] * 1000:10.2f} ms  {record['model_calls']:6d} chamadas  "
+                              f"{record['peak_memory'] / 2 ** 20:8.2f} MiB")
+    
+    return results
+
+
+def save_results(results: List[Dict], path: str) -> str:
+    """
+    Grava os resultados em JSON com a descrição do ambiente
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    payload = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def load_results(path: str) -> List[Dict]:
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def _key(record: Dict):
+    return record['benchmark'], record['n_features'], record['n_estimators'], record['n_instances']
+
+
+def compare_results(baseline: List[Dict], current: List[Dict], threshold: float = 0.25,
+                    min_time: float = 0.001) -> List[Dict]:
+    """
+    Regressões de current em relação a baseline nos pontos comuns às duas execuções
+    
+    Args:
+        baseline: Resultados de referência
+        current: Resultados novos
+        threshold: Aumento relativo tolerado (0.25 = 25%)
+        min_time: Tempos abaixo deste valor (s) são ruído e não são comparados
+    
+    Returns:
+        List[Dict]: Uma entrada por métrica piorada, com benchmark, parâmetros,
+            metric, baseline, current e ratio
+    """
+    reference = {_key(record): record for record in baseline}
+    regressions = []
+    
+    for record in current:
+        old = reference.get(_key(record))
+        if old is None:
+            continue
+        for metric in ('wall_time', 'model_calls', 'peak_memory'):
+            before, after = old[metric], record[metric]
+            if metric == 'wall_time' and max(before, after) < min_time:
+                continue
+            if after > before * (1 + threshold):
+                regressions.append({
+                    'benchmark': record['benchmark'],
+                    'n_features': record['n_features'],
+                    'n_estimators': record['n_estimators'],
+                    'n_instances': record['n_instances'],
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'ratio': after / before if before else float('inf')
+                })
+    
+    return regressions
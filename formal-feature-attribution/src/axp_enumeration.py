@@ -0,0 +1,128 @@
+from typing import Callable, Iterator, List, Set, Tuple
+from z3 import Bool, Not, Or, Solver, is_true, sat
+
+
+class AXpEnumerator:
+    """
+    Enumeração de AXps e CXps no estilo MARCO
+    
+    Usa a dualidade de hitting sets: toda AXp intersecta toda CXp. Um solver
+    SAT mantém os candidatos ainda não bloqueados; cada candidato produz uma
+    nova AXp mínima (se garante a predição) ou uma nova CXp mínima (caso
+    contrário), de modo que nenhuma explicação é repetida.
+    """
+    
+    def __init__(self, is_axp: Callable[[Set[int]], bool], n_features: int,
+                 prefer: str = 'axp', shrink: str = 'linear'):
+        """
+        Args:
+            is_axp: Função que decide se um conjunto de features fixas é AXp
+            n_features: Número de features
+            prefer: 'axp' começa por candidatos grandes (AXps primeiro);
+                'cxp' começa por candidatos pequenos (CXps primeiro)
+            shrink: 'linear' (uma consulta por feature do candidato) ou
+                'quickxplain' (divisão recursiva; O(k log n) consultas para
+                explicações de tamanho k, adequado a muitas features)
+        """
+        if prefer not in ('axp', 'cxp'):
+            raise ValueError(f"Preferência inválida: {prefer}")
+        if shrink not in ('linear', 'quickxplain'):
+            raise ValueError(f"Redução inválida: {shrink}")
+        
+        self.is_axp = is_axp
+        self.n_features = n_features
+        self.prefer = prefer
+        self.shrink = shrink
+        self.n_axps = 0
+        self.n_cxps = 0
+        
+        # Com prefer='axp' as variáveis indicam features livres, e o solver
+        # (que tende a atribuir False) propõe candidatos com muitas features fixas
+        self._vars = [Bool(f'{"free" if prefer == "axp" else "fixed"}_{j}')
+                      for j in range(n_features)]
+        self._solver = Solver()
+    
+    def _fixed(self, j: int):
+        return Not(self._vars[j]) if self.prefer == 'axp' else self._vars[j]
+    
+    def _candidate(self) -> Set[int]:
+        model = self._solver.model()
+        fixed = set()
+        for j, var in enumerate(self._vars):
+            value = is_true(model.eval(var, model_completion=True))
+            if value != (self.prefer == 'axp'):
+                fixed.add(j)
+        return fixed
+    
+    def _quickxplain(self, items: List[int], holds: Callable[[Set[int]], bool]) -> Set[int]:
+        """
+        Subconjunto mínimo de items para um predicado monótono válido em items
+        """
+        def search(background: Set[int], checked: bool, candidates: List[int]) -> Set[int]:
+            if checked and holds(background):
+                return set()
+            if len(candidates) == 1:
+                return set(candidates)
+            half = len(candidates) // 2
+            first, second = candidates[:half], candidates[half:]
+            found_second = search(background | set(first), True, second)
+            found_first = search(background | found_second, bool(found_second), first)
+            return found_first | found_second
+        
+        return search(set(), True, items) if items else set()
+    
+    def _shrink_axp(self, fixed: Set[int]) -> Set[int]:
+        """
+        Reduz um conjunto AXp a uma AXp mínima
+        """
+        if self.shrink == 'quickxplain':
+            return self._quickxplain(sorted(fixed), self.is_axp)
+        
+        # Remoção linear
+        axp = set(fixed)
+        for j in sorted(fixed):
+            axp.discard(j)
+            if not self.is_axp(axp):
+                axp.add(j)
+        return axp
+    
+    def _shrink_cxp(self, free: Set[int]) -> Set[int]:
+        """
+        Reduz um conjunto de features livres a uma CXp mínima
+        """
+        all_features = set(range(self.n_features))
+        if self.shrink == 'quickxplain':
+            return self._quickxplain(sorted(free), lambda cxp: not self.is_axp(all_features - cxp))
+        
+        cxp = set(free)
+        for j in sorted(free):
+            cxp.discard(j)
+            if self.is_axp(all_features - cxp):
+                cxp.add(j)
+        return cxp
+    
+    def enumerate(self) -> Iterator[Tuple[str, Set[int]]]:
+        """
+        Enumera explicações até esgotar o espaço de candidatos
+        
+        Yields:
+            Tuple[str, Set[int]]: ('axp', subconjunto) ou ('cxp', subconjunto)
+        """
+        all_features = set(range(self.n_features))
+        
+        while self._solver.check() == sat:
+            fixed = self._candidate()
+            
+            if self.is_axp(fixed):
+                axp = self._shrink_axp(fixed)
+                self._solver.add(Or([Not(self._fixed(j)) for j in axp]))
+                self.n_axps += 1
+                yield 'axp', axp
+            else:
+                cxp = self._shrink_cxp(all_features - fixed)
+                if not cxp:
+                    # O oráculo não garante a classe alvo nem com todas as features fixas
+                    return
+                self._solver.add(Or([self._fixed(j) for j in cxp]))
+                self.n_cxps += 1
+                yield 'cxp', cxp
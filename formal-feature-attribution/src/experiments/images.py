@@ -0,0 +1,133 @@
+from xgboost import XGBClassifier
+from sklearn.metrics import accuracy_score
+import sys
+import os
+
+# Adiciona o caminho para importar módulos locais
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from formal_ffa import FormalFFA
+from image_data import load_image_dataset
+from profiling import profiled
+from smt_oracle import SMTOracle
+from utils.visualization import plot_pixel_attribution
+
+
+# Instantes (segundos) dos gráficos time10 e time1200 de plots/img; execuções
+# mais longas passam os próprios instantes em checkpoints
+DEFAULT_CHECKPOINTS = (10, 1200)
+
+
+def _time_tag(t: float) -> str:
+    return f'time{int(t)}' if float(t).is_integer() else f'time{t}'
+
+
+def run_image_experiment(dataset_name: str = '10,10_mnist_1v3', instances=(7,),
+                         checkpoints=DEFAULT_CHECKPOINTS, output_dir: str = 'plots/img',
+                         store=None, binarize: bool = False, baselines: bool = True,
+                         seed: int = 42):
+    """
+    FFA formal anytime em imagens reduzidas (ex.: 10x10 = 100 features)
+    
+    A enumeração usa o oráculo SMT exato, CXps primeiro e redução por
+    QuickXplain, que exigem poucas verificações mesmo com 100 pixels. Os
+    mapas de calor são salvos em PDF como
+    <output_dir>/<dataset>/<dataset>_inst<i>_<tag>.pdf, com tag 'ori'
+    (imagem), 'time<t>_ori' (FFA após t segundos), 'attr_ori' (último
+    instante), 'lime_ori' e 'shap_ori'; o sufixo '_wffa' sobrepõe o FFA à imagem.
+    
+    Args:
+        dataset_name: Nome no formato '<linhas>,<colunas>_<fonte>_<a>v<b>'
+        instances: Índices das instâncias de teste explicadas
+        checkpoints: Instantes (segundos) em que as atribuições são registradas
+        output_dir: Diretório base dos gráficos
+        store: ResultsStore opcional; instâncias já gravadas não são recalculadas
+        binarize: Limiariza os pixels em 0.5
+        baselines: Também gera os mapas de LIME e SHAP
+        seed: Semente do modelo
+    
+    Returns:
+        dict: Dados, modelo, desempenho e atribuições por instância e instante
+    """
+    print("=" * 70)
+    print(f"🖼️  FFA EM IMAGENS: {dataset_name}")
+    print("=" * 70)
+    
+    data = load_image_dataset(dataset_name, binarize=binarize)
+    X_train, X_test = data['X_train'], data['X_test']
+    y_train, y_test = data['y_train'], data['y_test']
+    shape = data['shape']
+    
+    model = XGBClassifier(
+        n_estimators=25,
+        max_depth=3,
+        learning_rate=0.1,
+        eval_metric='logloss',
+        random_state=seed
+    )
+    model.fit(X_train, y_train)
+    perf = {
+        'train_accuracy': accuracy_score(y_train, model.predict(X_train)),
+        'test_accuracy': accuracy_score(y_test, model.predict(X_test))
+    }
+    print(f"✅ Modelo treinado ({X_train.shape[1]} pixels)")
+    print(f"   Acurácia - Treino: {perf['train_accuracy']:.3f}, Teste: {perf['test_accuracy']:.3f}")
+    
+    oracle = SMTOracle(model, data['feature_bounds'])
+    formal_ffa = FormalFFA(model, data['feature_bounds'], oracle=oracle, shrink='quickxplain')
+    approx_methods = None
+    if baselines:
+        from approximation_methods import ApproximationMethods
+        approx_methods = ApproximationMethods(profiled(model), data['feature_names'])
+    
+    checkpoints = sorted(checkpoints)
+    plot_dir = os.path.join(output_dir, dataset_name)
+    attributions = {}
+    
+    for idx in instances:
+        idx = int(idx)
+        instance = X_test[idx]
+        prefix = os.path.join(plot_dir, f'{dataset_name}_inst{idx}')
+        methods = [f'formal_{_time_tag(t)}' for t in checkpoints]
+        target = int(model.predict(instance.reshape(1, -1))[0])
+        
+        if store is not None and all(store.has(dataset_name, idx, m) for m in methods):
+            stored = {m: store.attributions(dataset_name, m)[idx] for m in methods}
+            timed = {t: stored[m] for t, m in zip(checkpoints, methods)}
+            print(f"📍 Instância {idx}: atribuições já gravadas")
+        else:
+            print(f"📍 Instância {idx} (classe {target}): enumerando até {checkpoints[-1]}s...")
+            snapshots = formal_ffa.timed_ffa(instance, target, checkpoints, prefer='cxp')
+            timed = {t: snapshots[t]['scores'] for t in checkpoints}
+            
+            for t, method in zip(checkpoints, methods):
+                snapshot = snapshots[t]
+                print(f"   {_time_tag(t)}: {snapshot['n_axps']} AXps, {snapshot['n_cxps']} CXps"
+                      f"{' (completo)' if snapshot['complete'] else ''}")
+                if store is not None:
+                    store.append(dataset_name, idx, method, snapshot['scores'],
+                                 n_axps=snapshot['n_axps'], n_cxps=snapshot['n_cxps'],
+                                 complete=snapshot['complete'])
+        
+        plot_pixel_attribution(None, shape, f'{prefix}_ori.pdf', image=instance)
+        for t in checkpoints:
+            plot_pixel_attribution(timed[t], shape, f'{prefix}_{_time_tag(t)}_ori.pdf')
+            plot_pixel_attribution(timed[t], shape, f'{prefix}_{_time_tag(t)}_ori_wffa.pdf', image=instance)
+        
+        final = timed[checkpoints[-1]]
+        plot_pixel_attribution(final, shape, f'{prefix}_attr_ori.pdf')
+        plot_pixel_attribution(final, shape, f'{prefix}_attr_ori_wffa.pdf', image=instance)
+        
+        if approx_methods is not None:
+            # Mesma classe explicada pelo FFA (a predita), não a classe 1
+            plot_pixel_attribution(approx_methods.lime_attribution(X_test, idx, target=target), shape,
+                                   f'{prefix}_lime_ori.pdf')
+            plot_pixel_attribution(approx_methods.shap_approximation(X_test, idx, target=target), shape,
+                                   f'{prefix}_shap_ori.pdf')
+        
+        attributions[idx] = timed
+    
+    print(f"\n✅ Mapas de calor salvos em: {plot_dir}")
+    
+    data.update({'model': model, 'performance': perf, 'attributions': attributions})
+    return data
\ No newline at end of file
@@ -9,102 +9,218 @@ import os
 # Adiciona o caminho para importar módulos locais
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from feature_domain import FeatureDomains
 from formal_ffa import HeuristicFFA, FormalFFA
+from profiling import profiled
+from tabular_data import discover_datasets, load_tabular
 
 
-def run_section_5_1():
+# Configurações dos datasets conforme artigo
+DATASET_CONFIGS = {
+    'linear_separable': {
+        'n_informative': 4,
+        'n_redundant': 1,
+        'n_clusters_per_class': 1,
+        'class_sep': 1.5
+    },
+    'non_linear': {
+        'n_informative': 6,
+        'n_redundant': 0,
+        'n_clusters_per_class': 2,
+        'class_sep': 0.8
+    }
+}
+
+
+def _make_synthetic_dataset(dataset_name: str, seed: int):
+    """
+    Gera e divide um dataset sintético de DATASET_CONFIGS
+    """
+    config = DATASET_CONFIGS[dataset_name]
+    
+    # Gera dataset sintético
+    X, y = make_classification(
+        n_samples=400,
+        n_features=6,
+        n_informative=config['n_informative'],
+        n_redundant=config['n_redundant'],
+        n_clusters_per_class=config['n_clusters_per_class'],
+        class_sep=config['class_sep'],
+        random_state=seed,
+        flip_y=0.05  # Pequeno ruído
+    )
+    
+    # Normaliza para [0, 1]
+    X = (X - X.min(axis=0)) / (X.max(axis=0) - X.min(axis=0) + 1e-8)
+    
+    # Split treino/teste
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.3, random_state=seed
+    )
+    return X_train, X_test, y_train, y_test
+
+
+def _load_real_dataset(dataset_name: str):
+    """
+    Carrega as divisões treino/teste de um dataset de datasets/tabular
+    
+    Os limites das features cobrem as duas divisões e vêm dos metadados do
+    cache colunar, sem percorrer os dados. Os domínios (binário, inteiro,
+    categórico ou contínuo) são inferidos dos valores das duas divisões.
+    """
+    available = discover_datasets()
+    if dataset_name not in available:
+        raise ValueError(f"Dataset desconhecido: {dataset_name}")
+    
+    train = load_tabular(dataset_name, 'train')
+    test = load_tabular(dataset_name, 'test')
+    feature_bounds = [(min(a[0], b[0]), max(a[1], b[1]))
+                      for a, b in zip(train.feature_bounds(), test.feature_bounds())]
+    domains = FeatureDomains.from_data(np.vstack([train.X, test.X]), train.categorical_features)
+    return train.X, test.X, train.y, test.y, train.feature_names, feature_bounds, domains
+
+
+def prepare_dataset(dataset_name: str, n_instances: int = 2, seed: int = 42):
     """
-    Executa experimentos da Seção 5.1: Datasets Sintéticos
+    Prepara o dataset, treina o modelo e sorteia as instâncias analisadas
+    
+    Todo o processo é determinístico, de modo que as seções podem reconstruir
+    os mesmos dados e modelo sem mantê-los em memória entre execuções.
+    
+    Args:
+        dataset_name: Nome do dataset em DATASET_CONFIGS ou em datasets/tabular
+        n_instances: Número de instâncias de teste analisadas
+        seed: Semente para geração dos dados e sorteio das instâncias
+    
+    Returns:
+        dict: Dados, modelo, nomes/limites/domínios das features (domínios
+            apenas em datasets reais), instâncias e desempenho
+    """
+    if dataset_name not in DATASET_CONFIGS:
+        (X_train, X_test, y_train, y_test, feature_names, feature_bounds,
+         feature_domains) = _load_real_dataset(dataset_name)
+    else:
+        X_train, X_test, y_train, y_test = _make_synthetic_dataset(dataset_name, seed)
+        feature_names = [f'F{i}' for i in range(X_train.shape[1])]
+        feature_bounds = [(0, 1)] * X_train.shape[1]
+        feature_domains = None
+    
+    # Modelo XGBoost conforme artigo
+    model = XGBClassifier(
+        n_estimators=25,
+        max_depth=3,
+        learning_rate=0.1,
+        use_label_encoder=False,
+        eval_metric='logloss',
+        random_state=seed
+    )
+    
+    model.fit(X_train, y_train)
+    # Avaliação do modelo
+    train_acc = accuracy_score(y_train, model.predict(X_train))
+    test_acc = accuracy_score(y_test, model.predict(X_test))
+    
+    # Seleciona instâncias para análise
+    rng = np.random.RandomState(seed)
+    sample_indices = rng.choice(len(X_test), size=n_instances, replace=False)
+    
+    return {
+        'X_train': X_train,
+        'X_test': X_test,
+        'y_train': y_train,
+        'y_test': y_test,
+        'model': model,
+        'feature_names': feature_names,
+        'feature_bounds': feature_bounds,
+        'feature_domains': feature_domains,
+        'sample_indices': sample_indices,
+        'performance': {'train_accuracy': train_acc, 'test_accuracy': test_acc}
+    }
+
+
+def run_section_5_1(n_jobs: int = 1, store=None, n_instances: int = 2, datasets=None):
+    """
+    Executa experimentos da Seção 5.1: Datasets Sintéticos (e reais, via datasets)
+    
+    Args:
+        n_jobs: Número de processos para explicar as instâncias (None = todos os núcleos)
+        store: ResultsStore opcional; cada atribuição é gravada assim que
+            calculada e as já gravadas não são recalculadas
+        n_instances: Número de instâncias de teste analisadas por dataset
+        datasets: Nomes dos datasets (padrão: os sintéticos de DATASET_CONFIGS);
+            nomes de datasets/tabular usam os dados reais
     
     Returns:
         dict: Resultados dos experimentos
     """
+    datasets = list(datasets or DATASET_CONFIGS)
+    synthetic = [name in DATASET_CONFIGS for name in datasets]
+    kind = 'SINTÉTICOS' if all(synthetic) else 'REAIS' if not any(synthetic) else 'SINTÉTICOS E REAIS'
+    
     print("=" * 70)
-    print("🎯 SEÇÃO 5.1: EXPERIMENTOS COM DATASETS SINTÉTICOS")
+    print(f"🎯 SEÇÃO 5.1: EXPERIMENTOS COM DATASETS {kind}")
     print("=" * 70)
     
     results = {}
     
-    # Configurações dos datasets conforme artigo
-    dataset_configs = {
-        'linear_separable': {
-            'n_informative': 4,
-            'n_redundant': 1, 
-            'n_clusters_per_class': 1,
-            'class_sep': 1.5
-        },
-        'non_linear': {
-            'n_informative': 6,
-            'n_redundant': 0,
-            'n_clusters_per_class': 2,
-            'class_sep': 0.8
-        }
-    }
-    
-    for dataset_name, config in dataset_configs.items():
+    for dataset_name in datasets:
         print(f"\n📊 DATASET: {dataset_name.upper()}")
         print("-" * 50)
         
-        # Gera dataset sintético
-        X, y = make_classification(
-            n_samples=400,
-            n_features=6,
-            n_informative=config['n_informative'],
-            n_redundant=config['n_redundant'],
-            n_clusters_per_class=config['n_clusters_per_class'],
-            class_sep=config['class_sep'],
-            random_state=42,
-            flip_y=0.05  # Pequeno ruído
-        )
-        
-        # Normaliza para [0, 1]
-        X = (X - X.min(axis=0)) / (X.max(axis=0) - X.min(axis=0) + 1e-8)
-        
-        # Split treino/teste
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.3, random_state=42
-        )
-        
-        # Modelo XGBoost conforme artigo
-        model = XGBClassifier(
-            n_estimators=25,
-            max_depth=3,
-            learning_rate=0.1,
-            use_label_encoder=False,
-            eval_metric='logloss',
-            random_state=42
-        )
-        
-        model.fit(X_train, y_train)
-        # Avaliação do modelo
-        train_acc = accuracy_score(y_train, model.predict(X_train))
-        test_acc = accuracy_score(y_test, model.predict(X_test))
+        data = prepare_dataset(dataset_name, n_instances=n_instances)
+        X_test, y_test = data['X_test'], data['y_test']
+        feature_names = data['feature_names']
+        sample_indices = data['sample_indices']
+        perf = data['performance']
         print(f"✅ Modelo treinado")
-        print(f"   Acurácia - Treino: {train_acc:.3f}, Teste: {test_acc:.3f}")
+        print(f"   Acurácia - Treino: {perf['train_accuracy']:.3f}, Teste: {perf['test_accuracy']:.3f}")
         
-        # Prepara para FFA
-        feature_names = [f'F{i}' for i in range(X.shape[1])]
-        feature_bounds = [(0, 1)] * X.shape[1]
+        if store is not None and not store.has(dataset_name, None, 'performance'):
+            store.append(dataset_name, None, 'performance', feature_names=feature_names, **perf)
         
-        # Inicializa métodos FFA
-        heuristic_ffa = HeuristicFFA(model, feature_names, X.shape[1])
-        formal_ffa = FormalFFA(model, feature_bounds)
-        
-        # Seleciona instâncias para análise
-        sample_indices = np.random.choice(len(X_test), size=2, replace=False)
-        heuristic_attributions = []
-        formal_attributions = []
+        # Inicializa métodos FFA (com --profile, as chamadas ao modelo são registradas)
+        model = profiled(data['model'])
+        explainers = {
+            'heuristic': (HeuristicFFA(model, feature_names, X_test.shape[1], data['feature_bounds']), {}),
+            'formal': (FormalFFA(model, data['feature_bounds'], domains=data['feature_domains']), {})
+        }
+        attributions = {method: [None] * len(sample_indices) for method in explainers}
         
-        for idx in sample_indices:
-            instance = X_test[idx]
-            true_class = y_test[idx]
+        for method, (explainer, kwargs) in explainers.items():
+            stored = store.attributions(dataset_name, method) if store is not None else {}
+            pending = [i for i, idx in enumerate(sample_indices) if int(idx) not in stored]
+            for i, idx in enumerate(sample_indices):
+                if int(idx) in stored:
+                    attributions[method][i] = stored[int(idx)]
             
-            # Calcula atribuições
-            heuristic_attr = heuristic_ffa.compute(instance, true_class)
-            formal_attr = formal_ffa.compute_ffa(instance, true_class)
+            def on_result(j, attribution, error, method=method, pending=pending):
+                i = pending[j]
+                idx = sample_indices[i]
+                if error is not None:
+                    print(f"⚠️  Instância {idx} ({method}): {error}")
+                    return
+                attributions[method][i] = attribution
+                if store is not None:
+                    store.append(dataset_name, idx, method, attribution)
             
-            heuristic_attributions.append(heuristic_attr)
-            formal_attributions.append(formal_attr)
+            if pending:
+                # Calcula atribuições em lote
+                X_pending, y_pending = X_test[sample_indices[pending]], y_test[sample_indices[pending]]
+                if isinstance(explainer, FormalFFA):
+                    # Instâncias na mesma região do modelo compartilham a explicação
+                    grouped = explainer.explain_grouped(X_pending, y_pending, n_jobs=n_jobs,
+                                                        on_result=on_result, **kwargs)
+                    print(f"   FFA formal: {len(pending)} instâncias em {grouped['n_groups']} regiões")
+                else:
+                    explainer.explain_many(X_pending, y_pending, n_jobs=n_jobs, on_result=on_result, **kwargs)
+        
+        heuristic_attributions = attributions['heuristic']
+        formal_attributions = attributions['formal']
+        
+        for idx, heuristic_attr, formal_attr in zip(sample_indices, heuristic_attributions,
+                                                    formal_attributions):
+            if heuristic_attr is None or formal_attr is None:
+                continue
             
             # Mostra feature mais importante
             top_heuristic = feature_names[np.argmax(heuristic_attr)]
@@ -115,22 +231,12 @@ def run_section_5_1():
             print(f"   FFA Formal → {top_formal} ({formal_attr.max():.3f})")
         
         # Armazena resultados
-        results[dataset_name] = {
-            'X_train': X_train,
-            'X_test': X_test,
-            'y_train': y_train,
-            'y_test': y_test,
-            'model': model,
-            'feature_names': feature_names,
-            'feature_bounds': feature_bounds,
-            'heuristic_attributions': heuristic_attributions,
-            'formal_attributions': formal_attributions,
-            'sample_indices': sample_indices,
-            'performance': {'train_accuracy': train_acc, 'test_accuracy': test_acc}
-        }
+        data['heuristic_attributions'] = heuristic_attributions
+        data['formal_attributions'] = formal_attributions
+        results[dataset_name] = data
     
     print("\n" + "=" * 70)
     print("✅ SEÇÃO 5.1 CONCLUÍDA")
     print("=" * 70)
     
-    return results
\ No newline at end of file
+    return results
@@ -2,17 +2,53 @@ import numpy as np
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.dirname(__file__))
 from approximation_methods import ApproximationMethods
-from utils.metrics import calculate_correlations, calculate_ranking_metrics
+from prediction_pool import PredictionPool
+from profiling import profiled
+from utils.metrics import calculate_correlations, calculate_ranking_metrics, compare_attributions
 
 
-def run_section_5_2(results_5_1):
+def _load_from_store(store):
+    """
+    Reconstrói os dados da seção 5.1 a partir do armazenamento de resultados
+    
+    Os datasets e modelos dos datasets presentes no armazenamento são
+    regenerados de forma determinística; apenas as atribuições formais são
+    lidas do disco.
+    """
+    from section_5_1 import prepare_dataset
+    
+    dataset_names = dict.fromkeys(record['dataset'] for record in store.iter_records(method='performance'))
+    
+    results_5_1 = {}
+    for dataset_name in dataset_names:
+        stored = store.attributions(dataset_name, 'formal')
+        if not stored:
+            print(f"⚠️  {dataset_name}: sem atribuições formais gravadas (execute a Seção 5.1)")
+            continue
+        
+        data = prepare_dataset(dataset_name, n_instances=len(stored))
+        missing = [idx for idx in data['sample_indices'] if int(idx) not in stored]
+        if missing:
+            print(f"⚠️  {dataset_name}: atribuições formais ausentes para {missing}")
+            continue
+        
+        data['formal_attributions'] = [stored[int(idx)] for idx in data['sample_indices']]
+        results_5_1[dataset_name] = data
+    
+    return results_5_1
+
+
+def run_section_5_2(results_5_1=None, store=None):
     """
     Seção 5.2: Comparação de Métodos
     
     Args:
-        results_5_1: Resultados da seção 5.1
-        
+        results_5_1: Resultados da seção 5.1 (se None, são reconstruídos a partir de store)
+        store: ResultsStore opcional; cada atribuição é gravada assim que
+            calculada e as já gravadas não são recalculadas
+    
     Returns:
         dict: Resultados da comparação
     """
@@ -20,6 +56,11 @@ def run_section_5_2(results_5_1):
     print("🔍 SEÇÃO 5.2: COMPARAÇÃO COM MÉTODOS DE APROXIMAÇÃO")
     print("=" * 70)
     
+    if results_5_1 is None:
+        if store is None:
+            raise ValueError("Informe results_5_1 ou um ResultsStore com a Seção 5.1")
+        results_5_1 = _load_from_store(store)
+    
     comparison_results = {}
     
     for dataset_name, data in results_5_1.items():
@@ -33,19 +74,40 @@ def run_section_5_2(results_5_1):
         sample_indices = data['sample_indices']
         formal_attributions = data['formal_attributions']
         
-        approx_methods = ApproximationMethods(model, feature_names)
+        # Predições compartilhadas entre permutação, LIME e SHAP: linhas
+        # repetidas entre métodos e instâncias são avaliadas uma só vez
+        pool = PredictionPool(profiled(model))
+        approx_methods = ApproximationMethods(pool, feature_names)
+        
+        def cached(instance, method, compute):
+            if store is not None and store.has(dataset_name, instance, method):
+                return store.attributions(dataset_name, method)[instance]
+            attribution = compute()
+            if store is not None:
+                store.append(dataset_name, instance, method, attribution)
+            return attribution
         
         print("📊 Calculando importância por permutação...")
-        perm_importance = approx_methods.permutation_importance(X_test, y_test)
+        perm_importance = cached(None, 'permutation',
+                                 lambda: approx_methods.permutation_importance(X_test, y_test))
+        
+        # LIME das instâncias ainda não gravadas, com vizinhanças avaliadas em lote
+        pending = [int(idx) for idx in sample_indices
+                   if store is None or not store.has(dataset_name, int(idx), 'lime')]
+        batch = {}
+        if pending:
+            print(f"📈 LIME em lote: {len(pending)} instâncias...")
+            batch = dict(zip(pending, approx_methods.lime_attributions(X_test, pending)))
         
         lime_attributions = []
         shap_attributions = []
         
         for idx in sample_indices:
+            idx = int(idx)
             print(f"📈 Processando instância {idx}...")
             
-            lime_attr = approx_methods.lime_attribution(X_test, idx)
-            shap_attr = approx_methods.shap_approximation(X_test, idx)
+            lime_attr = cached(idx, 'lime', lambda: batch[idx])
+            shap_attr = cached(idx, 'shap', lambda: approx_methods.shap_approximation(X_test, idx))
             
             lime_attributions.append(lime_attr)
             shap_attributions.append(shap_attr)
@@ -62,6 +124,14 @@ def run_section_5_2(results_5_1):
             }
             metrics[idx] = instance_metrics
         
+        # Todas as métricas para todos os pares de métodos, uma linha por (instância, par)
+        pairwise = compare_attributions({
+            'ffa': np.vstack(formal_attributions),
+            'lime': np.vstack(lime_attributions),
+            'shap': np.vstack(shap_attributions),
+            'perm': np.tile(perm_importance, (len(sample_indices), 1))
+        }, instances=[int(idx) for idx in sample_indices])
+        
         comparison_results[dataset_name] = {
             'permutation_importance': perm_importance,
             'lime_attributions': lime_attributions,
@@ -69,10 +139,14 @@ def run_section_5_2(results_5_1):
             'formal_attributions': formal_attributions,
             'sample_indices': sample_indices,
             'feature_names': feature_names,
-            'metrics': metrics
+            'metrics': metrics,
+            'pairwise_metrics': pairwise
         }
         
         print(f"✅ {len(sample_indices)} instâncias processadas")
+        pool_stats = pool.stats()
+        print(f"   Predições: {pool_stats['rows_scored']} linhas avaliadas de {pool_stats['rows_requested']} "
+              f"pedidas em {pool_stats['model_calls']} chamadas ao modelo")
         
         print("\n📊 RESUMO DAS CORRELAÇÕES:")
         for idx in sample_indices:
@@ -0,0 +1,201 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class FeatureDomain:
+    """
+    Domínio de valores válidos de uma feature
+    
+    Tipos: 'binary' ({0, 1}), 'integer' (inteiros em [low, high]),
+    'categorical' (conjunto finito de valores) e 'continuous' (intervalo
+    [low, high]). Os três primeiros são finitos e podem ser enumerados.
+    """
+    
+    KINDS = ('binary', 'integer', 'categorical', 'continuous')
+    
+    def __init__(self, kind: str, values: Optional[Sequence[float]] = None,
+                 low: Optional[float] = None, high: Optional[float] = None):
+        """
+        Args:
+            kind: Um de KINDS
+            values: Valores de um domínio categórico
+            low: Limite inferior (integer/continuous)
+            high: Limite superior (integer/continuous)
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Tipo de domínio desconhecido: {kind}")
+        self.kind = kind
+        
+        if kind == 'binary':
+            self.values = np.array([0.0, 1.0])
+        elif kind == 'integer':
+            if low is None or high is None or high < low:
+                raise ValueError(f"Intervalo inteiro inválido: [{low}, {high}]")
+            self.values = np.arange(np.ceil(low), np.floor(high) + 1, dtype=float)
+        elif kind == 'categorical':
+            if values is None or len(values) == 0:
+                raise ValueError("Domínio categórico sem valores")
+            self.values = np.unique(np.asarray(values, dtype=float))
+        else:
+            if low is None or high is None or high < low:
+                raise ValueError(f"Intervalo contínuo inválido: [{low}, {high}]")
+            self.values = None
+        
+        if self.values is not None:
+            low, high = self.values[0], self.values[-1]
+        self.low, self.high = float(low), float(high)
+    
+    @classmethod
+    def binary(cls) -> 'FeatureDomain':
+        return cls('binary')
+    
+    @classmethod
+    def integer(cls, low: int, high: int) -> 'FeatureDomain':
+        return cls('integer', low=low, high=high)
+    
+    @classmethod
+    def categorical(cls, values: Sequence[float]) -> 'FeatureDomain':
+        return cls('categorical', values=values)
+    
+    @classmethod
+    def continuous(cls, low: float, high: float) -> 'FeatureDomain':
+        return cls('continuous', low=low, high=high)
+    
+    @property
+    def is_finite(self) -> bool:
+        return self.values is not None
+    
+    @property
+    def size(self) -> Optional[int]:
+        """
+        Número de valores (None para domínios contínuos)
+        """
+        return len(self.values) if self.is_finite else None
+    
+    def sample(self, n_samples: int) -> np.ndarray:
+        """
+        Amostra valores válidos; domínios finitos são estratificados (cada
+        valor recebe a mesma fração das amostras)
+        """
+        if self.is_finite:
+            return self.values[np.random.permutation(np.resize(np.arange(len(self.values)), n_samples))]
+        return np.random.uniform(self.low, self.high, size=n_samples)
+    
+    def __repr__(self) -> str:
+        if self.kind == 'categorical':
+            return f"FeatureDomain('categorical', values={self.values.tolist()})"
+        if self.kind == 'binary':
+            return "FeatureDomain('binary')"
+        return f"FeatureDomain('{self.kind}', low={self.low}, high={self.high})"
+
+
+class FeatureDomains:
+    """
+    Domínios de todas as features, com a mesma interface de perturbações
+    de IntervalDomain
+    
+    Quando todas as features livres são finitas e o produto dos seus
+    domínios é pequeno, a verificação de AXp enumera todas as combinações
+    (veredicto exato em uma única chamada ao modelo); caso contrário,
+    amostra apenas valores válidos de cada feature.
+    """
+    
+    def __init__(self, domains: Sequence[FeatureDomain]):
+        """
+        Args:
+            domains: Um FeatureDomain por feature
+        """
+        self.domains = list(domains)
+        self.n_features = len(self.domains)
+        # Tamanho de cada domínio; 0 marca domínio contínuo
+        self.sizes = np.array([d.size or 0 for d in self.domains], dtype=np.int64)
+    
+    @classmethod
+    def from_data(cls, X: np.ndarray, categorical_features: Sequence[int] = (),
+                  max_integer_values: int = 64) -> 'FeatureDomains':
+        """
+        Infere os domínios a partir dos valores observados
+        
+        Colunas categóricas viram domínios categóricos (binários se os
+        valores são {0, 1}); colunas inteiras não categóricas viram intervalos
+        inteiros se têm até max_integer_values valores possíveis; as demais
+        são contínuas entre o mínimo e o máximo observados.
+        
+        Args:
+            X: Dados (n_samples, n_features)
+            categorical_features: Índices das colunas categóricas
+            max_integer_values: Maior intervalo inteiro tratado como discreto
+        
+        Returns:
+            FeatureDomains: Domínio inferido de cada feature
+        """
+        X = np.asarray(X, dtype=float)
+        categorical = set(int(j) for j in categorical_features)
+        domains = []
+        
+        for j in range(X.shape[1]):
+            column = X[:, j]
+            low, high = float(np.min(column)), float(np.max(column))
+            integral = np.all(column == np.round(column))
+            if j in categorical or (integral and low >= 0 and high <= 1):
+                values = np.unique(column)
+                domains.append(FeatureDomain.binary() if set(values) <= {0.0, 1.0} and len(values) == 2
+                               else FeatureDomain.categorical(values))
+            elif integral and high - low + 1 <= max_integer_values:
+                domains.append(FeatureDomain.integer(low, high))
+            else:
+                domains.append(FeatureDomain.continuous(low, high))
+        
+        return cls(domains)
+    
+    def feature_bounds(self) -> List[Tuple[float, float]]:
+        """
+        Limites (min, max) de cada domínio
+        """
+        return [(d.low, d.high) for d in self.domains]
+    
+    def kinds(self) -> Dict[str, int]:
+        """
+        Número de features de cada tipo
+        """
+        return {kind: sum(d.kind == kind for d in self.domains) for kind in FeatureDomain.KINDS}
+    
+    def n_combinations(self, fixed_mask: np.ndarray) -> Optional[int]:
+        """
+        Número de combinações das features livres (None se alguma é contínua)
+        """
+        free_sizes = self.sizes[~np.asarray(fixed_mask, dtype=bool)]
+        if np.any(free_sizes == 0):
+            return None
+        return int(np.prod(free_sizes.astype(object))) if len(free_sizes) else 1
+    
+    def perturbations(self, instance: np.ndarray, fixed_mask: np.ndarray, n_samples: int,
+                      max_exact: int = 4096) -> Tuple[np.ndarray, bool]:
+        """
+        Gera as perturbações de um subconjunto de features fixas
+        
+        Args:
+            instance: Instância a ser explicada
+            fixed_mask: Máscara booleana (n_features,) das features fixas
+            n_samples: Número de amostras quando a enumeração não é exata
+            max_exact: Número máximo de combinações enumeradas exatamente
+        
+        Returns:
+            Tuple[np.ndarray, bool]: Perturbações e se elas cobrem todo o domínio
+        """
+        fixed_mask = np.asarray(fixed_mask, dtype=bool)
+        free = np.flatnonzero(~fixed_mask)
+        base = np.asarray(instance, dtype=float)
+        n_exact = self.n_combinations(fixed_mask)
+        
+        if n_exact is not None and n_exact <= max_exact:
+            samples = np.tile(base, (n_exact, 1))
+            if len(free) > 0:
+                grid = np.meshgrid(*[self.domains[j].values for j in free], indexing='ij')
+                samples[:, free] = np.stack([g.ravel() for g in grid], axis=1)
+            return samples, True
+        
+        samples = np.tile(base, (n_samples, 1))
+        for j in free:
+            samples[:, j] = self.domains[j].sample(n_samples)
+        return samples, False
@@ -1,77 +1,550 @@
 import numpy as np
-from z3 import Solver, Real
-from typing import List, Set, Tuple
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 import warnings
 
+from feature_domain import FeatureDomains
+from interval_domain import IntervalDomain
+from parallel import explain_many
+from profiling import timed
+from signatures import group_instances, leaf_signatures, region_signatures
+from subset_store import PackedSubsetStore
+from tree_structure import parse_tree_model, split_thresholds
+from verdict_cache import SubsetVerdictCache, bool_mask_to_int, subset_to_mask
+
 
 class FormalFFA:
     """
     Baseado na Definição 1: AXp (Abductive Explanations)
     """
     
-    def __init__(self, model, feature_bounds: List[Tuple[float, float]]):
+    def __init__(self, model, feature_bounds: List[Tuple[float, float]], oracle=None,
+                 cache_size: Optional[int] = 100000, interval_domain=None,
+                 max_exact: int = 4096, shrink: str = 'linear', domains=None,
+                 share_regions: bool = True):
+        """
+        Args:
+            model: Modelo treinado
+            feature_bounds: Limites (min, max) de cada feature
+            oracle: Oráculo exato opcional (ex.: SMTOracle) com método is_axp;
+                se None, as AXps são verificadas por amostragem
+            cache_size: Número máximo de veredictos no cache por monotonicidade
+                (None ou 0 desativa o cache)
+            interval_domain: IntervalDomain opcional (True o constrói a partir do
+                modelo); as features livres passam a variar apenas entre os
+                intervalos de thresholds do modelo
+            max_exact: Com interval_domain ou domains, número máximo de
+                combinações enumeradas exatamente (acima disso, amostragem)
+            shrink: Redução de candidatos na enumeração: 'linear' ou
+                'quickxplain' (menos verificações com muitas features, ex.: imagens)
+            domains: FeatureDomains opcional (ou lista de FeatureDomain) com o
+                tipo de cada feature (binária, inteira, categórica, contínua);
+                as features livres assumem apenas valores válidos, enumerados
+                exatamente quando o produto dos domínios é pequeno
+            share_regions: Em modelos de árvores, indexa o cache de veredictos
+                pela região da instância (intervalos entre thresholds), de modo
+                que instâncias da mesma região compartilham veredictos
+        """
         self.model = model
         self.feature_bounds = feature_bounds
         self.n_features = len(feature_bounds)
+        self.oracle = oracle
+        self.verdict_cache = SubsetVerdictCache(cache_size) if cache_size else None
+        if interval_domain is True:
+            interval_domain = IntervalDomain.from_model(model, feature_bounds)
+        self.interval_domain = interval_domain or None
+        if domains is not None and not isinstance(domains, FeatureDomains):
+            domains = FeatureDomains(domains)
+        if domains is not None and domains.n_features != self.n_features:
+            raise ValueError(f"{domains.n_features} domínios para {self.n_features} features")
+        if domains is not None and self.interval_domain is not None:
+            raise ValueError("Use interval_domain ou domains, não ambos")
+        self.domains = domains
+        self.max_exact = max_exact
+        self.shrink = shrink
+        # AXps/CXps da última enumeração (PackedSubsetStore), para inspeção ou gravação
+        self.explanations = {}
+        self.share_regions = share_regions
+        # (thresholds, regra de decisão) do modelo; False se não é de árvores
+        self._regions = None
+        self._last_key = None
+    
+    def _subset_mask(self, feature_subset: Set[int]) -> np.ndarray:
+        """
+        Converte um subconjunto de features em máscara booleana
+        """
+        mask = np.zeros(self.n_features, dtype=bool)
+        mask[list(feature_subset)] = True
+        return mask
+    
+    def _sample_perturbations(self, instance: np.ndarray, fixed_mask: np.ndarray,
+                              n_samples: int) -> np.ndarray:
+        """
+        Gera perturbações da instância em uma única amostragem vetorizada
+        
+        Args:
+            instance: Instância a ser explicada
+            fixed_mask: Máscara (n_features,) ou (n_samples, n_features) das features fixas
+            n_samples: Número de perturbações
+        
+        Returns:
+            np.ndarray: Matriz (n_samples, n_features) de perturbações
+        """
+        bounds = np.asarray(self.feature_bounds, dtype=float)
+        samples = np.random.uniform(bounds[:, 0], bounds[:, 1],
+                                    size=(n_samples, self.n_features))
+        return np.where(fixed_mask, np.asarray(instance, dtype=float), samples)
+    
+    def _subset_perturbations(self, instance: np.ndarray, fixed_mask: np.ndarray,
+                              n_samples: int) -> np.ndarray:
+        """
+        Perturbações de um único subconjunto: enumeração/amostragem por
+        intervalos (interval_domain) ou por domínios das features (domains),
+        amostragem uniforme caso contrário
+        """
+        domain = self.interval_domain or self.domains
+        if domain is not None:
+            samples, _ = domain.perturbations(instance, fixed_mask, n_samples, self.max_exact)
+            return samples
+        return self._sample_perturbations(instance, fixed_mask, n_samples)
+    
+    def _region_model(self):
+        if self._regions is None:
+            try:
+                self._regions = (split_thresholds(self.model, self.n_features),
+                                 parse_tree_model(self.model)['decision'])
+            except (ValueError, AttributeError, TypeError):
+                self._regions = False
+        return self._regions
+    
+    def region_signatures(self, X: np.ndarray) -> np.ndarray:
+        """
+        Região (intervalo entre thresholds de cada feature) de cada instância
+        
+        Raises:
+            ValueError: Se o modelo não é de árvores
+        """
+        regions = self._region_model()
+        if not regions:
+            raise ValueError(f"Regiões requerem um modelo de árvores: {type(self.model).__name__}")
+        return region_signatures(self.model, X, *regions)
+    
+    def _cache_key(self, instance: np.ndarray, target: int) -> Tuple[bytes, int]:
+        key = np.asarray(instance, dtype=float).tobytes()
+        if self.share_regions and self._region_model():
+            # Os veredictos só dependem da região da instância
+            if self._last_key is None or self._last_key[0] != key:
+                self._last_key = (key, self.region_signatures(instance)[0].tobytes())
+            key = self._last_key[1]
+        return key, int(target)
     
     def check_axp(self, instance: np.ndarray, feature_subset: Set[int], target: int, 
-                  n_samples: int = 100) -> bool:
+                  n_samples: int = 100, batch_size: Optional[int] = None) -> bool:
         """
         Args:
             instance: Instância a ser explicada
             feature_subset: Conjunto de índices de features
             target: Classe alvo
             n_samples: Número de amostras para verificação
-            
+            batch_size: Tamanho dos lotes de predição. None classifica todas as
+                amostras em uma única chamada; caso contrário, para no primeiro
+                lote com uma amostra classificada fora da classe alvo
+        
         Returns:
             bool: True se o subconjunto é uma AXp
         """
         try:
-            for _ in range(n_samples):
-                test_instance = instance.copy()
-                
-                for i in range(self.n_features):
-                    if i not in feature_subset:
-                        low, high = self.feature_bounds[i]
-                        test_instance[i] = np.random.uniform(low, high)
-                
-                prediction = self.model.predict([test_instance])[0]
-                if prediction != target:
-                    return False
+            if self.verdict_cache is not None:
+                key = self._cache_key(instance, target)
+                mask = subset_to_mask(feature_subset)
+                cached = self.verdict_cache.lookup(key, mask)
+                if cached is not None:
+                    return cached
             
-            return True
+            verdict = self._verify_subset(instance, feature_subset, target, n_samples, batch_size)
             
+            if self.verdict_cache is not None:
+                self.verdict_cache.store(key, mask, verdict)
+            return verdict
+        
         except Exception as e:
             warnings.warn(f"Erro na verificação AXp: {e}")
             return False
     
-    def compute_ffa(self, instance: np.ndarray, target: int, 
-                   n_combinations: int = 50) -> np.ndarray:
+    @timed('formal.verify_subset')
+    def _verify_subset(self, instance: np.ndarray, feature_subset: Set[int], target: int,
+                       n_samples: int, batch_size: Optional[int]) -> bool:
         """
+        Verificação de AXp sem cache (oráculo exato ou amostragem)
+        """
+        if self.oracle is not None:
+            return self.oracle.is_axp(instance, set(feature_subset), target)
+        
+        fixed_mask = self._subset_mask(feature_subset)
+        samples = self._subset_perturbations(instance, fixed_mask, n_samples)
+        batch_size = len(samples) if batch_size is None else max(1, batch_size)
+        
+        for start in range(0, len(samples), batch_size):
+            predictions = self.model.predict(samples[start:start + batch_size])
+            if np.any(predictions != target):
+                return False
+        
+        return True
+    
+    def check_axp_batch(self, instance: np.ndarray, subset_masks: np.ndarray, target: int,
+                        n_samples: int = 100, max_rows: int = 100000) -> np.ndarray:
+        """
+        Verifica vários subconjuntos com uma única matriz de perturbações
+        
         Args:
             instance: Instância a ser explicada
+            subset_masks: Máscaras booleanas (n_subsets, n_features) dos subconjuntos
             target: Classe alvo
-            n_combinations: Número de combinações para testar
+            n_samples: Número de amostras por subconjunto
+            max_rows: Número máximo de linhas por chamada ao modelo
+        
+        Returns:
+            np.ndarray: Vetor booleano indicando quais subconjuntos são AXps
+        """
+        subset_masks = np.asarray(subset_masks, dtype=bool).reshape(-1, self.n_features)
+        n_subsets = len(subset_masks)
+        
+        try:
+            unique_masks, inverse = np.unique(subset_masks, axis=0, return_inverse=True)
+            unique_verdicts = np.zeros(len(unique_masks), dtype=bool)
+            pending = np.ones(len(unique_masks), dtype=bool)
+            
+            if self.verdict_cache is not None:
+                key = self._cache_key(instance, target)
+                int_masks = [bool_mask_to_int(mask) for mask in unique_masks]
+                for i, mask in enumerate(int_masks):
+                    cached = self.verdict_cache.lookup(key, mask)
+                    if cached is not None:
+                        unique_verdicts[i] = cached
+                        pending[i] = False
+            
+            pending_idx = np.flatnonzero(pending)
+            unique_verdicts[pending_idx] = self._verify_batch(
+                instance, unique_masks[pending_idx], target, n_samples, max_rows
+            )
             
+            if self.verdict_cache is not None:
+                for i in pending_idx:
+                    self.verdict_cache.store(key, int_masks[i], bool(unique_verdicts[i]))
+            
+            return unique_verdicts[inverse.reshape(-1)]
+        
+        except Exception as e:
+            warnings.warn(f"Erro na verificação AXp: {e}")
+            return np.zeros(n_subsets, dtype=bool)
+    
+    @timed('formal.verify_batch')
+    def _verify_batch(self, instance: np.ndarray, subset_masks: np.ndarray, target: int,
+                      n_samples: int, max_rows: int) -> np.ndarray:
+        """
+        Verificação em lote sem cache (oráculo exato ou amostragem)
+        """
+        verdicts = np.zeros(len(subset_masks), dtype=bool)
+        
+        if self.oracle is not None:
+            for i, mask in enumerate(subset_masks):
+                verdicts[i] = self.oracle.is_axp(instance, set(np.flatnonzero(mask)), target)
+            return verdicts
+        
+        if self.interval_domain is not None or self.domains is not None:
+            return self._verify_batch_by_subset(instance, subset_masks, target, n_samples, max_rows)
+        
+        subsets_per_call = max(1, max_rows // max(1, n_samples))
+        
+        for start in range(0, len(subset_masks), subsets_per_call):
+            masks = subset_masks[start:start + subsets_per_call]
+            rows_mask = np.repeat(masks, n_samples, axis=0)
+            samples = self._sample_perturbations(instance, rows_mask, len(rows_mask))
+            predictions = np.asarray(self.model.predict(samples))
+            verdicts[start:start + len(masks)] = np.all(
+                predictions.reshape(len(masks), n_samples) == target, axis=1
+            )
+        
+        return verdicts
+    
+    def _verify_batch_by_subset(self, instance: np.ndarray, subset_masks: np.ndarray,
+                                target: int, n_samples: int, max_rows: int) -> np.ndarray:
+        """
+        Verificação em lote quando cada subconjunto tem seu próprio número de
+        perturbações; os subconjuntos são agrupados em chamadas de até max_rows linhas
+        """
+        verdicts = np.zeros(len(subset_masks), dtype=bool)
+        pending, pending_rows = [], 0
+        
+        def flush():
+            nonlocal pending, pending_rows
+            if not pending:
+                return
+            predictions = np.asarray(self.model.predict(np.vstack([rows for _, rows in pending])))
+            offsets = np.cumsum([0] + [len(rows) for _, rows in pending])
+            for (i, _), start, stop in zip(pending, offsets[:-1], offsets[1:]):
+                verdicts[i] = np.all(predictions[start:stop] == target)
+            pending, pending_rows = [], 0
+        
+        for i, mask in enumerate(subset_masks):
+            rows = self._subset_perturbations(instance, mask, n_samples)
+            if pending_rows + len(rows) > max_rows:
+                flush()
+            pending.append((i, rows))
+            pending_rows += len(rows)
+        flush()
+        
+        return verdicts
+    
+    def _random_subset_masks(self, n_combinations: int) -> np.ndarray:
+        """
+        Sorteia subconjuntos aleatórios (tamanho uniforme em [1, n_features])
+        """
+        sizes = np.random.randint(1, self.n_features + 1, size=n_combinations)
+        permutations = np.argsort(np.random.random((n_combinations, self.n_features)), axis=1)
+        return permutations < sizes[:, None]
+    
+    def enumerate_explanations(self, instance: np.ndarray, target: int, n_samples: int = 20,
+                               prefer: str = 'axp') -> Iterator[Tuple[str, Set[int]]]:
+        """
+        Enumera AXps e CXps mínimas via dualidade de hitting sets
+        
+        Args:
+            instance: Instância a ser explicada
+            target: Classe alvo
+            n_samples: Número de amostras por verificação (sem oráculo exato)
+            prefer: 'axp' para encontrar AXps primeiro, 'cxp' para CXps primeiro
+        
+        Yields:
+            Tuple[str, Set[int]]: ('axp', subconjunto) ou ('cxp', subconjunto)
+        """
+        from axp_enumeration import AXpEnumerator
+        
+        enumerator = AXpEnumerator(
+            lambda subset: self.check_axp(instance, subset, target, n_samples=n_samples),
+            self.n_features, prefer=prefer, shrink=self.shrink
+        )
+        return enumerator.enumerate()
+    
+    @timed('formal.compute_ffa')
+    def compute_ffa(self, instance: np.ndarray, target: int, 
+                   n_combinations: Optional[int] = 50, method: str = 'marco',
+                   n_samples: int = 20) -> np.ndarray:
+        """
+        Args:
+            instance: Instância a ser explicada
+            target: Classe alvo
+            n_combinations: Com method='marco', número máximo de AXps enumeradas
+                (None enumera todas); com method='random', número de
+                subconjuntos aleatórios testados
+            method: 'marco' (enumeração de AXps) ou 'random' (subconjuntos aleatórios)
+            n_samples: Número de amostras por verificação (sem oráculo exato)
+        
         Returns:
             np.ndarray: Scores de atribuição para cada feature
         """
+        if method == 'random':
+            return self._compute_ffa_random(instance, target, n_combinations, n_samples)
+        if method != 'marco':
+            raise ValueError(f"Método desconhecido: {method}")
+        
         scores = np.zeros(self.n_features)
-        tested_subsets = 0
+        for snapshot in self.anytime_ffa(instance, target, max_axps=n_combinations,
+                                         n_samples=n_samples):
+            scores = snapshot['scores']
+        
+        return scores
+    
+    def anytime_ffa(self, instance: np.ndarray, target: int,
+                    time_limit: Optional[float] = None, max_axps: Optional[int] = None,
+                    n_samples: int = 20, snapshot_every: int = 1,
+                    prefer: str = 'axp') -> Iterator[Dict]:
+        """
+        FFA anytime: produz atribuições intermediárias durante a enumeração
+        
+        O prazo é verificado entre explicações; uma verificação de AXp em
+        andamento não é interrompida.
+        As AXps e CXps encontradas ficam em self.explanations['axp'] e
+        self.explanations['cxp'] como PackedSubsetStore.
         
-        for _ in range(n_combinations):
-            subset_size = np.random.randint(1, self.n_features + 1)
-            subset = set(np.random.choice(self.n_features, subset_size, replace=False))
+        Args:
+            instance: Instância a ser explicada
+            target: Classe alvo
+            time_limit: Tempo máximo de execução em segundos (None = sem limite)
+            max_axps: Número máximo de AXps enumeradas (None = sem limite)
+            n_samples: Número de amostras por verificação (sem oráculo exato)
+            snapshot_every: Produz um snapshot a cada N AXps encontradas
+            prefer: 'axp' para AXps primeiro; 'cxp' para CXps primeiro, que
+                costuma convergir mais rápido com muitas features
+        
+        Yields:
+            Dict: Snapshot com 'scores', 'n_axps', 'n_cxps', 'elapsed', 'delta'
+                (distância L1 ao snapshot anterior), 'ranking_changed',
+                'stable_for' (snapshots consecutivos com o mesmo ranking) e
+                'complete' (True quando a enumeração foi esgotada)
+        """
+        start = time.perf_counter()
+        axps = PackedSubsetStore(self.n_features)
+        cxps = PackedSubsetStore(self.n_features)
+        self.explanations = {'axp': axps, 'cxp': cxps}
+        previous_scores = np.zeros(self.n_features)
+        previous_ranking = None
+        stable_for = 0
+        
+        def snapshot(complete: bool) -> Dict:
+            nonlocal previous_scores, previous_ranking, stable_for
+            scores = axps.scores()
+            ranking = np.argsort(-scores, kind='stable')
+            ranking_changed = previous_ranking is None or not np.array_equal(ranking, previous_ranking)
+            stable_for = 0 if ranking_changed else stable_for + 1
+            result = {
+                'scores': scores,
+                'n_axps': len(axps),
+                'n_cxps': len(cxps),
+                'elapsed': time.perf_counter() - start,
+                'delta': float(np.sum(np.abs(scores - previous_scores))),
+                'ranking_changed': ranking_changed,
+                'stable_for': stable_for,
+                'complete': complete
+            }
+            previous_scores, previous_ranking = scores, ranking
+            return result
+        
+        def budget_exhausted() -> bool:
+            if max_axps is not None and len(axps) >= max_axps:
+                return True
+            return time_limit is not None and time.perf_counter() - start >= time_limit
+        
+        complete = True
+        last_reported = -1
+        for kind, subset in self.enumerate_explanations(instance, target, n_samples, prefer=prefer):
+            if kind == 'axp':
+                axps.add(subset)
+                if len(axps) % snapshot_every == 0:
+                    last_reported = len(axps)
+                    yield snapshot(False)
+            else:
+                cxps.add(subset)
             
-            if self.check_axp(instance, subset, target, n_samples=20):
-                for feature in subset:
-                    scores[feature] += 1
-                tested_subsets += 1
+            if budget_exhausted():
+                complete = False
+                break
+        
+        if complete or last_reported != len(axps):
+            yield snapshot(complete)
+    
+    def timed_ffa(self, instance: np.ndarray, target: int, checkpoints: Sequence[float],
+                  n_samples: int = 20, prefer: str = 'axp') -> Dict[float, Dict]:
+        """
+        Atribuições anytime registradas em instantes fixos (ex.: 10 s, 1200 s)
+        
+        Cada instante recebe o último snapshot produzido até ele; se a
+        enumeração terminar antes, os instantes restantes recebem o resultado
+        completo.
+        
+        Args:
+            instance: Instância a ser explicada
+            target: Classe alvo
+            checkpoints: Instantes em segundos; o maior é o limite de tempo
+            n_samples: Número de amostras por verificação (sem oráculo exato)
+            prefer: 'axp' ou 'cxp' (ver anytime_ffa)
+        
+        Returns:
+            Dict[float, Dict]: Snapshot de cada instante
+        """
+        checkpoints = sorted(checkpoints)
+        empty = {'scores': np.zeros(self.n_features), 'n_axps': 0, 'n_cxps': 0,
+                 'elapsed': 0.0, 'complete': False}
+        results = {t: empty for t in checkpoints}
+        
+        for snapshot in self.anytime_ffa(instance, target, time_limit=checkpoints[-1],
+                                         n_samples=n_samples, prefer=prefer):
+            for t in checkpoints:
+                if snapshot['elapsed'] <= t or snapshot['complete']:
+                    results[t] = snapshot
+        
+        return results
+    
+    def _compute_ffa_random(self, instance: np.ndarray, target: int,
+                            n_combinations: int, n_samples: int) -> np.ndarray:
+        """
+        FFA aproximado a partir de subconjuntos aleatórios verificados em lote
+        """
+        subset_masks = self._random_subset_masks(n_combinations)
+        verdicts = self.check_axp_batch(instance, subset_masks, target, n_samples=n_samples)
+        
+        scores = subset_masks[verdicts].sum(axis=0).astype(float)
+        tested_subsets = int(np.sum(verdicts))
         
         if tested_subsets > 0:
             scores = scores / tested_subsets
         
         return scores
+    
+    def explain_many(self, X: np.ndarray, targets: np.ndarray, n_jobs: Optional[int] = None,
+                     **kwargs) -> Dict:
+        """
+        Calcula o FFA de várias instâncias em um pool de processos
+        
+        Args:
+            X: Instâncias a explicar (n_instances, n_features)
+            targets: Classe alvo de cada instância
+            n_jobs: Número de processos (None = todos os núcleos; 1 = sem pool)
+            **kwargs: Argumentos repassados a compute_ffa
+        
+        Returns:
+            dict: 'attributions' na ordem de entrada e 'errors' {índice: mensagem}
+        """
+        return explain_many(self, 'compute_ffa', X, targets, n_jobs=n_jobs, **kwargs)
+    
+    def explain_grouped(self, X: np.ndarray, targets: np.ndarray, n_jobs: Optional[int] = None,
+                        by: str = 'region', on_result=None, **kwargs) -> Dict:
+        """
+        Explica um representante por grupo de instâncias equivalentes e
+        reaproveita a explicação nas demais
+        
+        Args:
+            X: Instâncias a explicar (n_instances, n_features)
+            targets: Classe alvo de cada instância
+            n_jobs: Número de processos (ver explain_many)
+            by: 'region' agrupa por intervalos entre thresholds (explicações
+                idênticas garantidas); 'leaf' agrupa pelas folhas atingidas em
+                cada árvore (apply), mais grosseiro: mesma predição, mas nem
+                sempre os mesmos veredictos
+            on_result: Função (índice, atribuição, erro) chamada para cada
+                instância, na ordem em que os grupos terminam
+            **kwargs: Argumentos repassados a compute_ffa
+        
+        Returns:
+            dict: 'attributions' e 'errors' (como explain_many), 'groups'
+                (grupo de cada instância) e 'n_groups'
+        """
+        X = np.asarray(X)
+        targets = np.asarray(targets).reshape(-1)
+        if by == 'region':
+            signatures = self.region_signatures(X)
+        elif by == 'leaf':
+            signatures = leaf_signatures(self.model, X)
+        else:
+            raise ValueError(f"Agrupamento desconhecido: {by}")
+        representatives, groups = group_instances(signatures, targets)
+        members = [np.flatnonzero(groups == g) for g in range(len(representatives))]
+        
+        def forward(g, attribution, error):
+            if on_result is not None:
+                for i in members[g]:
+                    on_result(int(i), attribution, error)
+        
+        result = explain_many(self, 'compute_ffa', X[representatives], targets[representatives],
+                              n_jobs=n_jobs, on_result=forward, **kwargs)
+        errors = {int(i): error for g, error in result['errors'].items() for i in members[g]}
+        
+        return {
+            'attributions': result['attributions'][groups],
+            'errors': errors,
+            'groups': groups,
+            'n_groups': len(representatives)
+        }
 
 
 class HeuristicFFA:
@@ -79,40 +552,99 @@ class HeuristicFFA:
     Implementação heurística do FFA baseada em perturbações locais
     """
     
-    def __init__(self, model, feature_names: List[str], n_features: int):
+    def __init__(self, model, feature_names: List[str], n_features: int,
+                 feature_bounds: Optional[List[Tuple[float, float]]] = None):
+        """
+        Args:
+            model: Modelo treinado
+            feature_names: Nomes das features
+            n_features: Número de features
+            feature_bounds: Limites (min, max) de cada feature (padrão: [0, 1]);
+                as perturbações são proporcionais à amplitude e limitadas a eles
+        """
         self.model = model
         self.feature_names = feature_names
         self.n_features = n_features
+        self.feature_bounds = feature_bounds or [(0, 1)] * n_features
+        if len(self.feature_bounds) != n_features:
+            raise ValueError(f"{len(self.feature_bounds)} limites para {n_features} features")
     
     def compute(self, instance: np.ndarray, target: int, 
-                epsilon: float = 0.1, n_samples: int = 100) -> np.ndarray:
+                epsilon: float = 0.1, n_samples: int = 100,
+                chunk_size: int = 10000) -> np.ndarray:
         """
         Args:
             instance: Instância a ser explicada
             target: Classe alvo
-            epsilon: Magnitude da perturbação
+            epsilon: Magnitude da perturbação (fração da amplitude da feature)
             n_samples: Número de amostras por feature
-            
+            chunk_size: Número máximo de linhas por chamada a predict_proba
+                (limita o pico de memória)
+        
         Returns:
             np.ndarray: Scores de atribuição normalizados
         """
-        original_prob = self.model.predict_proba([instance])[0, target]
-        scores = np.zeros(self.n_features)
+        return self.compute_classes(instance, [target], epsilon, n_samples, chunk_size)[0]
+    
+    @timed('heuristic.compute')
+    def compute_classes(self, instance: np.ndarray, classes=None,
+                        epsilon: float = 0.1, n_samples: int = 100,
+                        chunk_size: int = 10000) -> np.ndarray:
+        """
+        FFA heurístico de várias classes a partir das mesmas perturbações
         
-        for i in range(self.n_features):
-            total_effect = 0
-            
-            for _ in range(n_samples):
-                perturbed_instance = instance.copy()
-                perturbation = epsilon * (2 * np.random.random() - 1)
-                perturbed_instance[i] = np.clip(perturbed_instance[i] + perturbation, 0, 1)
-                
-                perturbed_prob = self.model.predict_proba([perturbed_instance])[0, target]
-                total_effect += abs(original_prob - perturbed_prob)
-            
-            scores[i] = total_effect / n_samples
+        Cada lote de perturbações é avaliado uma única vez; os efeitos de
+        todas as classes saem da mesma matriz de probabilidades.
+        
+        Args:
+            instance: Instância a ser explicada
+            classes: Índices das classes (colunas de predict_proba; padrão: todas)
+            epsilon: Magnitude da perturbação (fração da amplitude da feature)
+            n_samples: Número de amostras por feature
+            chunk_size: Número máximo de linhas por chamada a predict_proba
+        
+        Returns:
+            np.ndarray: Scores normalizados (n_classes, n_features)
+        """
+        instance = np.asarray(instance, dtype=float)
+        original_probs = self.model.predict_proba([instance])[0]
+        classes = (np.arange(len(original_probs)) if classes is None
+                   else np.asarray(classes, dtype=int).reshape(-1))
+        original_probs = original_probs[classes]
         
-        if np.sum(scores) > 0:
-            scores = scores / np.sum(scores)
+        # Linha r perturba a feature r // n_samples
+        n_rows = self.n_features * n_samples
+        features = np.repeat(np.arange(self.n_features), n_samples)
+        lower, upper = np.asarray(self.feature_bounds, dtype=float).T
+        perturbations = epsilon * (upper - lower)[features] * (2 * np.random.random(n_rows) - 1)
+        perturbed_values = np.clip(instance[features] + perturbations, lower[features], upper[features])
         
-        return scores
\ No newline at end of file
+        effects = np.empty((n_rows, len(classes)))
+        chunk_size = max(1, chunk_size)
+        for start in range(0, n_rows, chunk_size):
+            stop = min(start + chunk_size, n_rows)
+            chunk = np.tile(instance, (stop - start, 1))
+            chunk[np.arange(stop - start), features[start:stop]] = perturbed_values[start:stop]
+            perturbed_probs = self.model.predict_proba(chunk)[:, classes]
+            effects[start:stop] = np.abs(original_probs - perturbed_probs)
+        
+        scores = effects.reshape(self.n_features, n_samples, len(classes)).mean(axis=1).T
+        
+        totals = scores.sum(axis=1, keepdims=True)
+        return np.divide(scores, totals, out=scores.copy(), where=totals > 0)
+    
+    def explain_many(self, X: np.ndarray, targets: np.ndarray, n_jobs: Optional[int] = None,
+                     **kwargs) -> Dict:
+        """
+        Calcula o FFA heurístico de várias instâncias em um pool de processos
+        
+        Args:
+            X: Instâncias a explicar (n_instances, n_features)
+            targets: Classe alvo de cada instância
+            n_jobs: Número de processos (None = todos os núcleos; 1 = sem pool)
+            **kwargs: Argumentos repassados a compute
+        
+        Returns:
+            dict: 'attributions' na ordem de entrada e 'errors' {índice: mensagem}
+        """
+        return explain_many(self, 'compute', X, targets, n_jobs=n_jobs, **kwargs)
\ No newline at end of file
@@ -0,0 +1,118 @@
+import os
+import re
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+# Arquivos locais opcionais: <repositório>/datasets/img/<fonte>.npz
+DEFAULT_ROOT = os.path.join(os.path.dirname(__file__), '..', '..', 'datasets', 'img')
+
+_NAME_PATTERN = re.compile(r'^(\d+),(\d+)_([a-z]+)_(\d+)v(\d+)$')
+
+
+def parse_image_dataset(name: str) -> Tuple[Tuple[int, int], str, Tuple[int, int]]:
+    """
+    Interpreta nomes no formato dos gráficos, ex.: '10,10_mnist_1v3'
+    
+    Returns:
+        Tuple: Formato (linhas, colunas), fonte e par de dígitos (classe 0, classe 1)
+    """
+    match = _NAME_PATTERN.match(name)
+    if match is None:
+        raise ValueError(f"Nome de dataset de imagens inválido: {name}")
+    rows, cols, source, negative, positive = match.groups()
+    return (int(rows), int(cols)), source, (int(negative), int(positive))
+
+
+def resize_images(images: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Redimensiona imagens (n, h, w) por média de área
+    
+    Cada pixel de saída é a média dos pixels de entrada que ele cobre,
+    ponderada pela sobreposição; funciona para reduções e ampliações.
+    """
+    def weights(n_in: int, n_out: int) -> np.ndarray:
+        edges_out = np.arange(n_out + 1) * n_in / n_out
+        low = np.maximum(edges_out[:-1, None], np.arange(n_in)[None, :])
+        high = np.minimum(edges_out[1:, None], np.arange(1, n_in + 1)[None, :])
+        overlap = np.clip(high - low, 0, None)
+        return overlap / overlap.sum(axis=1, keepdims=True)
+    
+    images = np.asarray(images, dtype=float)
+    rows = weights(images.shape[1], shape[0])
+    cols = weights(images.shape[2], shape[1])
+    return np.einsum('ri,nij,cj->nrc', rows, images, cols)
+
+
+def _load_source(source: str, root: str, data_home: Optional[str]) -> Tuple[np.ndarray, np.ndarray,
+                                                                             np.ndarray, np.ndarray]:
+    """
+    Imagens (n, h, w) em [0, 1] e rótulos de treino e teste da fonte
+    """
+    local_path = os.path.join(root, f'{source}.npz')
+    if os.path.exists(local_path):
+        # Formato do Keras: x_train, y_train, x_test, y_test
+        with np.load(local_path) as data:
+            images = [data['x_train'], data['x_test']]
+            labels = [data['y_train'], data['y_test']]
+        scale = max(float(np.max(images[0])), 1.0)
+        return images[0] / scale, labels[0], images[1] / scale, labels[1]
+    
+    if source == 'mnist':
+        from sklearn.datasets import fetch_openml
+        
+        mnist = fetch_openml('mnist_784', version=1, as_frame=False, data_home=data_home)
+        images = mnist.data.reshape(-1, 28, 28) / 255.0
+        labels = mnist.target.astype(int)
+        # Divisão padrão do MNIST: 60000 de treino, 10000 de teste
+        return images[:60000], labels[:60000], images[60000:], labels[60000:]
+    
+    if source == 'digits':
+        from sklearn.datasets import load_digits
+        from sklearn.model_selection import train_test_split
+        
+        # Dígitos 8x8 do scikit-learn: disponível sem download
+        digits = load_digits()
+        images = digits.images / 16.0
+        X_train, X_test, y_train, y_test = train_test_split(
+            images, digits.target, test_size=0.3, random_state=42
+        )
+        return X_train, y_train, X_test, y_test
+    
+    raise ValueError(f"Fonte de imagens desconhecida: {source}")
+
+
+def load_image_dataset(name: str, binarize: bool = False, root: Optional[str] = None,
+                       data_home: Optional[str] = None) -> Dict:
+    """
+    Carrega um problema binário de imagens reduzidas, ex.: '10,10_mnist_1v3'
+    
+    As imagens são redimensionadas para o formato do nome e achatadas: cada
+    pixel é uma feature em [0, 1] (ou {0, 1} com binarize=True).
+    
+    Args:
+        name: '<linhas>,<colunas>_<fonte>_<a>v<b>' com fonte 'mnist' ou 'digits'
+        binarize: Limiariza os pixels em 0.5
+        root: Diretório com arquivos <fonte>.npz locais (padrão: datasets/img)
+        data_home: Cache do fetch_openml para o MNIST
+    
+    Returns:
+        dict: X_train, X_test, y_train, y_test (classe 1 = dígito b), formato
+            da imagem, nomes e limites das features
+    """
+    shape, source, (negative, positive) = parse_image_dataset(name)
+    X_train, y_train, X_test, y_test = _load_source(source, os.path.abspath(root or DEFAULT_ROOT),
+                                                    data_home)
+    
+    data = {'name': name, 'shape': shape}
+    for split, images, labels in (('train', X_train, y_train), ('test', X_test, y_test)):
+        labels = np.asarray(labels).astype(int)
+        keep = (labels == negative) | (labels == positive)
+        X = resize_images(images[keep], shape).reshape(int(keep.sum()), -1)
+        if binarize:
+            X = (X >= 0.5).astype(float)
+        data[f'X_{split}'] = X
+        data[f'y_{split}'] = (labels[keep] == positive).astype(int)
+    
+    data['feature_names'] = [f'px_{r}_{c}' for r in range(shape[0]) for c in range(shape[1])]
+    data['feature_bounds'] = [(0.0, 1.0)] * (shape[0] * shape[1])
+    return data
\ No newline at end of file
@@ -0,0 +1,104 @@
+import numpy as np
+from typing import List, Tuple
+
+from tree_structure import parse_tree_model, split_thresholds
+
+
+class IntervalDomain:
+    """
+    Abstração do domínio de cada feature pelos intervalos entre thresholds
+    
+    Um ensemble de árvores só distingue em qual intervalo entre thresholds
+    consecutivos cada feature cai. Basta portanto um representante por
+    intervalo: a verificação de AXp é exata enumerando o produto dos
+    intervalos das features livres quando ele é pequeno, e usa amostragem
+    estratificada sobre os intervalos caso contrário.
+    """
+    
+    def __init__(self, thresholds: List[np.ndarray], feature_bounds: List[Tuple[float, float]],
+                 decision: str = '<'):
+        """
+        Args:
+            thresholds: Thresholds de divisão de cada feature
+            feature_bounds: Limites (min, max) de cada feature
+            decision: '<' (XGBoost: x < t vai à esquerda) ou '<=' (scikit-learn)
+        """
+        if decision not in ('<', '<='):
+            raise ValueError(f"Regra de decisão inválida: {decision}")
+        
+        self.feature_bounds = feature_bounds
+        self.n_features = len(feature_bounds)
+        self.decision = decision
+        self.representatives = [self._representatives(np.asarray(t, dtype=float), low, high)
+                                for t, (low, high) in zip(thresholds, feature_bounds)]
+        self.sizes = np.array([len(r) for r in self.representatives], dtype=np.int64)
+    
+    @classmethod
+    def from_model(cls, model, feature_bounds: List[Tuple[float, float]]) -> 'IntervalDomain':
+        """
+        Constrói o domínio a partir dos thresholds de um modelo de árvores
+        
+        Args:
+            model: XGBClassifier, CompiledTreeEnsemble ou ensemble do scikit-learn
+            feature_bounds: Limites (min, max) de cada feature
+        
+        Returns:
+            IntervalDomain: Domínio discretizado do modelo
+        """
+        decision = parse_tree_model(model)['decision']
+        return cls(split_thresholds(model, len(feature_bounds)), feature_bounds, decision)
+    
+    def _representatives(self, thresholds: np.ndarray, low: float, high: float) -> np.ndarray:
+        if self.decision == '<':
+            # Intervalos [low, t1), [t1, t2), ..., [tk, high]: o extremo esquerdo
+            # de cada intervalo o representa exatamente
+            cuts = thresholds[(thresholds > low) & (thresholds <= high)]
+            return np.concatenate([[low], cuts])
+        
+        # Intervalos [low, t1], (t1, t2], ..., (tk, high]: usa pontos médios,
+        # robustos ao arredondamento para float32 feito pelo scikit-learn
+        cuts = thresholds[(thresholds >= low) & (thresholds < high)]
+        if len(cuts) == 0:
+            return np.array([low], dtype=float)
+        middle = (cuts[:-1] + cuts[1:]) / 2
+        return np.concatenate([[low], middle, [high]])
+    
+    def n_combinations(self, fixed_mask: np.ndarray) -> int:
+        """
+        Número de combinações de intervalos das features livres
+        """
+        free_sizes = self.sizes[~np.asarray(fixed_mask, dtype=bool)]
+        return int(np.prod(free_sizes.astype(object))) if len(free_sizes) else 1
+    
+    def perturbations(self, instance: np.ndarray, fixed_mask: np.ndarray, n_samples: int,
+                      max_exact: int = 4096) -> Tuple[np.ndarray, bool]:
+        """
+        Gera as perturbações de um subconjunto de features fixas
+        
+        Args:
+            instance: Instância a ser explicada
+            fixed_mask: Máscara booleana (n_features,) das features fixas
+            n_samples: Número de amostras quando a enumeração não é exata
+            max_exact: Número máximo de combinações enumeradas exatamente
+        
+        Returns:
+            Tuple[np.ndarray, bool]: Perturbações e se elas cobrem todo o domínio
+        """
+        fixed_mask = np.asarray(fixed_mask, dtype=bool)
+        free = np.flatnonzero(~fixed_mask)
+        base = np.asarray(instance, dtype=float)
+        n_exact = self.n_combinations(fixed_mask)
+        
+        if n_exact <= max_exact:
+            samples = np.tile(base, (n_exact, 1))
+            if len(free) > 0:
+                grid = np.meshgrid(*[self.representatives[j] for j in free], indexing='ij')
+                samples[:, free] = np.stack([g.ravel() for g in grid], axis=1)
+            return samples, True
+        
+        # Amostragem estratificada: cada intervalo recebe a mesma fração de amostras
+        samples = np.tile(base, (n_samples, 1))
+        for j in free:
+            strata = np.random.permutation(np.resize(np.arange(self.sizes[j]), n_samples))
+            samples[:, j] = self.representatives[j][strata]
+        return samples, False
@@ -0,0 +1,283 @@
+import importlib
+import sys
+import warnings
+import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+class MethodSpec:
+    """
+    Método de atribuição registrado por nome
+    
+    Plugins são referenciados como 'módulo:função' e só são importados no
+    primeiro uso; os métodos embutidos importam as suas dependências (lime,
+    scikit-learn, z3, ...) dentro da função. Registrar ou listar métodos não
+    carrega nenhuma delas.
+    """
+    
+    def __init__(self, name: str, target, description: str = '', columns: bool = False):
+        """
+        Args:
+            name: Nome do método
+            target: 'módulo:função' ou a própria função, com assinatura
+                (model, X, targets, **kwargs) -> dict com 'attributions' e 'errors'
+            description: Descrição exibida por available()
+            columns: A função recebe em targets as colunas de predict_proba
+                das classes alvo em vez dos rótulos devolvidos por predict
+        """
+        self.name = name
+        self.target = target
+        self.description = description
+        self.columns = columns
+        self._function = target if callable(target) else None
+    
+    @property
+    def loaded(self) -> bool:
+        return self._function is not None
+    
+    def load(self) -> Callable:
+        """
+        Importa (uma única vez) e devolve a função do método
+        """
+        if self._function is None:
+            module_name, _, attribute = self.target.partition(':')
+            self._function = getattr(importlib.import_module(module_name), attribute)
+        return self._function
+    
+    def __repr__(self) -> str:
+        target = self.target if isinstance(self.target, str) else getattr(self.target, '__name__', self.target)
+        return f"MethodSpec({self.name!r}, {target!r})"
+
+
+_methods: Dict[str, MethodSpec] = {}
+
+
+def register(name: str, target, description: str = '', replace: bool = False,
+             columns: bool = False) -> MethodSpec:
+    """
+    Registra um método de atribuição (plugin)
+    
+    Args:
+        name: Nome do método
+        target: 'módulo:função' (importado no primeiro uso) ou a própria função
+        description: Descrição do método
+        replace: Substitui um método já registrado com o mesmo nome
+        columns: A função recebe colunas de predict_proba em vez de rótulos (ver MethodSpec)
+    
+    Returns:
+        MethodSpec: Especificação registrada
+    """
+    if name in _methods and not replace:
+        raise ValueError(f"Método já registrado: {name}")
+    _methods[name] = MethodSpec(name, target, description, columns)
+    return _methods[name]
+
+
+def discover(group: str = 'formal_feature_attribution.methods') -> List[str]:
+    """
+    Registra os métodos anunciados por pacotes instalados como entry points
+    do grupo group (nome = 'módulo:função'); nada é importado
+    
+    Returns:
+        List[str]: Nomes registrados
+    """
+    from importlib.metadata import entry_points
+    
+    # entry_points(group=...) só existe a partir do Python 3.10
+    if sys.version_info >= (3, 10):
+        group_entry_points = entry_points(group=group)
+    else:
+        group_entry_points = entry_points().get(group, [])
+    
+    names = []
+    for entry_point in group_entry_points:
+        if entry_point.name not in _methods:
+            register(entry_point.name, entry_point.value)
+            names.append(entry_point.name)
+    return names
+
+
+def available() -> Dict[str, str]:
+    """
+    Métodos registrados e suas descrições
+    """
+    return {name: spec.description for name, spec in _methods.items()}
+
+
+def get(name: str) -> Callable:
+    """
+    Função do método name, importada no primeiro uso
+    
+    Raises:
+        KeyError: Se o método não está registrado
+    """
+    if name not in _methods:
+        raise KeyError(f"Método desconhecido: {name} (disponíveis: {', '.join(_methods)})")
+    return _methods[name].load()
+
+
+def explain(name: str, model, X: np.ndarray, targets: Optional[Sequence[int]] = None, **kwargs) -> Dict:
+    """
+    Explica as instâncias X com o método name
+    
+    Args:
+        name: Nome de um método registrado (ver available)
+        model: Modelo treinado
+        X: Instâncias a explicar (n_instances, n_features)
+        targets: Rótulo da classe alvo de cada instância (padrão: a classe predita)
+        **kwargs: Opções do método
+    
+    Returns:
+        dict: 'attributions' (n_instances, n_features) e 'errors' {índice: mensagem}
+    """
+    method = get(name)
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    targets = np.asarray(model.predict(X) if targets is None else targets).reshape(-1)
+    if _methods[name].columns:
+        targets = class_columns(model, targets)
+    return method(model, X, targets, **kwargs)
+
+
+def class_columns(model, targets: np.ndarray) -> np.ndarray:
+    """
+    Colunas de predict_proba dos rótulos targets
+    
+    As colunas seguem model.classes_ (ordenado, como no scikit-learn e no
+    XGBoost); sem classes_, os rótulos já são as colunas. Rótulos que não
+    são classes do modelo recebem uma coluna inexistente (len(classes_)),
+    de modo que falham em vez de explicar outra classe.
+    
+    Args:
+        model: Modelo treinado
+        targets: Rótulos das classes alvo
+    
+    Returns:
+        np.ndarray: Índice da coluna de cada alvo
+    """
+    targets = np.asarray(targets).reshape(-1)
+    classes = getattr(model, 'classes_', None)
+    if classes is None:
+        return targets.astype(int)
+    classes = np.asarray(classes)
+    columns = np.searchsorted(classes, targets)
+    found = columns < len(classes)
+    found[found] = classes[columns[found]] == targets[found]
+    return np.where(found, columns, len(classes))
+
+
+def _bounds(X: np.ndarray, feature_bounds):
+    return feature_bounds if feature_bounds is not None else list(zip(X.min(axis=0), X.max(axis=0)))
+
+
+def _names(X: np.ndarray, feature_names):
+    return feature_names if feature_names is not None else [f'F{i}' for i in range(X.shape[1])]
+
+
+def _class_attributions(model, X: np.ndarray, columns: np.ndarray, feature_names, method: str,
+                        **kwargs) -> Dict:
+    """
+    Atribuições de ApproximationMethods.<method> (lime_class_attributions ou
+    shap_class_attributions) na coluna alvo de cada instância
+    
+    Colunas fora de predict_proba e falhas do lote (que ApproximationMethods
+    só emite como aviso, com atribuições uniformes) são informadas em 'errors',
+    com NaN nas instâncias correspondentes, como em parallel.explain_many.
+    """
+    from approximation_methods import ApproximationMethods
+    
+    classes = getattr(model, 'classes_', None)
+    n_columns = len(classes) if classes is not None else model.predict_proba(X[:1]).shape[1]
+    invalid = (columns < 0) | (columns >= n_columns)
+    errors = {int(i): f"IndexError: classe alvo {columns[i]} fora das {n_columns} colunas de predict_proba"
+              for i in np.flatnonzero(invalid)}
+    attributions = np.full(X.shape, np.nan)
+    indices = np.flatnonzero(~invalid)
+    if len(indices) == 0:
+        return {'attributions': attributions, 'errors': errors}
+    
+    targets = np.unique(columns[indices])
+    explainer = ApproximationMethods(model, _names(X, feature_names))
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        scores = getattr(explainer, method)(X, indices, targets, **kwargs)
+    failures = [str(w.message) for w in caught if str(w.message).startswith('Erro')]
+    for w in caught:
+        warnings.warn_explicit(w.message, w.category, w.filename, w.lineno)
+    
+    if failures:
+        errors.update({int(i): failures[0] for i in indices})
+    else:
+        attributions[indices] = scores[np.arange(len(indices)), np.searchsorted(targets, columns[indices])]
+    return {'attributions': attributions, 'errors': dict(sorted(errors.items()))}
+
+
+def explain_formal(model, X, targets, feature_bounds=None, n_jobs: Optional[int] = 1, oracle=None,
+                   domains=None, interval_domain=None, **kwargs) -> Dict:
+    """
+    FFA formal (FormalFFA.explain_many) nos rótulos das classes alvo,
+    comparados com predict; demais kwargs vão para compute_ffa
+    """
+    from formal_ffa import FormalFFA
+    
+    explainer = FormalFFA(model, _bounds(X, feature_bounds), oracle=oracle, domains=domains,
+                          interval_domain=interval_domain)
+    return explainer.explain_many(X, targets, n_jobs=n_jobs, **kwargs)
+
+
+def explain_heuristic(model, X, targets, feature_names=None, feature_bounds=None, n_jobs: Optional[int] = 1,
+                      **kwargs) -> Dict:
+    """
+    FFA heurístico (HeuristicFFA.explain_many) nas colunas de predict_proba
+    das classes alvo (feature_bounds: padrão [0, 1]); demais kwargs vão para compute
+    """
+    from formal_ffa import HeuristicFFA
+    
+    explainer = HeuristicFFA(model, _names(X, feature_names), X.shape[1], feature_bounds)
+    return explainer.explain_many(X, targets, n_jobs=n_jobs, **kwargs)
+
+
+def explain_lime(model, X, targets, feature_names=None, **kwargs) -> Dict:
+    """
+    LIME (explicador construído sobre X) com as vizinhanças de todas as
+    instâncias avaliadas em lote
+    
+    Args:
+        targets: Colunas de predict_proba das classes alvo
+        **kwargs: Ver ApproximationMethods.lime_class_attributions
+    """
+    return _class_attributions(model, X, targets, feature_names, 'lime_class_attributions', **kwargs)
+
+
+def explain_shap(model, X, targets, feature_names=None, **kwargs) -> Dict:
+    """
+    SHAP (TreeSHAP exato em modelos de árvores, senão amostragem)
+    
+    Args:
+        targets: Colunas de predict_proba das classes alvo
+        **kwargs: Ver ApproximationMethods.shap_class_attributions
+    """
+    return _class_attributions(model, X, targets, feature_names, 'shap_class_attributions', **kwargs)
+
+
+def explain_permutation(model, X, targets, y=None, feature_names=None, **kwargs) -> Dict:
+    """
+    Importância por permutação (global, repetida em cada instância)
+    
+    Args:
+        y: Rótulos de X (padrão: targets, isto é, a dependência do modelo
+            em relação às próprias predições)
+        **kwargs: Ver ApproximationMethods.permutation_importance
+    """
+    from approximation_methods import ApproximationMethods
+    
+    importance = ApproximationMethods(model, _names(X, feature_names)).permutation_importance(
+        X, targets if y is None else y, **kwargs)
+    return {'attributions': np.tile(importance, (len(X), 1)), 'errors': {}}
+
+
+# Métodos embutidos: as dependências de cada um são importadas dentro da função
+register('formal', explain_formal, 'FFA formal: frequência das features nas AXps')
+register('heuristic', explain_heuristic, 'FFA heurístico por perturbações locais', columns=True)
+register('lime', explain_lime, 'LIME tabular', columns=True)
+register('shap', explain_shap, 'Valores de Shapley (TreeSHAP ou amostragem)', columns=True)
+register('permutation', explain_permutation, 'Importância por permutação')
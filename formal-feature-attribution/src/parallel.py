@@ -0,0 +1,96 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Sequence
+
+# Estado de cada processo trabalhador: o explicador (com o modelo) é
+# recebido uma única vez, na inicialização, e não a cada tarefa
+_worker_explainer = None
+_worker_method = None
+_worker_kwargs = None
+
+
+def _limit_threads(model):
+    """
+    Evita sobrescrição de threads: cada trabalhador usa uma thread do modelo
+    """
+    try:
+        if hasattr(model, 'get_params') and 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=1)
+    except Exception:
+        pass
+
+
+def _init_worker(explainer, method_name: str, kwargs: Dict[str, Any]):
+    global _worker_explainer, _worker_method, _worker_kwargs
+    _worker_explainer = explainer
+    _worker_method = getattr(explainer, method_name)
+    _worker_kwargs = kwargs
+    # Processos criados por fork herdariam o mesmo estado aleatório
+    np.random.seed()
+    _limit_threads(getattr(explainer, 'model', None))
+
+
+def _run_task(method, kwargs: Dict[str, Any], task):
+    index, instance, target = task
+    try:
+        return index, method(instance, target, **kwargs), None
+    except Exception as e:
+        return index, None, f"{type(e).__name__}: {e}"
+
+
+def _explain_one(task):
+    return _run_task(_worker_method, _worker_kwargs, task)
+
+
+def explain_many(explainer, method_name: str, X: np.ndarray, targets: Sequence[int],
+                 n_jobs: Optional[int] = None, chunksize: int = 1,
+                 on_result: Optional[Callable[[int, Optional[np.ndarray], Optional[str]], None]] = None,
+                 **kwargs) -> Dict[str, Any]:
+    """
+    Explica várias instâncias distribuindo-as em um pool de processos
+    
+    Args:
+        explainer: Objeto explicador (ex.: FormalFFA, HeuristicFFA)
+        method_name: Nome do método do explicador com assinatura (instance, target)
+        X: Instâncias a explicar (n_instances, n_features)
+        targets: Classe alvo de cada instância
+        n_jobs: Número de processos (None = todos os núcleos; 1 = sem pool)
+        chunksize: Número de instâncias enviadas por tarefa
+        on_result: Função chamada com (índice, atribuição, erro) assim que cada
+            resultado fica disponível, na ordem de entrada
+        **kwargs: Argumentos repassados ao método do explicador
+    
+    Returns:
+        dict: 'attributions' (n_instances, n_features), na ordem de entrada e
+            com NaN nas instâncias que falharam, e 'errors' {índice: mensagem}
+    """
+    X = np.asarray(X)
+    targets = np.asarray(targets).reshape(-1)
+    if len(X) != len(targets):
+        raise ValueError("X e targets devem ter o mesmo número de instâncias")
+    
+    n_jobs = (os.cpu_count() or 1) if n_jobs is None else max(1, n_jobs)
+    tasks = [(i, X[i], targets[i]) for i in range(len(X))]
+    
+    attributions = np.full((len(X), X.shape[1] if X.ndim == 2 else 0), np.nan)
+    errors = {}
+    
+    def collect(outputs):
+        for index, attribution, error in outputs:
+            if error is None:
+                attributions[index] = attribution
+            else:
+                errors[index] = error
+            if on_result is not None:
+                on_result(index, attribution, error)
+    
+    if n_jobs == 1 or len(tasks) <= 1:
+        method = getattr(explainer, method_name)
+        collect(_run_task(method, kwargs, task) for task in tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks)), initializer=_init_worker,
+                                 initargs=(explainer, method_name, kwargs)) as executor:
+            collect(executor.map(_explain_one, tasks, chunksize=max(1, chunksize)))
+    
+    return {'attributions': attributions, 'errors': errors}
@@ -0,0 +1,101 @@
+import numpy as np
+from typing import Dict, Optional
+
+
+class PredictionPool:
+    """
+    Camada de predição compartilhada entre métodos de atribuição
+    
+    Envolve o modelo e pode ser usada no lugar dele (predict_proba/predict).
+    Cada lote é deduplicado, as linhas já vistas são servidas do cache e as
+    restantes são avaliadas em uma única chamada ao modelo. Compartilhada
+    entre LIME, SHAP e permutação, evita reavaliar as mesmas perturbações
+    (ex.: a própria instância, linhas híbridas repetidas ou amostras de
+    features binárias).
+    """
+    
+    def __init__(self, model, max_entries: Optional[int] = 1000000):
+        """
+        Args:
+            model: Modelo com predict_proba
+            max_entries: Número máximo de linhas em cache (None = sem limite);
+                ao atingir o limite o cache é esvaziado
+        """
+        self.model = model
+        self.max_entries = max_entries
+        self._index = {}
+        self._probs = None
+        self.n_calls = 0
+        self.rows_requested = 0
+        self.rows_scored = 0
+    
+    def __getattr__(self, name):
+        # Demais atributos (classes_, n_features_in_, ...) vêm do modelo
+        if name == 'model':
+            raise AttributeError(name)
+        return getattr(self.model, name)
+    
+    def _store(self, keys, probs: np.ndarray):
+        if self._probs is None:
+            self._probs = np.empty((max(1024, len(keys)), probs.shape[1]))
+        start = len(self._index)
+        if start + len(keys) > len(self._probs):
+            grown = np.empty((max(start + len(keys), 2 * len(self._probs)), probs.shape[1]))
+            grown[:start] = self._probs[:start]
+            self._probs = grown
+        self._probs[start:start + len(keys)] = probs
+        for offset, key in enumerate(keys):
+            self._index[key] = start + offset
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Probabilidades de cada linha, avaliando no modelo apenas linhas novas
+        """
+        X = np.ascontiguousarray(np.atleast_2d(X), dtype=float)
+        self.rows_requested += len(X)
+        if len(X) == 0:
+            return self.model.predict_proba(X)
+        
+        unique, inverse = np.unique(X, axis=0, return_inverse=True)
+        inverse = np.ravel(inverse)
+        if self.max_entries is not None and len(self._index) + len(unique) > self.max_entries:
+            self.clear()
+        keys = [row.tobytes() for row in unique]
+        positions = np.array([self._index.get(key, -1) for key in keys])
+        
+        missing = np.flatnonzero(positions < 0)
+        if len(missing) > 0:
+            probs = np.asarray(self.model.predict_proba(unique[missing]), dtype=float)
+            self.n_calls += 1
+            self.rows_scored += len(missing)
+            self._store([keys[i] for i in missing], probs)
+            positions = np.array([self._index[key] for key in keys])
+        
+        return self._probs[positions][inverse]
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        probs = self.predict_proba(X)
+        classes = getattr(self.model, 'classes_', np.arange(probs.shape[1]))
+        return np.asarray(classes)[np.argmax(probs, axis=1)]
+    
+    def prefetch(self, X: np.ndarray):
+        """
+        Avalia antecipadamente um lote de linhas em uma única chamada
+        """
+        self.predict_proba(X)
+    
+    def clear(self):
+        self._index.clear()
+        self._probs = None
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict: Chamadas ao modelo, linhas pedidas/avaliadas e fração economizada
+        """
+        return {
+            'model_calls': self.n_calls,
+            'rows_requested': self.rows_requested,
+            'rows_scored': self.rows_scored,
+            'saved_fraction': 1 - self.rows_scored / self.rows_requested if self.rows_requested else 0.0
+        }
\ No newline at end of file
@@ -0,0 +1,247 @@
+import functools
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class _Stage:
+    """
+    Intervalo de uma etapa, registrado no Profiler ao sair do bloco
+    """
+    
+    __slots__ = ('profiler', 'name', 'args', 'start')
+    
+    def __init__(self, profiler: 'Profiler', name: str, args: Dict):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, 'stage', self.start, time.perf_counter() - self.start, **self.args)
+        return False
+
+
+class _NullStage:
+    """
+    Bloco vazio usado quando não há Profiler ativo
+    """
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Profiler:
+    """
+    Coleta intervalos de etapas e chamadas ao modelo
+    
+    Cada evento guarda nome, categoria ('stage' ou 'model'), início,
+    duração, thread e argumentos. O resumo agrega tempo por etapa e
+    chamadas/linhas por método do modelo; os eventos podem ser exportados
+    em JSON ou no formato trace-event do Chrome (chrome://tracing, Perfetto).
+    """
+    
+    def __init__(self):
+        self.origin = time.perf_counter()
+        # list.append é atômico: threads (ex.: permutation_scores) registram sem trava
+        self.events = []
+    
+    def stage(self, name: str, **args) -> _Stage:
+        """
+        Bloco cronometrado: with profiler.stage('lime', n_instances=10): ...
+        """
+        return _Stage(self, name, args)
+    
+    def record(self, name: str, category: str, start: float, duration: float, **args):
+        """
+        Registra um evento (start em segundos de time.perf_counter)
+        """
+        self.events.append((name, category, start - self.origin, duration, threading.get_ident(), args))
+    
+    def summary(self) -> Dict:
+        """
+        Returns:
+            dict: 'stages' {nome: count, total, mean, max} (segundos),
+                'models' {modelo.método: calls, rows, time} e 'wall_time'
+        """
+        stages, models = {}, {}
+        for name, category, _, duration, _, args in list(self.events):
+            if category == 'model':
+                entry = models.setdefault(name, {'calls': 0, 'rows': 0, 'time': 0.0})
+                entry['calls'] += 1
+                entry['rows'] += args.get('rows', 0)
+                entry['time'] += duration
+            else:
+                entry = stages.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+                entry['count'] += 1
+                entry['total'] += duration
+                entry['max'] = max(entry['max'], duration)
+        for entry in stages.values():
+            entry['mean'] = entry['total'] / entry['count']
+        
+        return {
+            'stages': stages,
+            'models': models,
+            'wall_time': time.perf_counter() - self.origin
+        }
+    
+    def trace_events(self) -> List[Dict]:
+        """
+        Eventos completos ('ph': 'X') do formato trace-event, em microssegundos
+        """
+        pid = os.getpid()
+        return [{
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start * 1e6,
+            'dur': duration * 1e6,
+            'pid': pid,
+            'tid': tid,
+            'args': args
+        } for name, category, start, duration, tid, args in list(self.events)]
+    
+    def save_json(self, path: str):
+        """
+        Grava o resumo e os eventos em JSON
+        """
+        with open(path, 'w') as f:
+            json.dump({'summary': self.summary(), 'events': self.trace_events()}, f, indent=2, default=float)
+    
+    def save_trace(self, path: str):
+        """
+        Grava os eventos no formato trace-event do Chrome
+        """
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, f, default=float)
+    
+    def report(self, top: int = 10) -> str:
+        """
+        Tabela de texto com as etapas mais demoradas e as chamadas ao modelo
+        """
+        summary = self.summary()
+        lines = [f"{'Etapa':<32}{'n':>8}{'total (s)':>12}{'média (ms)':>12}"]
+        stages = sorted(summary['stages'].items(), key=lambda item: -item[1]['total'])
+        for name, entry in stages[:top]:
+            lines.append(f"{name:<32}{entry['count']:>8}{entry['total']:>12.3f}{1e3 * entry['mean']:>12.3f}")
+        for name, entry in sorted(summary['models'].items()):
+            lines.append(f"{name:<32}{entry['calls']:>8}{entry['time']:>12.3f}  {entry['rows']} linhas")
+        return "\n".join(lines)
+
+
+# Profiler ativo no processo (None = instrumentação desligada)
+_active = None
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """
+    Ativa a instrumentação e devolve o Profiler que recebe os eventos
+    """
+    global _active
+    _active = profiler if profiler is not None else Profiler()
+    return _active
+
+
+def disable() -> Optional[Profiler]:
+    """
+    Desativa a instrumentação e devolve o Profiler que estava ativo
+    """
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def active() -> Optional[Profiler]:
+    return _active
+
+
+def stage(name: str, **args):
+    """
+    Bloco cronometrado no Profiler ativo; sem Profiler, um bloco vazio
+    """
+    profiler = _active
+    if profiler is None:
+        return _NULL_STAGE
+    return _Stage(profiler, name, args)
+
+
+def timed(name: str):
+    """
+    Decorador que cronometra cada chamada como a etapa name
+    
+    Sem Profiler ativo, o custo é uma leitura de variável global por chamada.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, 'stage', start, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class ProfiledModel:
+    """
+    Envolve um modelo e registra cada chamada a predict/predict_proba
+    (linhas e duração) no Profiler ativo
+    
+    Pode ser usado no lugar do modelo; os demais atributos vêm do modelo.
+    Os totais de chamadas e linhas são mantidos mesmo sem Profiler ativo.
+    """
+    
+    def __init__(self, model, name: str = 'model'):
+        self.model = model
+        self.name = name
+        self.calls = 0
+        self.rows = 0
+    
+    def __getattr__(self, name):
+        if name == 'model':
+            raise AttributeError(name)
+        return getattr(self.model, name)
+    
+    def _call(self, method: str, X):
+        self.calls += 1
+        self.rows += len(X)
+        profiler = _active
+        if profiler is None:
+            return getattr(self.model, method)(X)
+        start = time.perf_counter()
+        try:
+            return getattr(self.model, method)(X)
+        finally:
+            profiler.record(f'{self.name}.{method}', 'model', start, time.perf_counter() - start, rows=len(X))
+    
+    def predict(self, X):
+        return self._call('predict', X)
+    
+    def predict_proba(self, X):
+        return self._call('predict_proba', X)
+
+
+def profiled(model, name: str = 'model'):
+    """
+    ProfiledModel(model) se a instrumentação está ativa; senão o próprio modelo
+    """
+    if _active is None:
+        return model
+    return ProfiledModel(model, name)
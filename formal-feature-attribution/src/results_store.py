@@ -0,0 +1,117 @@
+import json
+import os
+import numpy as np
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+
+class ResultsStore:
+    """
+    Armazenamento append-only de resultados em JSON Lines
+    
+    Cada unidade (dataset, instância, método) é gravada em uma linha assim que
+    calculada. Ao reiniciar, as unidades já presentes no arquivo são puladas;
+    uma última linha incompleta (interrupção durante a escrita) é ignorada.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Caminho do arquivo .jsonl
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._terminate_partial_line()
+        self._completed = {self._key(r['dataset'], r['instance'], r['method'])
+                           for r in self.iter_records()}
+    
+    def _terminate_partial_line(self):
+        # Uma escrita interrompida deixa a última linha sem '\n'; sem isso, o
+        # próximo registro seria concatenado a ela e perdido
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+    
+    @staticmethod
+    def _key(dataset: str, instance: Optional[int], method: str) -> Tuple:
+        return dataset, None if instance is None else int(instance), method
+    
+    def has(self, dataset: str, instance: Optional[int], method: str) -> bool:
+        """
+        Returns:
+            bool: True se a unidade já foi calculada
+        """
+        return self._key(dataset, instance, method) in self._completed
+    
+    def completed(self) -> Set[Tuple]:
+        """
+        Returns:
+            Set[Tuple]: Chaves (dataset, instância, método) já gravadas
+        """
+        return set(self._completed)
+    
+    def append(self, dataset: str, instance: Optional[int], method: str,
+               attribution: Optional[np.ndarray] = None, **extra: Any):
+        """
+        Grava uma unidade de resultado e força a escrita em disco
+        
+        Args:
+            dataset: Nome do dataset
+            instance: Índice da instância (None para resultados do dataset)
+            method: Nome do método
+            attribution: Vetor de atribuição
+            **extra: Campos adicionais serializáveis em JSON
+        """
+        record = {
+            'dataset': dataset,
+            'instance': None if instance is None else int(instance),
+            'method': method,
+            'attribution': None if attribution is None else np.asarray(attribution, dtype=float).tolist(),
+        }
+        record.update(extra)
+        
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._completed.add(self._key(dataset, instance, method))
+    
+    def iter_records(self, dataset: Optional[str] = None,
+                     method: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre os registros gravados sem carregá-los todos em memória
+        
+        Args:
+            dataset: Filtra por dataset (opcional)
+            method: Filtra por método (opcional)
+        
+        Yields:
+            Dict: Registro com 'dataset', 'instance', 'method', 'attribution' e extras
+        """
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if dataset is not None and record['dataset'] != dataset:
+                    continue
+                if method is not None and record['method'] != method:
+                    continue
+                if record.get('attribution') is not None:
+                    record['attribution'] = np.asarray(record['attribution'])
+                yield record
+    
+    def attributions(self, dataset: str, method: str) -> Dict[Optional[int], np.ndarray]:
+        """
+        Returns:
+            Dict: Atribuições de um método em um dataset, por instância
+        """
+        return {r['instance']: r['attribution'] for r in self.iter_records(dataset, method)}
@@ -0,0 +1,141 @@
+import numpy as np
+from typing import Dict, Optional
+
+
+class SamplingShapley:
+    """
+    Estimador de valores de Shapley por amostragem de permutações
+    
+    Para cada permutação sorteada (pareada com uma linha do background), as
+    features da instância são inseridas uma a uma sobre a linha de
+    background; a variação da probabilidade a cada inserção é a contribuição
+    marginal da feature. Todas as coalizões de um bloco de permutações são
+    montadas em uma matriz e avaliadas em chamadas de predict_proba em lote.
+    Com amostragem antitética, cada permutação é acompanhada da inversa,
+    o que reduz a variância do estimador.
+    """
+    
+    def __init__(self, model, background: np.ndarray, chunk_size: int = 10000):
+        """
+        Args:
+            model: Modelo com predict_proba
+            background: Linhas (n_background, n_features) que representam a
+                ausência de uma feature
+            chunk_size: Número máximo de linhas por chamada a predict_proba
+        """
+        self.model = model
+        self.background = np.atleast_2d(np.asarray(background, dtype=float))
+        self.n_features = self.background.shape[1]
+        self.chunk_size = max(1, chunk_size)
+    
+    def _permutations(self, n_permutations: int, antithetic: bool) -> np.ndarray:
+        if not antithetic:
+            return np.argsort(np.random.random((n_permutations, self.n_features)), axis=1)
+        n_pairs = (n_permutations + 1) // 2
+        forward = np.argsort(np.random.random((n_pairs, self.n_features)), axis=1)
+        # Linhas intercaladas: permutação 2p e sua inversa 2p + 1
+        return np.stack([forward, forward[:, ::-1]], axis=1).reshape(2 * n_pairs, self.n_features)
+    
+    def _contributions(self, instance: np.ndarray, classes: np.ndarray, permutations: np.ndarray,
+                       backgrounds: np.ndarray) -> np.ndarray:
+        """
+        Contribuições marginais (n_permutations, n_classes, n_features) de
+        cada permutação, para todas as classes a partir das mesmas coalizões
+        """
+        n_perm, n = permutations.shape
+        contributions = np.empty((n_perm, len(classes), n))
+        steps = np.arange(n + 1)
+        block = max(1, self.chunk_size // (n + 1))
+        
+        for start in range(0, n_perm, block):
+            perms = permutations[start:start + block]
+            m = len(perms)
+            # Posição de cada feature na permutação; a coalizão k contém as
+            # features com posição < k
+            rank = np.argsort(perms, axis=1)
+            in_coalition = rank[:, None, :] < steps[None, :, None]
+            rows = np.where(in_coalition, instance[None, None, :],
+                            backgrounds[start:start + m, None, :])
+            probs = self.model.predict_proba(rows.reshape(m * (n + 1), n))[:, classes]
+            deltas = np.diff(probs.reshape(m, n + 1, len(classes)), axis=1)
+            contributions[start + np.arange(m)[:, None], :, perms] = deltas
+        
+        return contributions
+    
+    def explain(self, instance: np.ndarray, target: int = 1, n_permutations: int = 100,
+                antithetic: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Estima os valores de Shapley de uma instância
+        
+        Args:
+            instance: Instância a ser explicada
+            target: Classe cuja probabilidade é explicada
+            n_permutations: Número de permutações (arredondado para par com
+                amostragem antitética); custo: n_permutations * (n_features + 1) linhas
+            antithetic: Usa pares de permutações invertidas
+        
+        Returns:
+            dict: 'values' (estimativas), 'variance' e 'std_error' (do estimador,
+                por feature), 'base_value' (predição média no background) e
+                'n_evaluations' (linhas avaliadas)
+        """
+        result = self.explain_classes(instance, [target], n_permutations, antithetic)
+        for key in ('values', 'variance', 'std_error', 'base_value'):
+            result[key] = result[key][0]
+        result['base_value'] = float(result['base_value'])
+        del result['classes']
+        return result
+    
+    def explain_classes(self, instance: np.ndarray, classes=None, n_permutations: int = 100,
+                        antithetic: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Estima os valores de Shapley de várias classes com as mesmas
+        permutações e uma única avaliação das coalizões
+        
+        Args:
+            instance: Instância a ser explicada
+            classes: Índices das classes (colunas de predict_proba; padrão: todas)
+            n_permutations: Número de permutações (ver explain)
+            antithetic: Usa pares de permutações invertidas
+        
+        Returns:
+            dict: Como explain, com 'values', 'variance' e 'std_error' em
+                (n_classes, n_features), 'base_value' (n_classes,) e 'classes'
+        """
+        instance = np.asarray(instance, dtype=float)
+        base_probs = self.model.predict_proba(self.background)
+        classes = np.arange(base_probs.shape[1]) if classes is None else np.asarray(classes, dtype=int).reshape(-1)
+        permutations = self._permutations(max(1, n_permutations), antithetic)
+        # Linhas de background independentes também no par antitético: a mesma
+        # linha nas duas permutações as correlaciona positivamente
+        backgrounds = self.background[np.random.randint(len(self.background), size=len(permutations))]
+        
+        contributions = self._contributions(instance, classes, permutations, backgrounds)
+        
+        # Com pares antitéticos, as amostras independentes são as médias dos pares
+        if antithetic:
+            contributions = contributions.reshape(-1, 2, len(classes), self.n_features).mean(axis=1)
+        n_samples = len(contributions)
+        if n_samples > 1:
+            variance = contributions.var(axis=0, ddof=1) / n_samples
+        else:
+            variance = np.full((len(classes), self.n_features), np.nan)
+        
+        return {
+            'values': contributions.mean(axis=0),
+            'variance': variance,
+            'std_error': np.sqrt(variance),
+            'base_value': base_probs[:, classes].mean(axis=0),
+            'n_evaluations': len(permutations) * (self.n_features + 1),
+            'classes': classes
+        }
+
+
+def sample_background(X: np.ndarray, max_rows: Optional[int] = 100, seed: int = 0) -> np.ndarray:
+    """
+    Subamostra de X usada como background (todas as linhas se couberem)
+    """
+    X = np.asarray(X, dtype=float)
+    if max_rows is None or len(X) <= max_rows:
+        return X
+    return X[np.random.RandomState(seed).choice(len(X), size=max_rows, replace=False)]
\ No newline at end of file
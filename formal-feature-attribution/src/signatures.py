@@ -0,0 +1,84 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+from tree_structure import parse_tree_model, split_thresholds
+
+
+def leaf_signatures(model, X: np.ndarray) -> np.ndarray:
+    """
+    Folha atingida em cada árvore (via apply() do XGBoost/scikit-learn)
+    
+    Instâncias com a mesma assinatura recebem a mesma predição.
+    
+    Args:
+        model: Modelo de árvores com apply (XGBClassifier, CompiledTreeEnsemble
+            ou ensemble do scikit-learn)
+        X: Instâncias (n_instances, n_features)
+    
+    Returns:
+        np.ndarray: Índices de folha (n_instances, n_trees)
+    """
+    leaves = np.asarray(model.apply(np.atleast_2d(X)))
+    return leaves.reshape(len(leaves), -1).astype(np.int64)
+
+
+def region_signatures(model, X: np.ndarray, thresholds: Optional[List[np.ndarray]] = None,
+                      decision: Optional[str] = None) -> np.ndarray:
+    """
+    Intervalo entre thresholds do modelo em que cada feature cai
+    
+    Refina a assinatura de folhas: duas instâncias na mesma região atingem
+    as mesmas folhas e, para qualquer subconjunto de features fixas, os
+    pontos alcançáveis são classificados da mesma forma. Os veredictos de
+    AXp e as explicações são portanto idênticos dentro de uma região, o que
+    não vale em geral para a assinatura de folhas (thresholds em ramos não
+    visitados podem separá-las quando outras features ficam livres).
+    
+    Args:
+        model: Modelo de árvores suportado por parse_tree_model
+        X: Instâncias (n_instances, n_features)
+        thresholds: Thresholds por feature (split_thresholds), se já calculados
+        decision: Regra de decisão ('<' ou '<='), se já conhecida
+    
+    Returns:
+        np.ndarray: Índice do intervalo de cada feature (n_instances,
+            n_features); -1 para valores ausentes
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    if decision is None:
+        decision = parse_tree_model(model)['decision']
+    if thresholds is None:
+        thresholds = split_thresholds(model, X.shape[1])
+    # As árvores comparam em float32: x < t (XGBoost) ou x <= t (scikit-learn)
+    values = X.astype(np.float32).astype(float)
+    side = 'right' if decision == '<' else 'left'
+    
+    signatures = np.empty(X.shape, dtype=np.int32)
+    for j, cuts in enumerate(thresholds):
+        signatures[:, j] = np.searchsorted(np.asarray(cuts, dtype=float), values[:, j], side=side)
+    signatures[np.isnan(values)] = -1
+    return signatures
+
+
+def group_instances(signatures: np.ndarray, targets: Optional[np.ndarray] = None
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Agrupa instâncias com a mesma assinatura (e a mesma classe alvo)
+    
+    Args:
+        signatures: Assinaturas (n_instances, ...)
+        targets: Classe alvo de cada instância (opcional)
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Índice do representante (primeira
+            ocorrência) de cada grupo e grupo de cada instância
+    """
+    keys = np.asarray(signatures).reshape(len(signatures), -1)
+    if targets is not None:
+        keys = np.column_stack([keys, np.asarray(targets).reshape(-1)])
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    # Grupos na ordem da primeira ocorrência
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[np.ravel(inverse)]
@@ -0,0 +1,147 @@
+import numpy as np
+from fractions import Fraction
+from typing import List, Optional, Set, Tuple
+from z3 import And, Bool, Implies, Or, Q, Real, Solver, Sum, sat
+
+from profiling import timed
+from tree_structure import leaf_paths, parse_xgboost
+
+
+def _exact(value: float):
+    """
+    Converte um valor para racional exato na precisão float32 usada pelo XGBoost
+    """
+    fraction = Fraction(float(np.float32(value)))
+    return Q(fraction.numerator, fraction.denominator)
+
+
+class SMTOracle:
+    """
+    Oráculo exato de AXp para modelos XGBoost via SMT (z3)
+    
+    O ensemble é codificado uma única vez por modelo. Cada consulta "fixar S
+    garante a classe t?" é respondida com uma única chamada incremental ao
+    solver, usando seletores como assumptions.
+    """
+    
+    def __init__(self, model, feature_bounds: List[Tuple[float, float]]):
+        self.model = model
+        self.feature_bounds = feature_bounds
+        self.n_features = len(feature_bounds)
+        self.n_queries = 0
+        self._solver = None
+        self._instance_key = None
+    
+    def __getstate__(self):
+        # Objetos do z3 não são serializáveis; a codificação é refeita sob demanda
+        state = self.__dict__.copy()
+        state['_solver'] = None
+        state['_instance_key'] = None
+        return state
+    
+    def _encode(self):
+        """
+        Codifica o ensemble como fórmula SMT
+        """
+        structure = parse_xgboost(self.model)
+        self.n_groups = structure['n_groups']
+        self.n_classes = 2 if self.n_groups == 1 else self.n_groups
+        
+        solver = Solver()
+        self._x = [Real(f'x_{j}') for j in range(self.n_features)]
+        for x, (low, high) in zip(self._x, self.feature_bounds):
+            solver.add(x >= _exact(low), x <= _exact(high))
+        
+        group_terms = [[] for _ in range(self.n_groups)]
+        for t, (tree, group) in enumerate(zip(structure['trees'], structure['tree_group'])):
+            leaf = Real(f'tree_{t}')
+            for conditions, value in leaf_paths(tree):
+                literals = [self._x[f] < _exact(thr) if left else self._x[f] >= _exact(thr)
+                            for f, thr, left in conditions]
+                solver.add(Implies(And(literals) if literals else True, leaf == _exact(value)))
+            group_terms[group].append(leaf)
+        
+        margins = [Sum(terms) + _exact(base) if terms else _exact(base)
+                   for terms, base in zip(group_terms, structure['base_margin'])]
+        
+        # Seletor por classe alvo: ativa a negação da predição
+        self._target_selectors = [Bool(f'target_{k}') for k in range(self.n_classes)]
+        for k, selector in enumerate(self._target_selectors):
+            solver.add(Implies(selector, self._not_class(margins, k)))
+        
+        self._feature_selectors = [Bool(f'fix_{j}') for j in range(self.n_features)]
+        self._solver = solver
+    
+    def _not_class(self, margins, target: int):
+        """
+        Condição sob a qual o modelo NÃO prevê a classe alvo
+        """
+        if self.n_groups == 1:
+            return margins[0] <= 0 if target == 1 else margins[0] > 0
+        
+        # argmax retorna o primeiro máximo em caso de empate
+        alternatives = [margins[k] >= margins[target] if k < target else margins[k] > margins[target]
+                        for k in range(self.n_groups) if k != target]
+        return Or(alternatives)
+    
+    def _bind_instance(self, instance: np.ndarray):
+        """
+        Associa os seletores de features aos valores da instância (push/pop)
+        """
+        if self._solver is None:
+            self._encode()
+        
+        key = np.asarray(instance, dtype=np.float32).tobytes()
+        if key == self._instance_key:
+            return
+        
+        if self._instance_key is not None:
+            self._solver.pop()
+        self._solver.push()
+        for selector, x, value in zip(self._feature_selectors, self._x, instance):
+            self._solver.add(Implies(selector, x == _exact(value)))
+        self._instance_key = key
+    
+    def find_counterexample(self, instance: np.ndarray, feature_subset: Set[int],
+                            target: int) -> Optional[np.ndarray]:
+        """
+        Procura um ponto que respeita as features fixas e muda a predição
+        
+        Args:
+            instance: Instância a ser explicada
+            feature_subset: Conjunto de índices de features fixas
+            target: Classe alvo
+        
+        Returns:
+            np.ndarray ou None: Contraexemplo, ou None se o subconjunto é uma AXp
+        """
+        self._bind_instance(instance)
+        if not 0 <= target < self.n_classes:
+            raise ValueError(f"Classe alvo inválida: {target}")
+        
+        assumptions = [self._feature_selectors[j] for j in feature_subset]
+        assumptions.append(self._target_selectors[target])
+        self.n_queries += 1
+        
+        if self._solver.check(*assumptions) != sat:
+            return None
+        
+        model = self._solver.model()
+        counterexample = np.asarray(instance, dtype=float).copy()
+        for j, x in enumerate(self._x):
+            value = model.eval(x, model_completion=True)
+            counterexample[j] = float(Fraction(value.as_fraction()))
+        return counterexample
+    
+    @timed('smt.is_axp')
+    def is_axp(self, instance: np.ndarray, feature_subset: Set[int], target: int) -> bool:
+        """
+        Args:
+            instance: Instância a ser explicada
+            feature_subset: Conjunto de índices de features fixas
+            target: Classe alvo
+        
+        Returns:
+            bool: True se fixar o subconjunto garante a classe alvo
+        """
+        return self.find_counterexample(instance, feature_subset, target) is None
@@ -0,0 +1,152 @@
+import numpy as np
+from typing import Iterable, Iterator, Set
+
+# Número de bits em 1 de cada byte, para popcount vetorizado
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """
+    Número de bits em 1 de cada linha de um array (n, n_words) de uint64
+    """
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    as_bytes = words.view(np.uint8).reshape(len(words), -1)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+class PackedSubsetStore:
+    """
+    Conjunto de subconjuntos de features como bitmasks uint64 compactados
+    
+    Cada subconjunto ocupa ceil(n_features / 64) palavras de 64 bits (bit j =
+    feature j) em um array que cresce por duplicação. As contagens por
+    feature são mantidas a cada inserção, de modo que os scores de FFA saem
+    em O(n_features), e os testes de subconjunto/superconjunto são
+    operações bit a bit sobre todas as linhas de uma vez.
+    """
+    
+    def __init__(self, n_features: int, capacity: int = 64):
+        """
+        Args:
+            n_features: Número de features
+            capacity: Número inicial de subconjuntos alocados
+        """
+        self.n_features = n_features
+        self.n_words = max(1, (n_features + 63) // 64)
+        self._words = np.zeros((max(1, capacity), self.n_words), dtype=np.uint64)
+        self._size = 0
+        self._counts = np.zeros(n_features, dtype=np.int64)
+    
+    def pack(self, bool_masks: np.ndarray) -> np.ndarray:
+        """
+        Converte máscaras booleanas (n, n_features) em palavras (n, n_words)
+        """
+        bool_masks = np.atleast_2d(np.asarray(bool_masks, dtype=bool))
+        padded = np.zeros((len(bool_masks), self.n_words * 64), dtype=bool)
+        padded[:, :self.n_features] = bool_masks
+        packed = np.packbits(padded, axis=1, bitorder='little')
+        return packed.view('<u8').astype(np.uint64, copy=False)
+    
+    def unpack(self, words: np.ndarray) -> np.ndarray:
+        """
+        Converte palavras (n, n_words) em máscaras booleanas (n, n_features)
+        """
+        as_bytes = np.ascontiguousarray(words, dtype='<u8').view(np.uint8).reshape(len(words), -1)
+        return np.unpackbits(as_bytes, axis=1, bitorder='little')[:, :self.n_features].astype(bool)
+    
+    def _reserve(self, n_extra: int):
+        needed = self._size + n_extra
+        if needed > len(self._words):
+            grown = np.zeros((max(needed, 2 * len(self._words)), self.n_words), dtype=np.uint64)
+            grown[:self._size] = self._words[:self._size]
+            self._words = grown
+    
+    def extend(self, bool_masks: np.ndarray):
+        """
+        Adiciona vários subconjuntos dados como máscaras booleanas (n, n_features)
+        """
+        bool_masks = np.atleast_2d(np.asarray(bool_masks, dtype=bool))
+        if bool_masks.size == 0:
+            return
+        self._reserve(len(bool_masks))
+        self._words[self._size:self._size + len(bool_masks)] = self.pack(bool_masks)
+        self._size += len(bool_masks)
+        self._counts += bool_masks.sum(axis=0)
+    
+    def add(self, subset: Iterable[int]):
+        """
+        Adiciona um subconjunto de índices de features
+        """
+        mask = np.zeros(self.n_features, dtype=bool)
+        mask[list(subset)] = True
+        self.extend(mask[None, :])
+    
+    @property
+    def words(self) -> np.ndarray:
+        """
+        Palavras (len, n_words) dos subconjuntos armazenados (sem cópia)
+        """
+        return self._words[:self._size]
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self) -> Iterator[Set[int]]:
+        for start in range(0, self._size, 4096):
+            for mask in self.unpack(self.words[start:start + 4096]):
+                yield set(np.flatnonzero(mask).tolist())
+    
+    def to_bool(self) -> np.ndarray:
+        return self.unpack(self.words)
+    
+    def sizes(self) -> np.ndarray:
+        """
+        Tamanho (popcount) de cada subconjunto armazenado
+        """
+        return popcount(self.words)
+    
+    def feature_counts(self) -> np.ndarray:
+        """
+        Número de subconjuntos que contêm cada feature
+        """
+        return self._counts.copy()
+    
+    def scores(self) -> np.ndarray:
+        """
+        Fração dos subconjuntos que contêm cada feature (scores de FFA)
+        """
+        return self._counts / self._size if self._size > 0 else np.zeros(self.n_features)
+    
+    def contains_subset_of(self, bool_mask: np.ndarray) -> np.ndarray:
+        """
+        Para cada subconjunto armazenado, se ele está contido em bool_mask
+        """
+        query = self.pack(bool_mask)[0]
+        return np.all(self.words & ~query == 0, axis=1)
+    
+    def contains_superset_of(self, bool_mask: np.ndarray) -> np.ndarray:
+        """
+        Para cada subconjunto armazenado, se ele contém bool_mask
+        """
+        query = self.pack(bool_mask)[0]
+        return np.all(query & ~self.words == 0, axis=1)
+    
+    def save(self, path: str):
+        """
+        Grava os subconjuntos em um arquivo .npz
+        """
+        np.savez(path, words=self.words, n_features=self.n_features)
+    
+    @classmethod
+    def load(cls, path: str) -> 'PackedSubsetStore':
+        """
+        Carrega subconjuntos gravados com save, recalculando as contagens
+        """
+        with np.load(path) as data:
+            words = data['words']
+            store = cls(int(data['n_features']), capacity=len(words))
+        store._words[:len(words)] = words
+        store._size = len(words)
+        for start in range(0, len(words), 4096):
+            store._counts += store.unpack(words[start:start + 4096]).sum(axis=0)
+        return store
\ No newline at end of file
@@ -0,0 +1,266 @@
+import json
+import os
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+# Raiz padrão: <repositório>/datasets/tabular/{complete,train,test}/<dataset>/*.csv
+DEFAULT_ROOT = os.path.join(os.path.dirname(__file__), '..', '..', 'datasets', 'tabular')
+SPLITS = ('complete', 'train', 'test')
+CACHE_VERSION = 2
+
+
+def discover_datasets(root: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Localiza os datasets tabulares disponíveis
+    
+    Em cada diretório <split>/<dataset> é usado o CSV de nome mais curto
+    (os demais são cópias com sufixos como '_data').
+    
+    Args:
+        root: Diretório raiz dos datasets (padrão: datasets/tabular)
+    
+    Returns:
+        Dict: Caminho do CSV de cada divisão, por nome de dataset
+    """
+    root = os.path.abspath(root or DEFAULT_ROOT)
+    datasets = {}
+    
+    for split in SPLITS:
+        split_dir = os.path.join(root, split)
+        if not os.path.isdir(split_dir):
+            continue
+        for name in sorted(os.listdir(split_dir)):
+            dataset_dir = os.path.join(split_dir, name)
+            if not os.path.isdir(dataset_dir):
+                continue
+            csvs = sorted((f for f in os.listdir(dataset_dir) if f.endswith('.csv')),
+                          key=lambda f: (len(f), f))
+            if csvs:
+                datasets.setdefault(name, {})[split] = os.path.join(dataset_dir, csvs[0])
+    
+    return datasets
+
+
+def _categorical_columns(root: str, name: str) -> List[int]:
+    """
+    Lê os índices das colunas categóricas do arquivo .catcol do dataset
+    """
+    for split in SPLITS:
+        dataset_dir = os.path.join(root, split, name)
+        if not os.path.isdir(dataset_dir):
+            continue
+        for f in sorted(os.listdir(dataset_dir)):
+            if f.endswith('.catcol'):
+                with open(os.path.join(dataset_dir, f)) as catcol:
+                    return sorted(int(line) for line in catcol if line.strip())
+    return []
+
+
+def _compact_dtype(values: np.ndarray) -> np.dtype:
+    """
+    Menor tipo inteiro que representa a coluna, ou float64 se não for inteira
+    """
+    if len(values) == 0 or not np.all(np.isfinite(values)) or not np.all(values == np.round(values)):
+        return np.dtype(np.float64)
+    return np.result_type(np.min_scalar_type(int(values.min())), np.min_scalar_type(int(values.max())))
+
+
+def _sources(csv_paths: Dict[str, str]) -> Dict[str, List[float]]:
+    """
+    Tamanho e data de modificação dos CSVs de todas as divisões
+    """
+    sources = {}
+    for split, path in sorted(csv_paths.items()):
+        stat = os.stat(path)
+        sources[split] = [stat.st_size, stat.st_mtime]
+    return sources
+
+
+def _category_map(csv_paths: Dict[str, str], categorical: List[int]) -> Dict[int, list]:
+    """
+    Categorias ordenadas de cada coluna categórica na união das divisões
+    
+    Um único mapa por dataset garante que a mesma categoria receba o mesmo
+    código em treino e teste, mesmo quando uma divisão não contém todos os
+    valores.
+    
+    Args:
+        csv_paths: Caminho do CSV de cada divisão
+        categorical: Índices das colunas categóricas
+    
+    Returns:
+        Dict[int, list]: Categorias (códigos 0..k-1 na ordem da lista) por coluna
+    """
+    import pandas as pd
+    
+    if not categorical:
+        return {}
+    frames = [pd.read_csv(path, usecols=categorical) for _, path in sorted(csv_paths.items())]
+    categories = {}
+    for j in categorical:
+        union = pd.concat([frame.iloc[:, categorical.index(j)] for frame in frames], ignore_index=True)
+        categories[j] = list(pd.factorize(union, sort=True)[1])
+    return categories
+
+
+def _build_cache(csv_path: str, cache_dir: str, categorical: List[int],
+                 csv_paths: Dict[str, str]) -> Dict:
+    """
+    Converte o CSV em um arquivo .npy por coluna e grava os metadados
+    
+    Args:
+        csv_path: CSV da divisão convertida
+        cache_dir: Diretório do cache da divisão
+        categorical: Índices das colunas categóricas
+        csv_paths: CSVs de todas as divisões, de onde vem o mapa de categorias
+    """
+    import pandas as pd
+    
+    frame = pd.read_csv(csv_path)
+    category_map = _category_map(csv_paths, categorical)
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    columns = []
+    for j, column in enumerate(frame.columns):
+        series = frame[column]
+        info = {'name': str(column), 'categorical': j in categorical}
+        
+        if info['categorical']:
+            # Categóricas são gravadas como códigos 0..k-1 do mapa comum às
+            # divisões; os valores originais ficam nos metadados
+            categories = category_map[j]
+            values = pd.Categorical(series, categories=categories).codes
+            info['categories'] = [c.item() if hasattr(c, 'item') else c for c in categories]
+        else:
+            values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+        
+        values = np.asarray(values)
+        values = values.astype(_compact_dtype(values.astype(np.float64)))
+        info['dtype'] = values.dtype.str
+        info['min'] = float(np.nanmin(values)) if len(values) else 0.0
+        info['max'] = float(np.nanmax(values)) if len(values) else 0.0
+        np.save(os.path.join(cache_dir, f'col_{j}.npy'), values)
+        columns.append(info)
+    
+    stat = os.stat(csv_path)
+    meta = {
+        'version': CACHE_VERSION,
+        'source': os.path.abspath(csv_path),
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime,
+        'categorical': categorical,
+        'category_sources': _sources(csv_paths),
+        'n_rows': len(frame),
+        'columns': columns
+    }
+    
+    # Metadados por último: um cache sem meta.json é considerado inexistente
+    tmp_path = os.path.join(cache_dir, 'meta.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(cache_dir, 'meta.json'))
+    return meta
+
+
+def _load_meta(csv_path: str, cache_dir: str, categorical: List[int],
+               csv_paths: Dict[str, str]) -> Optional[Dict]:
+    """
+    Metadados do cache, ou None se ausente ou desatualizado em relação ao CSV
+    ou a qualquer divisão usada no mapa de categorias
+    """
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    stat = os.stat(csv_path)
+    if (meta.get('version') != CACHE_VERSION or meta.get('source_size') != stat.st_size
+            or meta.get('source_mtime') != stat.st_mtime or meta.get('categorical') != categorical
+            or (categorical and meta.get('category_sources') != _sources(csv_paths))):
+        return None
+    return meta
+
+
+class TabularDataset:
+    """
+    Dataset tabular armazenado em colunas .npy mapeadas em memória
+    
+    A última coluna do CSV é o alvo; as demais são features. Colunas
+    categóricas (.catcol) são representadas pelos códigos das categorias.
+    """
+    
+    def __init__(self, name: str, split: str, cache_dir: str, meta: Dict):
+        self.name = name
+        self.split = split
+        self.cache_dir = cache_dir
+        self.meta = meta
+        self.n_rows = meta['n_rows']
+        self.columns = [np.load(os.path.join(cache_dir, f'col_{j}.npy'), mmap_mode='r')
+                        for j in range(len(meta['columns']))]
+        
+        names = [c['name'] for c in meta['columns']]
+        self.feature_names = names[:-1]
+        self.target_name = names[-1]
+        self.categorical_features = [j for j, c in enumerate(meta['columns'][:-1]) if c['categorical']]
+        self.categories = {j: meta['columns'][j]['categories'] for j in self.categorical_features}
+    
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_names)
+    
+    @property
+    def X(self) -> np.ndarray:
+        """
+        Matriz (n_rows, n_features) de features em float64
+        """
+        X = np.empty((self.n_rows, self.n_features), dtype=np.float64)
+        for j in range(self.n_features):
+            X[:, j] = self.columns[j]
+        return X
+    
+    @property
+    def y(self) -> np.ndarray:
+        return np.asarray(self.columns[-1])
+    
+    def feature_bounds(self) -> List[Tuple[float, float]]:
+        """
+        Limites (min, max) de cada feature, lidos dos metadados do cache
+        
+        Returns:
+            List[Tuple[float, float]]: Limites no formato esperado por FormalFFA
+        """
+        return [(c['min'], c['max']) for c in self.meta['columns'][:-1]]
+
+
+def load_tabular(name: str, split: str = 'complete', root: Optional[str] = None,
+                 cache_root: Optional[str] = None) -> TabularDataset:
+    """
+    Carrega um dataset tabular, convertendo o CSV para o cache na primeira vez
+    
+    Args:
+        name: Nome do dataset (ex.: 'compas')
+        split: 'complete', 'train' ou 'test'
+        root: Diretório raiz dos datasets (padrão: datasets/tabular)
+        cache_root: Diretório do cache (padrão: <root>/.cache)
+    
+    Returns:
+        TabularDataset: Dataset com colunas mapeadas em memória
+    """
+    root = os.path.abspath(root or DEFAULT_ROOT)
+    available = discover_datasets(root)
+    if name not in available or split not in available[name]:
+        raise ValueError(f"Dataset tabular não encontrado: {name} ({split})")
+    
+    csv_path = available[name][split]
+    cache_dir = os.path.join(cache_root or os.path.join(root, '.cache'), split, name)
+    categorical = _categorical_columns(root, name)
+    
+    meta = _load_meta(csv_path, cache_dir, categorical, available[name])
+    if meta is None:
+        meta = _build_cache(csv_path, cache_dir, categorical, available[name])
+    
+    return TabularDataset(name, split, cache_dir, meta)
\ No newline at end of file
@@ -0,0 +1,157 @@
+import numpy as np
+
+from tree_structure import parse_xgboost
+
+
+class CompiledTreeEnsemble:
+    """
+    Avaliador vetorizado de boosters XGBoost
+    
+    As árvores são achatadas uma única vez em matrizes NumPy (feature,
+    threshold, filhos, valor da folha) e lotes de linhas são avaliados
+    percorrendo todas as árvores simultaneamente, sem construir DMatrix.
+    Pode substituir o modelo em FormalFFA, HeuristicFFA e ApproximationMethods.
+    """
+    
+    def __init__(self, model, chunk_size: int = 4096):
+        """
+        Args:
+            model: XGBClassifier ou xgboost.Booster treinado
+            chunk_size: Número de linhas avaliadas por vez (limita a memória)
+        """
+        self.structure = parse_xgboost(model)
+        self.chunk_size = chunk_size
+        self.n_features_in_ = self.structure['n_features']
+        self.n_groups = self.structure['n_groups']
+        self.objective = self.structure['objective']
+        self.base_margin = self.structure['base_margin']
+        self.classes_ = np.asarray(getattr(model, 'classes_', np.arange(max(2, self.n_groups))))
+        self._compile(self.structure['trees'])
+    
+    def _compile(self, trees):
+        n_trees = len(trees)
+        max_nodes = max(len(tree['left']) for tree in trees)
+        self.max_depth = 0
+        
+        self.feature = np.zeros((n_trees, max_nodes), dtype=np.int64)
+        self.threshold = np.zeros((n_trees, max_nodes), dtype=np.float32)
+        self.left = np.zeros((n_trees, max_nodes), dtype=np.int64)
+        self.right = np.zeros((n_trees, max_nodes), dtype=np.int64)
+        self.default_left = np.zeros((n_trees, max_nodes), dtype=bool)
+        self.value = np.zeros((n_trees, max_nodes), dtype=np.float32)
+        
+        for t, tree in enumerate(trees):
+            n_nodes = len(tree['left'])
+            nodes = np.arange(n_nodes)
+            is_leaf = tree['left'] == -1
+            # Folhas apontam para si mesmas: percursos curtos ficam parados
+            self.feature[t, :n_nodes] = np.where(is_leaf, 0, tree['feature'])
+            self.threshold[t, :n_nodes] = tree['threshold']
+            self.left[t, :n_nodes] = np.where(is_leaf, nodes, tree['left'])
+            self.right[t, :n_nodes] = np.where(is_leaf, nodes, tree['right'])
+            self.default_left[t, :n_nodes] = tree['default_left']
+            self.value[t, :n_nodes] = tree['value']
+            self.max_depth = max(self.max_depth, self._depth(tree))
+        
+        offsets = (np.arange(n_trees) * max_nodes)[:, None]
+        self._feature_flat = self.feature.ravel()
+        self._threshold_flat = self.threshold.ravel()
+        self._default_left_flat = self.default_left.ravel()
+        self._left_flat = (self.left + offsets).ravel()
+        self._right_flat = (self.right + offsets).ravel()
+        
+        self.group_matrix = np.zeros((n_trees, self.n_groups))
+        self.group_matrix[np.arange(n_trees), self.structure['tree_group']] = 1.0
+    
+    @staticmethod
+    def _depth(tree) -> int:
+        depth = np.zeros(len(tree['left']), dtype=np.int64)
+        for node in range(len(tree['left'])):
+            if tree['left'][node] != -1:
+                depth[tree['left'][node]] = depth[node] + 1
+                depth[tree['right'][node]] = depth[node] + 1
+        return int(depth.max())
+    
+    def _apply_chunk(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_trees = len(X), self.feature.shape[0]
+        # Índices planos: nó global = árvore * max_nodes + nó local
+        offsets = np.arange(n_trees) * self.feature.shape[1]
+        row_offsets = (np.arange(n_rows) * X.shape[1])[:, None]
+        X_flat = X.ravel()
+        nodes = np.broadcast_to(offsets, (n_rows, n_trees)).copy()
+        has_missing = bool(np.isnan(X).any())
+        
+        for _ in range(self.max_depth):
+            values = X_flat[row_offsets + self._feature_flat[nodes]]
+            go_left = values < self._threshold_flat[nodes]
+            if has_missing:
+                missing = np.isnan(values)
+                go_left = np.where(missing, self._default_left_flat[nodes], go_left)
+            nodes = np.where(go_left, self._left_flat[nodes], self._right_flat[nodes])
+        
+        return nodes - offsets
+    
+    def _as_matrix(self, X) -> np.ndarray:
+        # O XGBoost compara as features em float32
+        return np.ascontiguousarray(X, dtype=np.float32).reshape(-1, self.n_features_in_)
+    
+    def apply(self, X) -> np.ndarray:
+        """
+        Args:
+            X: Linhas de entrada (n_rows, n_features)
+        
+        Returns:
+            np.ndarray: Índice da folha atingida em cada árvore (n_rows, n_trees)
+        """
+        X = self._as_matrix(X)
+        return np.vstack([self._apply_chunk(X[start:start + self.chunk_size])
+                          for start in range(0, len(X), self.chunk_size)]
+                         or [np.zeros((0, self.feature.shape[0]), dtype=np.int64)])
+    
+    def predict_margin(self, X) -> np.ndarray:
+        """
+        Args:
+            X: Linhas de entrada (n_rows, n_features)
+        
+        Returns:
+            np.ndarray: Margens (n_rows, n_groups) antes da função de ligação
+        """
+        X = self._as_matrix(X)
+        margins = np.empty((len(X), self.n_groups))
+        tree_idx = np.arange(self.feature.shape[0])[None, :]
+        for start in range(0, len(X), self.chunk_size):
+            nodes = self._apply_chunk(X[start:start + self.chunk_size])
+            leaf_values = self.value[tree_idx, nodes].astype(np.float64)
+            margins[start:start + len(nodes)] = leaf_values @ self.group_matrix + self.base_margin
+        return margins
+    
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Args:
+            X: Linhas de entrada (n_rows, n_features)
+        
+        Returns:
+            np.ndarray: Probabilidades (n_rows, n_classes)
+        """
+        margins = self.predict_margin(X)
+        if self.n_groups == 1:
+            positive = 1.0 / (1.0 + np.exp(-margins[:, 0]))
+            return np.column_stack([1.0 - positive, positive]).astype(np.float32)
+        
+        exp = np.exp(margins - margins.max(axis=1, keepdims=True))
+        return (exp / exp.sum(axis=1, keepdims=True)).astype(np.float32)
+    
+    def predict(self, X) -> np.ndarray:
+        """
+        Args:
+            X: Linhas de entrada (n_rows, n_features)
+        
+        Returns:
+            np.ndarray: Classe prevista para cada linha
+        """
+        margins = self.predict_margin(X)
+        if self.n_groups == 1:
+            labels = (margins[:, 0] > 0).astype(np.int64)
+        else:
+            labels = np.argmax(margins, axis=1)
+        return self.classes_[labels]
@@ -0,0 +1,213 @@
+import math
+import numpy as np
+from typing import Dict, List, Optional
+
+from tree_structure import parse_tree_model
+
+
+class TreeSHAP:
+    """
+    Valores de Shapley exatos (TreeSHAP dependente de caminho) em NumPy
+    
+    Para cada folha, o jogo dependente de caminho é um produto sobre as
+    features distintas d do caminho: o_d (a instância segue todas as arestas
+    em d) se d está na coalizão, ou z_d (fração de cobertura das arestas em d)
+    caso contrário. O valor de Shapley de um produto tem forma fechada pelos
+    coeficientes do polinômio prod_d (z_d + o_d t); as folhas de mesmo
+    comprimento de caminho são processadas juntas para todas as instâncias.
+    
+    Explica a margem (log-odds) de modelos XGBoost, como o TreeExplainer do
+    pacote shap, e as probabilidades médias de florestas do scikit-learn.
+    """
+    
+    def __init__(self, model, chunk_size: int = 1024):
+        """
+        Args:
+            model: XGBClassifier/Booster, CompiledTreeEnsemble ou classificador
+                de árvores do scikit-learn
+            chunk_size: Número de instâncias processadas por vez
+        """
+        structure = parse_tree_model(model)
+        self.decision = structure['decision']
+        self.n_features = structure['n_features']
+        self.chunk_size = max(1, chunk_size)
+        
+        if self.decision == '<':
+            self.n_outputs = structure['n_groups']
+            groups = structure['tree_group']
+            base = np.asarray(structure['base_margin'], dtype=float)
+            scale = 1.0
+        else:
+            self.n_outputs = structure['n_classes']
+            groups = None
+            base = np.zeros(self.n_outputs)
+            scale = 1.0 / len(structure['trees'])
+        
+        self._build(structure['trees'], groups, scale)
+        self.expected_value = base + self._expected
+    
+    def _build(self, trees: List[Dict[str, np.ndarray]], groups: Optional[np.ndarray], scale: float):
+        """
+        Achata as arestas de todos os caminhos e agrupa as folhas por número
+        de features distintas no caminho
+        """
+        edge_feature, edge_threshold, edge_left, edge_default, edge_slot = [], [], [], [], []
+        leaves = {}
+        n_slots = 0
+        self._expected = np.zeros(self.n_outputs)
+        
+        for t, tree in enumerate(trees):
+            root_cover = tree['cover'][0]
+            stack = [(0, [])]
+            while stack:
+                node, edges = stack.pop()
+                left, right = int(tree['left'][node]), int(tree['right'][node])
+                if left != -1:
+                    for child, go_left in ((right, False), (left, True)):
+                        stack.append((child, edges + [(node, child, go_left)]))
+                    continue
+                
+                if groups is None:
+                    value = np.asarray(tree['value'][node], dtype=float) * scale
+                else:
+                    value = np.zeros(self.n_outputs)
+                    value[groups[t]] = float(tree['value'][node]) * scale
+                self._expected += value * tree['cover'][node] / root_cover
+                
+                features = sorted({int(tree['feature'][parent]) for parent, _, _ in edges})
+                if not features:
+                    continue
+                slots = {f: n_slots + i for i, f in enumerate(features)}
+                zero = np.ones(len(features))
+                for parent, child, go_left in edges:
+                    f = int(tree['feature'][parent])
+                    zero[features.index(f)] *= tree['cover'][child] / tree['cover'][parent]
+                    edge_feature.append(f)
+                    edge_threshold.append(tree['threshold'][parent])
+                    edge_left.append(go_left)
+                    edge_default.append(bool(tree['default_left'][parent]))
+                    edge_slot.append(slots[f])
+                
+                group = leaves.setdefault(len(features), {'slots': [], 'features': [], 'zero': [], 'value': []})
+                group['slots'].append([slots[f] for f in features])
+                group['features'].append(features)
+                group['zero'].append(zero)
+                group['value'].append(value)
+                n_slots += len(features)
+        
+        order = np.argsort(edge_slot, kind='stable')
+        self._edge_feature = np.asarray(edge_feature, dtype=np.int64)[order]
+        self._edge_threshold = np.asarray(edge_threshold, dtype=np.float32)[order]
+        self._edge_left = np.asarray(edge_left, dtype=bool)[order]
+        self._edge_default = np.asarray(edge_default, dtype=bool)[order]
+        edge_slot = np.asarray(edge_slot, dtype=np.int64)[order]
+        self._slot_starts = np.flatnonzero(np.r_[True, edge_slot[1:] != edge_slot[:-1]]) if len(edge_slot) else edge_slot
+        self._n_slots = n_slots
+        
+        self._groups = []
+        for m, group in sorted(leaves.items()):
+            weights = np.array([math.factorial(s) * math.factorial(m - 1 - s) / math.factorial(m)
+                                for s in range(m)])
+            self._groups.append({
+                'm': m,
+                'slots': np.asarray(group['slots'], dtype=np.int64),
+                'features': np.asarray(group['features'], dtype=np.int64),
+                'zero': np.asarray(group['zero'], dtype=float),
+                'value': np.asarray(group['value'], dtype=float),
+                'weights': weights
+            })
+    
+    def _one_fractions(self, X: np.ndarray) -> np.ndarray:
+        """
+        o_d de cada slot (folha, feature) para cada instância: (n, n_slots)
+        """
+        values = X[:, self._edge_feature].astype(np.float32)
+        if self.decision == '<':
+            goes_left = np.where(np.isnan(values), self._edge_default, values < self._edge_threshold)
+        else:
+            goes_left = values <= self._edge_threshold
+        follows = goes_left == self._edge_left
+        return np.minimum.reduceat(follows, self._slot_starts, axis=1).astype(float)
+    
+    def _explain_chunk(self, X: np.ndarray) -> np.ndarray:
+        n = len(X)
+        phi = np.zeros((self.n_features, n, self.n_outputs))
+        one = self._one_fractions(X) if self._n_slots else np.zeros((n, 0))
+        
+        for group in self._groups:
+            m = group['m']
+            o = one[:, group['slots']]                    # (n, L, m)
+            z = np.broadcast_to(group['zero'], o.shape)   # (n, L, m)
+            
+            # Coeficientes de prod_d (z_d + o_d t), em ordem crescente de grau
+            poly = np.zeros(o.shape[:2] + (m + 1,))
+            poly[..., 0] = 1.0
+            for d in range(m):
+                shifted = np.concatenate([np.zeros(o.shape[:2] + (1,)), poly[..., :-1]], axis=-1)
+                poly = poly * z[..., d:d + 1] + shifted * o[..., d:d + 1]
+            
+            for j in range(m):
+                o_j, z_j = o[..., j], z[..., j]
+                # Remove o fator (z_j + o_j t): com o_j = 1, divisão sintética
+                # a partir do maior grau; com o_j = 0, divisão por z_j
+                quotient = np.zeros(o.shape[:2] + (m,))
+                quotient[..., m - 1] = poly[..., m]
+                for s in range(m - 1, 0, -1):
+                    quotient[..., s - 1] = poly[..., s] - z_j * quotient[..., s]
+                quotient = np.where((o_j > 0)[..., None], quotient, poly[..., :m] / z_j[..., None])
+                
+                weight = (o_j - z_j) * (quotient @ group['weights'])   # (n, L)
+                contribution = weight[:, :, None] * group['value'][None, :, :]
+                np.add.at(phi, group['features'][:, j], contribution.transpose(1, 0, 2))
+        
+        return phi.transpose(1, 0, 2)
+    
+    def shap_values(self, X: np.ndarray) -> np.ndarray:
+        """
+        Valores de Shapley de todas as saídas
+        
+        Args:
+            X: Instâncias (n_instances, n_features)
+        
+        Returns:
+            np.ndarray: (n_instances, n_features, n_outputs); somados a
+                expected_value, reproduzem a margem (XGBoost) ou a probabilidade (floresta)
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        return np.concatenate([self._explain_chunk(X[start:start + self.chunk_size])
+                               for start in range(0, len(X), self.chunk_size)], axis=0)
+    
+    def explain(self, X: np.ndarray, target: int = 1) -> np.ndarray:
+        """
+        Valores de Shapley da classe alvo
+        
+        Args:
+            X: Instâncias (n_instances, n_features)
+            target: Classe alvo (em XGBoost binário, a classe 0 recebe a
+                margem com sinal trocado)
+        
+        Returns:
+            np.ndarray: (n_instances, n_features)
+        """
+        values = self.shap_values(X)
+        if self.n_outputs == 1:
+            return values[:, :, 0] if target == 1 else -values[:, :, 0]
+        return values[:, :, target]
+    
+    def explain_classes(self, X: np.ndarray, classes=None) -> np.ndarray:
+        """
+        Valores de Shapley de várias classes a partir de uma única passagem
+        pelas árvores
+        
+        Args:
+            X: Instâncias (n_instances, n_features)
+            classes: Classes explicadas (padrão: todas; duas em XGBoost binário)
+        
+        Returns:
+            np.ndarray: (n_instances, n_classes, n_features)
+        """
+        values = self.shap_values(X)
+        if self.n_outputs == 1:
+            values = np.concatenate([-values, values], axis=2)
+        values = values.transpose(0, 2, 1)
+        return values if classes is None else values[:, np.asarray(classes, dtype=int).reshape(-1)]
\ No newline at end of file
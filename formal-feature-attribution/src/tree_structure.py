@@ -0,0 +1,196 @@
+import json
+import numpy as np
+from typing import Any, Dict, List
+
+
+def _get_booster(model):
+    """
+    Retorna o Booster de um XGBClassifier (ou o próprio Booster)
+    """
+    return model.get_booster() if hasattr(model, 'get_booster') else model
+
+
+def _tree_arrays(tree: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Converte uma árvore do dump JSON do XGBoost em arrays NumPy
+    """
+    left = np.asarray(tree['left_children'], dtype=np.int64)
+    is_leaf = left == -1
+    conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+    
+    return {
+        'left': left,
+        'right': np.asarray(tree['right_children'], dtype=np.int64),
+        'feature': np.where(is_leaf, -1, np.asarray(tree['split_indices'], dtype=np.int64)),
+        'threshold': np.where(is_leaf, np.float32(0), conditions).astype(np.float32),
+        'default_left': np.asarray(tree['default_left'], dtype=bool),
+        'value': np.where(is_leaf, conditions, np.float32(0)).astype(np.float32),
+        'cover': np.asarray(tree['sum_hessian'], dtype=np.float64),
+    }
+
+
+def leaf_value(tree: Dict[str, np.ndarray], row: np.ndarray) -> float:
+    """
+    Percorre uma árvore para uma única linha (x < threshold segue à esquerda)
+    
+    Args:
+        tree: Árvore no formato de parse_xgboost
+        row: Instância de entrada
+    
+    Returns:
+        float: Valor da folha atingida
+    """
+    node = 0
+    while tree['left'][node] != -1:
+        value = np.float32(row[tree['feature'][node]])
+        if np.isnan(value):
+            go_left = tree['default_left'][node]
+        else:
+            go_left = value < tree['threshold'][node]
+        node = tree['left'][node] if go_left else tree['right'][node]
+    return float(tree['value'][node])
+
+
+def parse_xgboost(model) -> Dict[str, Any]:
+    """
+    Extrai a estrutura das árvores de um modelo XGBoost treinado
+    
+    Args:
+        model: XGBClassifier ou xgboost.Booster
+    
+    Returns:
+        dict: Árvores em arrays NumPy, grupo (classe) de cada árvore,
+            margem base por grupo e objetivo do modelo
+    """
+    from xgboost import DMatrix
+    
+    booster = _get_booster(model)
+    learner = json.loads(booster.save_raw('json'))['learner']
+    gbtree = learner['gradient_booster']
+    if 'model' not in gbtree:
+        raise ValueError(f"Booster não suportado: {gbtree.get('name')}")
+    
+    trees = [_tree_arrays(tree) for tree in gbtree['model']['trees']]
+    tree_group = np.asarray(gbtree['model']['tree_info'], dtype=np.int64)
+    n_groups = max(1, int(learner['learner_model_param']['num_class']))
+    n_features = int(learner['learner_model_param']['num_feature'])
+    
+    # A margem base é obtida empiricamente: margem do booster menos a soma das folhas
+    probe = np.zeros((1, n_features), dtype=np.float32)
+    margin = np.asarray(
+        booster.predict(DMatrix(probe), output_margin=True), dtype=np.float64
+    ).reshape(n_groups)
+    leaf_sums = np.zeros(n_groups)
+    for tree, group in zip(trees, tree_group):
+        leaf_sums[group] += leaf_value(tree, probe[0])
+    
+    return {
+        'trees': trees,
+        'tree_group': tree_group,
+        'n_groups': n_groups,
+        'n_features': n_features,
+        'base_margin': margin - leaf_sums,
+        'objective': learner['objective']['name'],
+        'decision': '<',
+    }
+
+
+def parse_sklearn_forest(model) -> Dict[str, Any]:
+    """
+    Extrai a estrutura das árvores de um classificador de árvores do scikit-learn
+    
+    Args:
+        model: RandomForestClassifier, ExtraTreesClassifier ou DecisionTreeClassifier
+    
+    Returns:
+        dict: Árvores em arrays NumPy (x <= threshold segue à esquerda), com a
+            distribuição de classes normalizada de cada nó em 'value'
+    """
+    estimators = getattr(model, 'estimators_', [model])
+    if np.ndim(estimators) != 1 or not all(hasattr(tree, 'tree_') for tree in estimators):
+        raise ValueError(f"Modelo não suportado: {type(model).__name__}")
+    
+    trees = []
+    for estimator in estimators:
+        tree = estimator.tree_
+        left = np.asarray(tree.children_left, dtype=np.int64)
+        is_leaf = left == -1
+        value = np.asarray(tree.value, dtype=np.float64)[:, 0, :]
+        value = value / np.maximum(value.sum(axis=1, keepdims=True), 1e-12)
+        trees.append({
+            'left': left,
+            'right': np.asarray(tree.children_right, dtype=np.int64),
+            'feature': np.where(is_leaf, -1, tree.feature).astype(np.int64),
+            'threshold': np.where(is_leaf, 0.0, tree.threshold),
+            'default_left': np.zeros(len(left), dtype=bool),
+            'value': value,
+            'cover': np.asarray(tree.weighted_n_node_samples, dtype=np.float64),
+        })
+    
+    return {
+        'trees': trees,
+        'n_classes': len(model.classes_),
+        'n_features': int(model.n_features_in_),
+        'decision': '<=',
+    }
+
+
+def parse_tree_model(model) -> Dict[str, Any]:
+    """
+    Extrai a estrutura de qualquer modelo de árvores suportado
+    
+    Args:
+        model: XGBClassifier/Booster, CompiledTreeEnsemble ou classificador
+            de árvores do scikit-learn
+    
+    Returns:
+        dict: Estrutura no formato de parse_xgboost ou parse_sklearn_forest
+    """
+    if hasattr(model, 'structure'):
+        return model.structure
+    if hasattr(model, 'get_booster') or type(model).__name__ == 'Booster':
+        return parse_xgboost(model)
+    return parse_sklearn_forest(model)
+
+
+def split_thresholds(model, n_features: int) -> List[np.ndarray]:
+    """
+    Coleta os thresholds de divisão usados pelo modelo em cada feature
+    
+    Args:
+        model: Modelo de árvores suportado por parse_tree_model
+        n_features: Número de features
+    
+    Returns:
+        List[np.ndarray]: Thresholds ordenados e únicos por feature
+    """
+    structure = parse_tree_model(model)
+    features = np.concatenate([tree['feature'] for tree in structure['trees']])
+    thresholds = np.concatenate([tree['threshold'] for tree in structure['trees']])
+    internal = features >= 0
+    return [np.unique(thresholds[internal & (features == j)]) for j in range(n_features)]
+
+
+def leaf_paths(tree: Dict[str, np.ndarray]) -> List[tuple]:
+    """
+    Enumera os caminhos raiz-folha de uma árvore
+    
+    Args:
+        tree: Árvore no formato de parse_xgboost
+    
+    Returns:
+        List[tuple]: Pares (condições, valor), onde cada condição é
+            (feature, threshold, vai_para_esquerda)
+    """
+    paths = []
+    stack = [(0, [])]
+    while stack:
+        node, conditions = stack.pop()
+        if tree['left'][node] == -1:
+            paths.append((conditions, float(tree['value'][node])))
+            continue
+        feature = int(tree['feature'][node])
+        threshold = float(tree['threshold'][node])
+        stack.append((int(tree['right'][node]), conditions + [(feature, threshold, False)]))
+        stack.append((int(tree['left'][node]), conditions + [(feature, threshold, True)]))
+    return paths
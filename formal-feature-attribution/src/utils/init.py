@@ -1,9 +1,23 @@
-from .metrics import calculate_correlations, calculate_ranking_metrics
-from .visualization import plot_attribution_comparison, generate_final_report
+from .metrics import calculate_correlations, calculate_ranking_metrics, compare_attributions
+
+# Funções de visualization (matplotlib/seaborn) importadas só no primeiro acesso
+_VISUALIZATION = ('plot_attribution_comparison', 'plot_pixel_attribution', 'generate_final_report',
+                  'generate_report_from_store')
+
+
+def __getattr__(name):
+    if name in _VISUALIZATION:
+        from . import visualization
+        return getattr(visualization, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'calculate_correlations', 
     'calculate_ranking_metrics',
+    'compare_attributions',
     'plot_attribution_comparison', 
-    'generate_final_report'
+    'plot_pixel_attribution',
+    'generate_final_report',
+    'generate_report_from_store'
 ]
\ No newline at end of file
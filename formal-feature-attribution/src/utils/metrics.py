@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.stats import kendalltau
+from itertools import combinations
 from typing import Dict, Tuple
 
 
@@ -13,10 +13,12 @@ def calculate_correlations(ffa_attr: np.ndarray, lime_attr: np.ndarray,
         lime_attr: Atribuição LIME
         shap_attr: Atribuição SHAP
         perm_attr: Importância por permutação
-        
+    
     Returns:
         Dict com correlações entre métodos
     """
+    from scipy.stats import kendalltau
+    
     correlations = {}
     
     try:
@@ -31,7 +33,7 @@ def calculate_correlations(ffa_attr: np.ndarray, lime_attr: np.ndarray,
         
         corr, _ = kendalltau(lime_attr, shap_attr)
         correlations['lime_vs_shap'] = corr if not np.isnan(corr) else 0.0
-        
+    
     except Exception as e:
         correlations = {
             'ffa_vs_lime': 0.0,
@@ -53,7 +55,7 @@ def calculate_ranking_metrics(ffa_attr: np.ndarray, lime_attr: np.ndarray,
         lime_attr: Atribuição LIME  
         shap_attr: Atribuição SHAP
         perm_attr: Importância por permutação
-        
+    
     Returns:
         Dict com métricas de ranking
     """
@@ -93,8 +95,169 @@ def calculate_manhattan_distance(attr1: np.ndarray, attr2: np.ndarray) -> float:
     Args:
         attr1: Primeiro vetor de atribuição
         attr2: Segundo vetor de atribuição
-        
+    
     Returns:
         float: Distância Manhattan
     """
-    return np.sum(np.abs(attr1 - attr2))
\ No newline at end of file
+    return np.sum(np.abs(attr1 - attr2))
+
+
+def _as_matrix(attr: np.ndarray) -> np.ndarray:
+    return np.atleast_2d(np.asarray(attr, dtype=float))
+
+
+def _positions(A: np.ndarray) -> np.ndarray:
+    """
+    Posição de cada feature no ranking decrescente de cada linha (empates pelo índice)
+    """
+    order = np.argsort(-A, axis=1, kind='stable')
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(A.shape[1])[None, :], axis=1)
+    return positions
+
+
+def kendall_tau_rows(A: np.ndarray, B: np.ndarray, max_elements: int = 4000000) -> np.ndarray:
+    """
+    Kendall tau-b entre as linhas correspondentes de duas matrizes de atribuição
+    
+    Args:
+        A: Atribuições (n_instances, n_features) do primeiro método
+        B: Atribuições (n_instances, n_features) do segundo método
+        max_elements: Tamanho máximo dos blocos (linhas x pares de features)
+    
+    Returns:
+        np.ndarray: tau por instância (0.0 quando indefinido, como em calculate_correlations)
+    """
+    A, B = _as_matrix(A), _as_matrix(B)
+    n, m = A.shape
+    taus = np.zeros(n)
+    block = max(1, max_elements // max(1, m * m))
+    
+    for start in range(0, n, block):
+        a, b = A[start:start + block], B[start:start + block]
+        # Sinais de todos os pares (i, j); cada par aparece duas vezes
+        sign_a = np.sign(a[:, :, None] - a[:, None, :])
+        sign_b = np.sign(b[:, :, None] - b[:, None, :])
+        numerator = np.einsum('nij,nij->n', sign_a, sign_b)
+        # Pares não empatados em cada método: n0 - n1 e n0 - n2
+        denominator = np.sqrt(np.abs(sign_a).sum(axis=(1, 2)) * np.abs(sign_b).sum(axis=(1, 2)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            taus[start:start + block] = np.where(denominator > 0, numerator / denominator, 0.0)
+    
+    return taus
+
+
+def spearman_rows(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """
+    Correlação de Spearman (postos médios nos empates) entre linhas correspondentes
+    
+    Returns:
+        np.ndarray: rho por instância (0.0 quando indefinido)
+    """
+    from scipy.stats import rankdata
+    
+    ranks_a = rankdata(_as_matrix(A), axis=1)
+    ranks_b = rankdata(_as_matrix(B), axis=1)
+    ranks_a -= ranks_a.mean(axis=1, keepdims=True)
+    ranks_b -= ranks_b.mean(axis=1, keepdims=True)
+    numerator = np.sum(ranks_a * ranks_b, axis=1)
+    denominator = np.sqrt(np.sum(ranks_a ** 2, axis=1) * np.sum(ranks_b ** 2, axis=1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / denominator, 0.0)
+
+
+def top_k_overlap_rows(A: np.ndarray, B: np.ndarray, k: int = 3) -> np.ndarray:
+    """
+    Fração das k features mais importantes compartilhada pelos dois métodos
+    
+    Returns:
+        np.ndarray: |top_k(A) ∩ top_k(B)| / k por instância
+    """
+    A, B = _as_matrix(A), _as_matrix(B)
+    k = min(k, A.shape[1])
+    in_a = _positions(A) < k
+    in_b = _positions(B) < k
+    return np.sum(in_a & in_b, axis=1) / k
+
+
+def manhattan_rows(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """
+    Distância Manhattan (calculate_manhattan_distance) por instância
+    """
+    return np.sum(np.abs(_as_matrix(A) - _as_matrix(B)), axis=1)
+
+
+def rbo_rows(A: np.ndarray, B: np.ndarray, p: float = 0.9) -> np.ndarray:
+    """
+    Rank-biased overlap extrapolado (Webber et al., 2010) entre os rankings
+    decrescentes de linhas correspondentes
+    
+    Args:
+        A: Atribuições (n_instances, n_features) do primeiro método
+        B: Atribuições (n_instances, n_features) do segundo método
+        p: Persistência; valores menores dão mais peso ao topo do ranking
+    
+    Returns:
+        np.ndarray: RBO em [0, 1] por instância (1 para rankings idênticos)
+    """
+    A, B = _as_matrix(A), _as_matrix(B)
+    n, m = A.shape
+    # A feature está nos dois prefixos de profundidade d quando as duas
+    # posições são < d: X_d conta as features com max(posições) < d
+    deepest = np.maximum(_positions(A), _positions(B))
+    offsets = (np.arange(n) * m)[:, None]
+    counts = np.bincount((deepest + offsets).ravel(), minlength=n * m).reshape(n, m)
+    overlap = np.cumsum(counts, axis=1)
+    
+    depths = np.arange(1, m + 1)
+    agreement = overlap / depths
+    weights = p ** depths
+    return agreement[:, -1] * p ** m + (1 - p) / p * agreement @ weights
+
+
+# Métricas par a par de compare_attributions
+PAIRWISE_METRICS = ('kendall', 'spearman', 'top_k_overlap', 'manhattan', 'rbo')
+
+
+def compare_attributions(attributions: Dict[str, np.ndarray], k: int = 3, p: float = 0.9,
+                         instances=None):
+    """
+    Métricas de concordância entre todos os pares de métodos
+    
+    Args:
+        attributions: Nome do método -> matriz (n_instances, n_features),
+            com as linhas na mesma ordem de instâncias
+        k: Tamanho do topo em top_k_overlap
+        p: Persistência do RBO
+        instances: Identificadores das instâncias (padrão: 0..n_instances-1)
+    
+    Returns:
+        pd.DataFrame: Tabela longa com uma linha por (instância, par de
+            métodos) e colunas instance, method_a, method_b e PAIRWISE_METRICS
+    """
+    import pandas as pd
+    
+    matrices = {name: _as_matrix(attr) for name, attr in attributions.items()}
+    shapes = {matrix.shape for matrix in matrices.values()}
+    if len(shapes) != 1:
+        raise ValueError(f"Matrizes de atribuição com formas diferentes: {sorted(shapes)}")
+    n = shapes.pop()[0]
+    instances = np.arange(n) if instances is None else np.asarray(instances)
+    
+    frames = []
+    for name_a, name_b in combinations(matrices, 2):
+        A, B = matrices[name_a], matrices[name_b]
+        frames.append(pd.DataFrame({
+            'instance': instances,
+            'method_a': name_a,
+            'method_b': name_b,
+            'kendall': kendall_tau_rows(A, B),
+            'spearman': spearman_rows(A, B),
+            'top_k_overlap': top_k_overlap_rows(A, B, k),
+            'manhattan': manhattan_rows(A, B),
+            'rbo': rbo_rows(A, B, p)
+        }))
+    
+    if not frames:
+        return pd.DataFrame(columns=['instance', 'method_a', 'method_b', *PAIRWISE_METRICS])
+    return pd.concat(frames, ignore_index=True)
\ No newline at end of file
@@ -4,6 +4,8 @@ import os
 from typing import Dict, Any
 import seaborn as sns
 
+from .metrics import calculate_correlations, calculate_ranking_metrics
+
 
 def plot_attribution_comparison(results: Dict[str, Any], dataset_name: str, 
                                instance_idx: int, save_path: str = None):
@@ -58,6 +60,40 @@ def plot_attribution_comparison(results: Dict[str, Any], dataset_name: str,
     plt.show()
 
 
+def plot_pixel_attribution(scores: np.ndarray, shape: tuple, save_path: str,
+                           image: np.ndarray = None, cmap: str = 'plasma'):
+    """
+    Salva um mapa de calor de atribuições por pixel (ex.: PDF)
+    
+    Args:
+        scores: Atribuição de cada pixel (achatada) ou None para salvar só a imagem
+        shape: Formato (linhas, colunas) da imagem
+        save_path: Caminho do arquivo; a extensão define o formato
+        image: Imagem original (achatada); se informada, o mapa é sobreposto
+            a ela e pixels sem atribuição mostram a imagem
+        cmap: Mapa de cores das atribuições
+    """
+    fig, ax = plt.subplots(figsize=(4, 4))
+    
+    if image is not None:
+        ax.imshow(np.reshape(image, shape), cmap='gray_r', vmin=0, vmax=1)
+    
+    if scores is not None:
+        heatmap = np.reshape(np.asarray(scores, dtype=float), shape)
+        vmax = heatmap.max() if heatmap.max() > 0 else 1.0
+        ax.imshow(np.ma.masked_where(heatmap <= 0, heatmap), cmap=cmap, vmin=0, vmax=vmax,
+                  alpha=0.8 if image is not None else 1.0)
+    
+    ax.set_xticks([])
+    ax.set_yticks([])
+    
+    directory = os.path.dirname(save_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fig.savefig(save_path, bbox_inches='tight')
+    plt.close(fig)
+
+
 def generate_final_report(results_5_1: Dict[str, Any], results_5_2: Dict[str, Any], 
                          output_dir: str = 'data/results/'):
     """
@@ -135,4 +171,66 @@ def generate_final_report(results_5_1: Dict[str, Any], results_5_2: Dict[str, An
                 save_path = f"{output_dir}/{dataset_name}_instance_{instance_idx}.png"
                 plot_attribution_comparison(plot_data, dataset_name, i, save_path)
     
-    print(f"\n✅ RELATÓRIO GERADO E SALVO EM: {output_dir}")
\ No newline at end of file
+    print(f"\n✅ RELATÓRIO GERADO E SALVO EM: {output_dir}")
+
+
+def generate_report_from_store(store, output_dir: str = 'data/results/'):
+    """
+    Gera o relatório final a partir do armazenamento de resultados
+    
+    Os registros são lidos um a um; apenas as atribuições das instâncias com
+    todos os métodos calculados são usadas nas métricas.
+    
+    Args:
+        store: ResultsStore com os resultados das seções 5.1 e 5.2
+        output_dir: Diretório de saída
+    """
+    performance = {}
+    feature_names = {}
+    by_dataset = {}
+    for record in store.iter_records():
+        dataset_name = record['dataset']
+        if record['method'] == 'performance':
+            performance[dataset_name] = {key: record[key] for key in ('train_accuracy', 'test_accuracy')}
+            if record.get('feature_names'):
+                feature_names[dataset_name] = record['feature_names']
+            continue
+        methods = by_dataset.setdefault(dataset_name, {})
+        methods.setdefault(record['method'], {})[record['instance']] = record['attribution']
+    
+    results_5_1 = {name: {'performance': perf} for name, perf in performance.items()}
+    results_5_2 = {}
+    
+    for dataset_name, methods in by_dataset.items():
+        if dataset_name not in results_5_1 or None not in methods.get('permutation', {}):
+            continue
+        
+        sample_indices = [idx for idx in methods.get('formal', {})
+                          if all(idx in methods.get(m, {}) for m in ('lime', 'shap'))]
+        if not sample_indices:
+            continue
+        
+        perm_importance = methods['permutation'][None]
+        formal_attributions = [methods['formal'][idx] for idx in sample_indices]
+        lime_attributions = [methods['lime'][idx] for idx in sample_indices]
+        shap_attributions = [methods['shap'][idx] for idx in sample_indices]
+        
+        metrics = {}
+        for idx, formal_attr, lime_attr, shap_attr in zip(sample_indices, formal_attributions,
+                                                          lime_attributions, shap_attributions):
+            metrics[idx] = {
+                'correlations': calculate_correlations(formal_attr, lime_attr, shap_attr, perm_importance),
+                'ranking_metrics': calculate_ranking_metrics(formal_attr, lime_attr, shap_attr, perm_importance)
+            }
+        
+        results_5_2[dataset_name] = {
+            'permutation_importance': perm_importance,
+            'lime_attributions': lime_attributions,
+            'shap_attributions': shap_attributions,
+            'formal_attributions': formal_attributions,
+            'sample_indices': sample_indices,
+            'feature_names': feature_names.get(dataset_name, [f'F{i}' for i in range(len(perm_importance))]),
+            'metrics': metrics
+        }
+    
+    generate_final_report(results_5_1, results_5_2, output_dir)
\ No newline at end of file
@@ -0,0 +1,142 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional
+
+
+def subset_to_mask(feature_subset: Iterable[int]) -> int:
+    """
+    Converte um subconjunto de features em bitmask (bit j = feature j fixa)
+    """
+    mask = 0
+    for j in feature_subset:
+        mask |= 1 << int(j)
+    return mask
+
+
+def bool_mask_to_int(bool_mask: np.ndarray) -> int:
+    """
+    Converte uma máscara booleana (n_features,) em bitmask inteiro
+    """
+    packed = np.packbits(np.asarray(bool_mask, dtype=bool), bitorder='little')
+    return int.from_bytes(packed.tobytes(), 'little')
+
+
+class SubsetVerdictCache:
+    """
+    Cache de veredictos de AXp explorando monotonicidade
+    
+    Se fixar S garante a predição, qualquer superconjunto de S também garante;
+    se S falha, qualquer subconjunto de S também falha. Por contexto
+    (instância, classe alvo) são mantidos apenas os conjuntos válidos minimais
+    e os inválidos maximais, de modo que uma consulta é respondida se S contém
+    algum válido ou está contido em algum inválido.
+    """
+    
+    def __init__(self, max_entries: int = 100000):
+        """
+        Args:
+            max_entries: Número máximo de máscaras armazenadas (todos os contextos)
+        """
+        self.max_entries = max_entries
+        self._contexts = OrderedDict()
+        self._n_entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _context(self, key: Hashable, create: bool = False) -> Optional[Dict]:
+        context = self._contexts.get(key)
+        if context is None and create:
+            context = {'valid': OrderedDict(), 'invalid': OrderedDict()}
+            self._contexts[key] = context
+        if context is not None:
+            self._contexts.move_to_end(key)
+        return context
+    
+    def lookup(self, key: Hashable, mask: int) -> Optional[bool]:
+        """
+        Args:
+            key: Contexto (instância, classe alvo)
+            mask: Bitmask do subconjunto de features fixas
+        
+        Returns:
+            bool ou None: Veredicto implicado pelo cache, ou None se desconhecido
+        """
+        context = self._context(key)
+        if context is not None:
+            if any(valid & ~mask == 0 for valid in context['valid']):
+                self.hits += 1
+                return True
+            if any(mask & ~invalid == 0 for invalid in context['invalid']):
+                self.hits += 1
+                return False
+        
+        self.misses += 1
+        return None
+    
+    def store(self, key: Hashable, mask: int, verdict: bool):
+        """
+        Registra um veredicto, descartando máscaras que passam a ser redundantes
+        
+        Args:
+            key: Contexto (instância, classe alvo)
+            mask: Bitmask do subconjunto de features fixas
+            verdict: True se o subconjunto é AXp
+        """
+        context = self._context(key, create=True)
+        
+        if verdict:
+            masks = context['valid']
+            if any(valid & ~mask == 0 for valid in masks):
+                return
+            redundant = [valid for valid in masks if mask & ~valid == 0]
+        else:
+            masks = context['invalid']
+            if any(mask & ~invalid == 0 for invalid in masks):
+                return
+            redundant = [invalid for invalid in masks if invalid & ~mask == 0]
+        
+        for old in redundant:
+            del masks[old]
+        masks[mask] = None
+        self._n_entries += 1 - len(redundant)
+        self._evict(key)
+    
+    def _evict(self, current_key: Hashable):
+        """
+        Remove contextos menos usados recentemente (e, em último caso, as
+        máscaras mais antigas do contexto atual) até respeitar o limite
+        """
+        while self._n_entries > self.max_entries:
+            oldest_key = next(iter(self._contexts))
+            if oldest_key != current_key:
+                context = self._contexts.pop(oldest_key)
+                removed = len(context['valid']) + len(context['invalid'])
+            else:
+                context = self._contexts[current_key]
+                larger = max(context['valid'], context['invalid'], key=len)
+                larger.popitem(last=False)
+                removed = 1
+            self._n_entries -= removed
+            self.evictions += removed
+    
+    def clear(self):
+        self._contexts.clear()
+        self._n_entries = 0
+    
+    def __len__(self) -> int:
+        return self._n_entries
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict: Acertos, falhas, entradas, remoções e taxa de acerto
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': self._n_entries,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total > 0 else 0.0
+        }
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Adiciona src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from attribution_benchmark import (BENCHMARKS, CountingModel, compare_results, load_results,
+                                   make_case, run_benchmarks, save_results)
+
+
+class TestBenchmark(unittest.TestCase):
+    
+    def test_run_and_save(self):
+        """Testa uma grade mínima, a contagem de chamadas e a gravação em JSON"""
+        results = run_benchmarks(features=(6,), estimators=(5,), instances=(1, 2),
+                                 benchmarks=['formal.check_axp', 'heuristic.', 'approx.tree_shap'],
+                                 repeat=1, verbose=False)
+        
+        self.assertEqual(len(results), 2 * 3)
+        self.assertEqual({r['benchmark'] for r in results},
+                         {'formal.check_axp', 'heuristic.compute', 'approx.tree_shap_values'})
+        for record in results:
+            self.assertIn(record['benchmark'], BENCHMARKS)
+            self.assertGreater(record['wall_time'], 0)
+            self.assertGreater(record['peak_memory'], 0)
+        # Verificação amostral: uma chamada a predict por instância; TreeSHAP não chama o modelo
+        calls = {(r['benchmark'], r['n_instances']): r['model_calls'] for r in results}
+        self.assertEqual(calls[('formal.check_axp', 2)], 2)
+        self.assertEqual(calls[('approx.tree_shap_values', 2)], 0)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = save_results(results, os.path.join(tmpdir, 'bench', 'run.json'))
+            self.assertEqual(load_results(path), results)
+    
+    def test_counting_model(self):
+        """Testa que o contador delega ao modelo e conta linhas"""
+        case = make_case(6, 5, n_samples=100)
+        model = case['model']
+        self.assertIsInstance(model, CountingModel)
+        model.predict_proba(case['X'][:10])
+        model.predict(case['X'][:3])
+        self.assertEqual((model.calls, model.rows), (2, 13))
+        self.assertEqual(model.n_features_in_, 6)
+    
+    def test_compare_flags_regressions(self):
+        """Testa a detecção de regressões de tempo, chamadas e memória"""
+        base = {'benchmark': 'heuristic.compute', 'n_features': 6, 'n_estimators': 10,
+                'n_instances': 1, 'wall_time': 0.010, 'model_calls': 2, 'peak_memory': 1000}
+        slower = dict(base, wall_time=0.030, model_calls=2, peak_memory=1100)
+        noise = dict(base, n_features=12, wall_time=0.0001)
+        
+        regressions = compare_results([base, dict(noise, wall_time=0.00001)], [slower, noise], threshold=0.25)
+        self.assertEqual([r['metric'] for r in regressions], ['wall_time'])
+        self.assertAlmostEqual(regressions[0]['ratio'], 3.0)
+        self.assertEqual(compare_results([base], [dict(base, model_calls=3)])[0]['metric'], 'model_calls')
+        self.assertEqual(compare_results([base], [base]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,18 @@
 import unittest
+import itertools
+import math
 import numpy as np
 import sys
 import os
+from unittest import mock
 
 # Adiciona src ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from approximation_methods import ApproximationMethods
+from attribution_benchmark import CountingModel
+from prediction_pool import PredictionPool
+from tree_shap import TreeSHAP
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.datasets import make_classification
 
@@ -39,6 +45,32 @@ class TestApproximationMethods(unittest.TestCase):
         # Verifica normalização
         self.assertAlmostEqual(np.sum(importance), 1.0, places=5)
     
+    def test_permutation_scores_repeats(self):
+        """Testa repetições, desvio padrão e independência de n_jobs"""
+        np.random.seed(0)
+        scores = self.approx_methods.permutation_scores(self.X, self.y, n_repeats=6)
+        self.assertEqual(scores['importances'].shape, (4, 6))
+        np.testing.assert_allclose(scores['mean'], scores['importances'].mean(axis=1))
+        np.testing.assert_allclose(scores['std'], scores['importances'].std(axis=1))
+        self.assertTrue(np.any(scores['std'] > 0))
+        
+        np.random.seed(0)
+        threaded = self.approx_methods.permutation_scores(self.X, self.y, n_repeats=6, n_jobs=2)
+        np.testing.assert_array_equal(threaded['importances'], scores['importances'])
+        
+        # Mesma queda de acurácia que a permutação direta de cada coluna
+        rng = np.random.RandomState(7)
+        manual = []
+        for _ in range(6):
+            X_permuted = self.X.copy()
+            X_permuted[:, 0] = self.X[rng.permutation(len(self.X)), 0]
+            manual.append(scores['baseline'] - np.mean(self.model.predict(X_permuted) == self.y))
+        work = self.X.copy()
+        np.testing.assert_allclose(self.approx_methods._permuted_scores(work, self.X, self.y, 0, 6, 7),
+                                   scores['baseline'] - np.array(manual))
+        # A cópia de trabalho volta a ser igual a X para a próxima feature
+        np.testing.assert_array_equal(work, self.X)
+    
     def test_lime_attribution(self):
         """Testa atribuição LIME"""
         attribution = self.approx_methods.lime_attribution(self.X, 0)
@@ -47,6 +79,63 @@ class TestApproximationMethods(unittest.TestCase):
         self.assertTrue(np.all(attribution >= 0))
         self.assertTrue(np.all(attribution <= 1))
     
+    def test_lime_batch_matches_single(self):
+        """Testa LIME em lote, explicador em cache e mapeamento por índice"""
+        import lime.lime_tabular
+        
+        # 'F1' é substring de 'F10' e 'F11'
+        names = ['F1', 'F10', 'F11', 'F2']
+        methods = ApproximationMethods(self.model, names)
+        for target in (0, 1):
+            single = np.array([methods.lime_attribution(self.X, i, target=target) for i in range(3)])
+            np.testing.assert_allclose(methods.lime_attributions(self.X, range(3), batch_size=2,
+                                                                 target=target), single)
+        self.assertEqual(len(methods._lime_explainers), 1)
+        
+        fresh = lime.lime_tabular.LimeTabularExplainer(self.X, feature_names=names,
+                                                       class_names=['class_0', 'class_1'],
+                                                       mode='classification', random_state=42)
+        exp = fresh.explain_instance(self.X[2], self.model.predict_proba, num_features=4)
+        expected = np.zeros(4)
+        for i, score in exp.as_map()[1]:
+            expected[i] = abs(score)
+        np.testing.assert_allclose(single[2], expected / expected.sum())
+        
+        # Sem o amostrador privado do LIME fixado, o lote falha em vez de devolver atribuições uniformes
+        with mock.patch.object(lime.lime_tabular.LimeTabularExplainer,
+                               '_LimeTabularExplainer__data_inverse', None):
+            with self.assertRaises(RuntimeError):
+                methods.lime_attributions(self.X, range(3))
+    
+    def test_class_attributions_share_one_batch(self):
+        """Testa LIME e SHAP de todas as classes a partir das mesmas predições"""
+        X, y = make_classification(n_samples=150, n_features=4, n_informative=3, n_redundant=0,
+                                   n_classes=3, n_clusters_per_class=1, random_state=0)
+        model = CountingModel(RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y))
+        methods = ApproximationMethods(model, self.feature_names)
+        
+        model.reset()
+        lime_all = methods.lime_class_attributions(X, [0, 1], num_samples=500)
+        self.assertEqual(lime_all.shape, (2, 3, 4))
+        # Uma linha para descobrir as classes e um único lote de vizinhanças
+        self.assertEqual(model.calls, 2)
+        for target in range(3):
+            np.testing.assert_allclose(lime_all[:, target],
+                                       methods.lime_attributions(X, [0, 1], num_samples=500, target=target))
+        np.testing.assert_allclose(lime_all[0, 2],
+                                   methods.lime_class_attributions(X, [0], [2], num_samples=500)[0, 0])
+        
+        shap_all = methods.shap_class_attributions(X, [0, 1])
+        np.testing.assert_allclose(shap_all.sum(axis=2), 1)
+        for target in range(3):
+            np.testing.assert_allclose(shap_all[1, target], methods.shap_approximation(X, 1, target=target))
+        
+        np.random.seed(0)
+        sampled = methods.shap_class_attributions(X, [1], exact=False, num_samples=10)
+        np.random.seed(0)
+        np.testing.assert_allclose(sampled[0, 2], methods.shap_approximation(X, 1, target=2, exact=False,
+                                                                             num_samples=10))
+    
     def test_shap_approximation(self):
         """Testa aproximação SHAP"""
         attribution = self.approx_methods.shap_approximation(self.X, 0, num_samples=10)
@@ -54,6 +143,111 @@ class TestApproximationMethods(unittest.TestCase):
         self.assertEqual(attribution.shape, (4,))
         self.assertTrue(np.all(attribution >= 0))
         self.assertTrue(np.all(attribution <= 1))
+    
+    def test_shapley_values_match_exact(self):
+        """Testa o estimador de Shapley contra o valor exato com o mesmo background"""
+        instance = self.X[0]
+        background = self.X[:20]
+        
+        def value(subset):
+            rows = background.copy()
+            rows[:, list(subset)] = instance[list(subset)]
+            return self.model.predict_proba(rows)[:, 1].mean()
+        
+        exact = np.zeros(4)
+        for j in range(4):
+            others = [k for k in range(4) if k != j]
+            for r in range(4):
+                for subset in itertools.combinations(others, r):
+                    weight = math.factorial(r) * math.factorial(3 - r) / math.factorial(4)
+                    exact[j] += weight * (value(subset + (j,)) - value(subset))
+        
+        np.random.seed(0)
+        shapley = self.approx_methods.shapley_values(self.X, 0, num_samples=2000, background=background)
+        
+        self.assertEqual(shapley['n_evaluations'], 2000 * 5)
+        np.testing.assert_allclose(shapley['values'], exact, atol=5 * shapley['std_error'].max() + 1e-9)
+        self.assertAlmostEqual(shapley['values'].sum(), value(range(4)) - shapley['base_value'], delta=0.05)
+        
+        # O erro padrão informado acompanha a dispersão entre execuções
+        for antithetic in (True, False):
+            runs = [self.approx_methods.shapley_values(self.X, 0, num_samples=200, background=background,
+                                                       antithetic=antithetic) for _ in range(30)]
+            spread = np.std([run['values'] for run in runs], axis=0).sum()
+            reported = np.mean([run['std_error'] for run in runs], axis=0).sum()
+            self.assertLess(abs(np.log(spread / reported)), np.log(2))
+    
+    def test_prediction_pool(self):
+        """Testa que o pool deduplica linhas e reaproveita predições entre métodos"""
+        pool = PredictionPool(self.model)
+        rows = np.vstack([self.X[:5], self.X[:5], self.X[2:7]])
+        
+        np.testing.assert_allclose(pool.predict_proba(rows), self.model.predict_proba(rows))
+        np.testing.assert_array_equal(pool.predict(self.X[:7]), self.model.predict(self.X[:7]))
+        stats = pool.stats()
+        self.assertEqual(stats['rows_scored'], 7)
+        self.assertEqual(stats['model_calls'], 1)
+        self.assertEqual(stats['rows_requested'], 22)
+        
+        methods = ApproximationMethods(pool, self.feature_names)
+        np.random.seed(0)
+        pooled = methods.shap_approximation(self.X, 0, exact=False)
+        np.random.seed(0)
+        np.testing.assert_allclose(pooled, self.approx_methods.shap_approximation(self.X, 0, exact=False))
+        calls = pool.n_calls
+        np.random.seed(0)
+        methods.shap_approximation(self.X, 0, exact=False)
+        self.assertEqual(pool.n_calls, calls)
+    
+    def test_tree_shap_matches_xgboost_contribs(self):
+        """Testa TreeSHAP contra as contribuições exatas do próprio XGBoost"""
+        import xgboost as xgb
+        
+        X = self.X.copy()
+        X[::7, 1] = np.nan
+        model = xgb.XGBClassifier(n_estimators=20, max_depth=4).fit(X, self.y)
+        contribs = model.get_booster().predict(xgb.DMatrix(X), pred_contribs=True)
+        
+        explainer = TreeSHAP(model)
+        np.testing.assert_allclose(explainer.explain(X), contribs[:, :-1], atol=1e-5)
+        np.testing.assert_allclose(explainer.explain(X, target=0), -contribs[:, :-1], atol=1e-5)
+        self.assertAlmostEqual(float(explainer.expected_value[0]), float(contribs[0, -1]), places=5)
+    
+    def test_tree_shap_forest_local_accuracy(self):
+        """Testa que os valores da floresta somam a probabilidade e batem com o jogo exato"""
+        explainer = self.approx_methods.tree_explainer()
+        values = explainer.shap_values(self.X)
+        np.testing.assert_allclose(values.sum(axis=1) + explainer.expected_value,
+                                   self.model.predict_proba(self.X), atol=1e-10)
+        
+        # Jogo dependente de caminho: features fora de S seguem os dois ramos
+        # ponderados pela cobertura
+        def expectation(tree, node, x, S):
+            if tree.children_left[node] == -1:
+                return tree.value[node, 0] / tree.value[node, 0].sum()
+            left, right = tree.children_left[node], tree.children_right[node]
+            if tree.feature[node] in S:
+                child = left if np.float32(x[tree.feature[node]]) <= tree.threshold[node] else right
+                return expectation(tree, child, x, S)
+            weights = tree.weighted_n_node_samples
+            return (weights[left] * expectation(tree, left, x, S)
+                    + weights[right] * expectation(tree, right, x, S)) / weights[node]
+        
+        def value(S):
+            return np.mean([expectation(est.tree_, 0, x, S)[1] for est in self.model.estimators_])
+        
+        x, n = self.X[3], 4
+        exact = np.zeros(n)
+        for j in range(n):
+            others = [k for k in range(n) if k != j]
+            for size in range(n):
+                weight = math.factorial(size) * math.factorial(n - size - 1) / math.factorial(n)
+                for S in itertools.combinations(others, size):
+                    exact[j] += weight * (value(set(S) | {j}) - value(set(S)))
+        np.testing.assert_allclose(self.approx_methods.tree_shap_values(self.X, [3])[0], exact, atol=1e-10)
+        
+        attribution = self.approx_methods.shap_approximation(self.X, 3)
+        np.testing.assert_allclose(attribution, np.abs(exact) / np.abs(exact).sum())
 
 
 if __name__ == '__main__':
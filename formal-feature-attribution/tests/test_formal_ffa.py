@@ -1,14 +1,23 @@
 import unittest
+import itertools
 import numpy as np
 import sys
 import os
+import tempfile
 
 # Adiciona src ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from formal_ffa import FormalFFA, HeuristicFFA
+from smt_oracle import SMTOracle
+from verdict_cache import SubsetVerdictCache, subset_to_mask
+from interval_domain import IntervalDomain
+from feature_domain import FeatureDomain, FeatureDomains
+from signatures import group_instances, leaf_signatures
+from subset_store import PackedSubsetStore
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.datasets import make_classification
+from xgboost import XGBClassifier
 
 
 class TestFormalFFA(unittest.TestCase):
@@ -54,6 +63,43 @@ class TestFormalFFA(unittest.TestCase):
         self.assertEqual(scores.shape, (4,))
         self.assertTrue(np.all(scores >= 0))
         self.assertTrue(np.all(scores <= 1))
+        
+        formal_ffa = FormalFFA(self.model, self.feature_bounds, interval_domain=True)
+        scores = formal_ffa.compute_ffa(instance, target, n_combinations=10, method='random')
+        
+        self.assertEqual(scores.shape, (4,))
+        self.assertTrue(np.all(scores >= 0))
+        self.assertTrue(np.all(scores <= 1))
+        
+        scores = self.formal_ffa.compute_ffa(instance, target, n_combinations=10,
+                                             method='random')
+        
+        self.assertEqual(scores.shape, (4,))
+        self.assertTrue(np.all(scores >= 0))
+        self.assertTrue(np.all(scores <= 1))
+    
+    def test_check_axp_all_features_fixed(self):
+        """Testa que fixar todas as features garante a predição original"""
+        instance = np.array([0.5, 0.5, 0.5, 0.5])
+        target = self.model.predict([instance])[0]
+        
+        self.assertTrue(self.formal_ffa.check_axp(instance, {0, 1, 2, 3}, target))
+        self.assertTrue(self.formal_ffa.check_axp(instance, {0, 1, 2, 3}, target,
+                                                  batch_size=7))
+        self.assertFalse(self.formal_ffa.check_axp(instance, {0, 1, 2, 3}, 1 - target))
+    
+    def test_check_axp_batch(self):
+        """Testa verificação em lote de vários subconjuntos"""
+        instance = np.array([0.5, 0.5, 0.5, 0.5])
+        target = self.model.predict([instance])[0]
+        masks = np.array([[True] * 4, [False] * 4, [True, True, False, False]])
+        
+        verdicts = self.formal_ffa.check_axp_batch(instance, masks, target,
+                                                    n_samples=50, max_rows=60)
+        
+        self.assertEqual(verdicts.shape, (3,))
+        self.assertTrue(verdicts[0])
+        self.assertFalse(verdicts[1])
     
     def test_heuristic_ffa_output(self):
         """Testa saída do HeuristicFFA"""
@@ -66,6 +112,404 @@ class TestFormalFFA(unittest.TestCase):
         self.assertTrue(np.all(scores >= 0))
         # Verifica se scores são normalizados (soma ≈ 1)
         self.assertAlmostEqual(np.sum(scores), 1.0, places=5)
+    
+    def test_heuristic_ffa_chunking_is_equivalent(self):
+        """Testa que o tamanho dos lotes não altera o resultado"""
+        instance = np.array([0.5, 0.5, 0.5, 0.5])
+        
+        np.random.seed(0)
+        full = self.heuristic_ffa.compute(instance, 1, n_samples=30)
+        np.random.seed(0)
+        chunked = self.heuristic_ffa.compute(instance, 1, n_samples=30, chunk_size=7)
+        
+        np.testing.assert_allclose(full, chunked)
+    
+    def test_heuristic_ffa_feature_bounds(self):
+        """Testa perturbações proporcionais aos limites de features fora de [0, 1]"""
+        X, y = make_classification(n_samples=100, n_features=4, n_informative=2,
+                                   n_redundant=0, random_state=42)
+        X = (X - X.min(axis=0)) / (X.max(axis=0) - X.min(axis=0) + 1e-8)
+        scale = np.array([1.0, 38.0, 1.0, 10.0])
+        model = RandomForestClassifier(n_estimators=10, random_state=42).fit(X * scale, y)
+        heuristic_ffa = HeuristicFFA(model, [f'F{i}' for i in range(4)], 4,
+                                     [(0, s) for s in scale])
+        instance = np.array([0.5, 0.4, 0.5, 0.5])
+        
+        np.random.seed(0)
+        scaled = heuristic_ffa.compute(instance * scale, 1, n_samples=30)
+        np.random.seed(0)
+        np.testing.assert_allclose(scaled, self.heuristic_ffa.compute(instance, 1, n_samples=30))
+        
+        with self.assertRaises(ValueError):
+            HeuristicFFA(model, [f'F{i}' for i in range(4)], 4, [(0, 1)] * 3)
+    
+    def test_heuristic_ffa_all_classes(self):
+        """Testa que todas as classes saem das mesmas perturbações"""
+        instance = np.array([0.5, 0.5, 0.5, 0.5])
+        
+        np.random.seed(0)
+        scores = self.heuristic_ffa.compute_classes(instance, n_samples=30, chunk_size=7)
+        self.assertEqual(scores.shape, (2, 4))
+        for target in range(2):
+            np.random.seed(0)
+            np.testing.assert_allclose(scores[target],
+                                       self.heuristic_ffa.compute(instance, target, n_samples=30))
+    
+    def test_verdict_cache_reuses_monotone_verdicts(self):
+        """Testa que veredictos implicados por monotonicidade vêm do cache"""
+        instance = np.array([0.5, 0.5, 0.5, 0.5])
+        target = self.model.predict([instance])[0]
+        
+        self.assertTrue(self.formal_ffa.check_axp(instance, {0, 1, 2, 3}, target))
+        misses = self.formal_ffa.verdict_cache.misses
+        self.assertTrue(self.formal_ffa.check_axp(instance, {0, 1, 2, 3}, target))
+        self.assertEqual(self.formal_ffa.verdict_cache.misses, misses)
+        self.assertEqual(self.formal_ffa.verdict_cache.stats()['hits'], 1)
+    
+    def test_heuristic_explain_many_reports_failures(self):
+        """Testa o lote em paralelo com falhas isoladas por instância"""
+        X = np.random.RandomState(0).random_sample((4, 4))
+        targets = np.array([0, 1, 7, 1])
+        
+        result = self.heuristic_ffa.explain_many(X, targets, n_jobs=2, n_samples=5)
+        
+        self.assertEqual(result['attributions'].shape, (4, 4))
+        self.assertEqual(list(result['errors']), [2])
+        self.assertTrue(np.all(np.isnan(result['attributions'][2])))
+        self.assertTrue(np.all(np.isfinite(result['attributions'][[0, 1, 3]])))
+
+
+class TestSubsetVerdictCache(unittest.TestCase):
+    
+    def test_monotone_lookup(self):
+        """Testa respostas por superconjuntos válidos e subconjuntos inválidos"""
+        cache = SubsetVerdictCache()
+        cache.store('ctx', subset_to_mask({0, 1}), True)
+        cache.store('ctx', subset_to_mask({2}), False)
+        
+        self.assertTrue(cache.lookup('ctx', subset_to_mask({0, 1, 3})))
+        self.assertFalse(cache.lookup('ctx', subset_to_mask(set())))
+        self.assertIsNone(cache.lookup('ctx', subset_to_mask({0, 3})))
+        self.assertIsNone(cache.lookup('other', subset_to_mask({0, 1})))
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 2)
+    
+    def test_redundant_masks_and_eviction(self):
+        """Testa a remoção de máscaras redundantes e o limite de memória"""
+        cache = SubsetVerdictCache(max_entries=3)
+        cache.store('a', subset_to_mask({0, 1, 2}), True)
+        cache.store('a', subset_to_mask({0}), True)
+        self.assertEqual(len(cache), 1)
+        
+        cache.store('b', subset_to_mask({1}), True)
+        cache.store('b', subset_to_mask({2}), True)
+        cache.store('b', subset_to_mask({3}), True)
+        
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.lookup('a', subset_to_mask({0})))
+        self.assertTrue(cache.lookup('b', subset_to_mask({3})))
+
+
+class TestPackedSubsetStore(unittest.TestCase):
+    
+    def test_counts_and_containment(self):
+        """Testa contagens, popcount e testes de subconjunto em mais de 64 features"""
+        rng = np.random.RandomState(0)
+        masks = rng.random_sample((300, 130)) < 0.2
+        store = PackedSubsetStore(130, capacity=4)
+        store.extend(masks[:299])
+        store.add(np.flatnonzero(masks[299]))
+        
+        self.assertEqual(len(store), 300)
+        self.assertEqual(store.words.shape, (300, 3))
+        np.testing.assert_array_equal(store.to_bool(), masks)
+        np.testing.assert_array_equal(store.feature_counts(), masks.sum(axis=0))
+        np.testing.assert_array_equal(store.sizes(), masks.sum(axis=1))
+        self.assertEqual(next(iter(store)), set(np.flatnonzero(masks[0])))
+        
+        query = masks[7] | (rng.random_sample(130) < 0.5)
+        np.testing.assert_array_equal(store.contains_subset_of(query),
+                                      np.all(masks <= query, axis=1))
+        np.testing.assert_array_equal(store.contains_superset_of(masks[7]),
+                                      np.all(masks >= masks[7], axis=1))
+    
+    def test_save_and_load(self):
+        """Testa a gravação e a leitura dos subconjuntos"""
+        store = PackedSubsetStore(70)
+        store.add({0, 64, 69})
+        store.add({3})
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'axps.npz')
+            store.save(path)
+            loaded = PackedSubsetStore.load(path)
+        
+        self.assertEqual(list(loaded), [{0, 64, 69}, {3}])
+        np.testing.assert_allclose(loaded.scores(), store.scores())
+
+
+class TestFeatureDomains(unittest.TestCase):
+    
+    def setUp(self):
+        """Configuração para os testes"""
+        rng = np.random.RandomState(0)
+        # Quatro features binárias, uma contagem inteira e uma categórica
+        self.X = np.column_stack([
+            rng.randint(0, 2, size=(300, 4)),
+            rng.randint(0, 6, size=300),
+            rng.choice([2.0, 5.0, 7.0], size=300)
+        ]).astype(float)
+        y = ((self.X[:, 0] + self.X[:, 1] + (self.X[:, 4] > 2) + (self.X[:, 5] == 5)) >= 2).astype(int)
+        self.model = XGBClassifier(n_estimators=10, max_depth=3).fit(self.X, y)
+        self.domains = FeatureDomains.from_data(self.X, categorical_features=[5])
+    
+    def test_inferred_domains(self):
+        """Testa a inferência dos tipos de domínio a partir dos dados"""
+        self.assertEqual([d.kind for d in self.domains.domains],
+                         ['binary'] * 4 + ['integer', 'categorical'])
+        np.testing.assert_array_equal(self.domains.domains[4].values, np.arange(6))
+        np.testing.assert_array_equal(self.domains.domains[5].values, [2, 5, 7])
+        self.assertEqual(self.domains.n_combinations(np.array([True] * 4 + [False, False])), 18)
+        
+        continuous = FeatureDomains.from_data(np.column_stack([self.X[:, 0], np.linspace(0, 1, 300)]))
+        self.assertEqual(continuous.domains[1].kind, 'continuous')
+        self.assertIsNone(continuous.n_combinations(np.array([True, False])))
+        with self.assertRaises(ValueError):
+            FeatureDomain('ordinal')
+    
+    def test_exact_verdicts_match_brute_force(self):
+        """Testa que a enumeração dos domínios finitos dá o veredicto exato"""
+        formal_ffa = FormalFFA(self.model, self.domains.feature_bounds(), cache_size=None,
+                               domains=self.domains)
+        instance = self.X[3]
+        target = int(self.model.predict([instance])[0])
+        grid = np.array(list(itertools.product(*[d.values for d in self.domains.domains])))
+        grid_predictions = self.model.predict(grid)
+        
+        for r in range(0, 7):
+            for subset in itertools.combinations(range(6), r):
+                consistent = np.all(grid[:, list(subset)] == instance[list(subset)], axis=1)
+                expected = bool(np.all(grid_predictions[consistent] == target))
+                self.assertEqual(formal_ffa.check_axp(instance, set(subset), target, n_samples=5), expected)
+                
+                masks = formal_ffa._subset_mask(set(subset))[None, :]
+                self.assertEqual(bool(formal_ffa.check_axp_batch(instance, masks, target)[0]), expected)
+    
+    def test_sampling_uses_only_valid_values(self):
+        """Testa a amostragem de valores válidos quando o produto é grande"""
+        samples, exact = self.domains.perturbations(self.X[0], np.zeros(6, dtype=bool),
+                                                    n_samples=60, max_exact=10)
+        self.assertFalse(exact)
+        for j, domain in enumerate(self.domains.domains):
+            self.assertTrue(np.all(np.isin(samples[:, j], domain.values)))
+        self.assertEqual(sorted(np.unique(samples[:, 5], return_counts=True)[1]), [20, 20, 20])
+        
+        with self.assertRaises(ValueError):
+            FormalFFA(self.model, self.domains.feature_bounds()[:5], domains=self.domains)
+
+
+class TestSMTOracle(unittest.TestCase):
+    
+    def setUp(self):
+        """Configuração para os testes"""
+        X, y = make_classification(
+            n_samples=200, n_features=5, n_informative=3,
+            n_redundant=0, random_state=42
+        )
+        self.X = (X - X.min(axis=0)) / (X.max(axis=0) - X.min(axis=0) + 1e-8)
+        
+        self.model = XGBClassifier(n_estimators=25, max_depth=3, random_state=42)
+        self.model.fit(self.X, y)
+        
+        self.feature_bounds = [(0, 1)] * 5
+        self.oracle = SMTOracle(self.model, self.feature_bounds)
+    
+    def test_all_features_fixed_is_axp(self):
+        """Testa que fixar todas as features garante a predição"""
+        for instance in self.X[:5]:
+            target = self.model.predict([instance])[0]
+            self.assertTrue(self.oracle.is_axp(instance, set(range(5)), target))
+            self.assertFalse(self.oracle.is_axp(instance, set(range(5)), 1 - target))
+    
+    def test_counterexamples_change_prediction(self):
+        """Testa que os contraexemplos encontrados mudam a predição do modelo"""
+        rng = np.random.RandomState(0)
+        for instance in self.X[:10]:
+            target = self.model.predict([instance])[0]
+            subset = set(np.flatnonzero(rng.random_sample(5) < 0.5))
+            counterexample = self.oracle.find_counterexample(instance, subset, target)
+            
+            if counterexample is not None:
+                self.assertNotEqual(self.model.predict([counterexample])[0], target)
+                np.testing.assert_allclose(counterexample[list(subset)],
+                                           instance[list(subset)], rtol=1e-6)
+    
+    def test_formal_ffa_with_oracle(self):
+        """Testa que o FormalFFA usa o oráculo exato quando fornecido"""
+        formal_ffa = FormalFFA(self.model, self.feature_bounds, oracle=self.oracle)
+        instance = self.X[0]
+        target = self.model.predict([instance])[0]
+        masks = np.array([[True] * 5, [False] * 5])
+        
+        verdicts = formal_ffa.check_axp_batch(instance, masks, target)
+        
+        self.assertTrue(verdicts[0])
+        self.assertFalse(verdicts[1])
+        self.assertGreater(self.oracle.n_queries, 0)
+    
+    def test_marco_enumeration_matches_brute_force(self):
+        """Testa que a enumeração encontra exatamente as AXps mínimas"""
+        formal_ffa = FormalFFA(self.model, self.feature_bounds, oracle=self.oracle)
+        instance = self.X[3]
+        target = self.model.predict([instance])[0]
+        
+        valid = [set(s) for r in range(6) for s in itertools.combinations(range(5), r)
+                 if self.oracle.is_axp(instance, set(s), target)]
+        minimal = {frozenset(s) for s in valid if not any(v < s for v in valid)}
+        
+        explanations = list(formal_ffa.enumerate_explanations(instance, target))
+        axps = [frozenset(s) for kind, s in explanations if kind == 'axp']
+        cxps = [s for kind, s in explanations if kind == 'cxp']
+        
+        self.assertEqual(len(axps), len(set(axps)))
+        self.assertEqual(set(axps), minimal)
+        for axp in axps:
+            for cxp in cxps:
+                self.assertTrue(axp & cxp)
+        
+        expected = np.array([sum(j in a for a in minimal) for j in range(5)]) / len(minimal)
+        np.testing.assert_allclose(formal_ffa.compute_ffa(instance, target, None), expected)
+    
+    def test_anytime_ffa_snapshots(self):
+        """Testa os snapshots do FFA anytime e os limites de orçamento"""
+        formal_ffa = FormalFFA(self.model, self.feature_bounds, oracle=self.oracle)
+        instance = self.X[3]
+        target = self.model.predict([instance])[0]
+        
+        snapshots = list(formal_ffa.anytime_ffa(instance, target))
+        final = snapshots[-1]
+        
+        self.assertTrue(final['complete'])
+        self.assertEqual([s['n_axps'] for s in snapshots[:-1]],
+                         list(range(1, len(snapshots))))
+        np.testing.assert_allclose(final['scores'], formal_ffa.compute_ffa(instance, target, None))
+        
+        limited = list(formal_ffa.anytime_ffa(instance, target, max_axps=1))
+        self.assertEqual(limited[-1]['n_axps'], 1)
+        
+        timed = list(formal_ffa.anytime_ffa(instance, target, time_limit=0))
+        self.assertLessEqual(timed[-1]['n_axps'], 1)
+    
+    def test_quickxplain_cxp_first_and_checkpoints(self):
+        """Testa que QuickXplain com CXps primeiro produz o mesmo FFA e os instantes"""
+        linear = FormalFFA(self.model, self.feature_bounds, oracle=self.oracle)
+        quick = FormalFFA(self.model, self.feature_bounds, oracle=self.oracle, shrink='quickxplain')
+        instance = self.X[3]
+        target = self.model.predict([instance])[0]
+        
+        expected = linear.compute_ffa(instance, target, None)
+        final = list(quick.anytime_ffa(instance, target, prefer='cxp'))[-1]
+        np.testing.assert_allclose(final['scores'], expected)
+        
+        checkpoints = quick.timed_ffa(instance, target, [0, 60], prefer='cxp')
+        self.assertEqual(sorted(checkpoints), [0, 60])
+        self.assertTrue(checkpoints[60]['complete'])
+        np.testing.assert_allclose(checkpoints[60]['scores'], expected)
+    
+    def test_interval_domain_exact_verdicts(self):
+        """Testa que a enumeração exata de intervalos concorda com o oráculo SMT"""
+        formal_ffa = FormalFFA(self.model, self.feature_bounds, cache_size=None,
+                               interval_domain=True, max_exact=20000)
+        domain = formal_ffa.interval_domain
+        instance = self.X[7]
+        target = self.model.predict([instance])[0]
+        
+        for r in range(1, 5):
+            for subset in itertools.combinations(range(5), r):
+                mask = formal_ffa._subset_mask(set(subset))
+                if domain.n_combinations(mask) > formal_ffa.max_exact:
+                    continue
+                self.assertEqual(formal_ffa.check_axp(instance, set(subset), target),
+                                 self.oracle.is_axp(instance, set(subset), target))
+    
+    def test_interval_domain_stratified_sampling(self):
+        """Testa a amostragem estratificada quando o produto de intervalos é grande"""
+        domain = IntervalDomain([np.array([0.2, 0.5]), np.array([0.3])], [(0, 1), (0, 1)])
+        
+        samples, exact = domain.perturbations(np.array([0.9, 0.9]), np.array([False, False]),
+                                              n_samples=12, max_exact=4)
+        
+        self.assertFalse(exact)
+        self.assertEqual(sorted(np.unique(samples[:, 0], return_counts=True)[1]), [4, 4, 4])
+        
+        samples, exact = domain.perturbations(np.array([0.9, 0.9]), np.array([False, True]),
+                                              n_samples=12, max_exact=4)
+        
+        self.assertTrue(exact)
+        np.testing.assert_allclose(samples, [[0, 0.9], [0.2, 0.9], [0.5, 0.9]])
+    
+    def test_explain_many_preserves_order(self):
+        """Testa que o pool de processos devolve as atribuições na ordem de entrada"""
+        formal_ffa = FormalFFA(self.model, self.feature_bounds, oracle=self.oracle)
+        X = self.X[:6]
+        targets = self.model.predict(X)
+        
+        result = formal_ffa.explain_many(X, targets, n_jobs=3, n_combinations=None)
+        expected = [formal_ffa.compute_ffa(x, t, None) for x, t in zip(X, targets)]
+        
+        self.assertEqual(result['errors'], {})
+        np.testing.assert_allclose(result['attributions'], np.array(expected))
+    
+    def test_region_signatures_refine_leaves(self):
+        """Testa que instâncias na mesma região atingem as mesmas folhas"""
+        formal_ffa = FormalFFA(self.model, self.feature_bounds)
+        regions = formal_ffa.region_signatures(self.X)
+        leaves = leaf_signatures(self.model, self.X)
+        
+        _, region_groups = group_instances(regions)
+        for g in np.unique(region_groups):
+            members = np.flatnonzero(region_groups == g)
+            self.assertTrue(np.all(leaves[members] == leaves[members[0]]))
+        self.assertLessEqual(len(np.unique(leaves, axis=0)), region_groups.max() + 1)
+        
+        with self.assertRaises(ValueError):
+            FormalFFA(lambda X: X, self.feature_bounds).region_signatures(self.X)
+    
+    def test_explain_grouped_shares_region_explanations(self):
+        """Testa que instâncias da mesma região compartilham veredictos e explicações"""
+        formal_ffa = FormalFFA(self.model, self.feature_bounds, oracle=self.oracle)
+        X = self.X[:100]
+        targets = self.model.predict(X)
+        
+        representatives, groups = group_instances(formal_ffa.region_signatures(X), targets)
+        shared = np.flatnonzero(np.bincount(groups) > 1)
+        self.assertGreater(len(shared), 0)
+        first, second = np.flatnonzero(groups == shared[0])[:2]
+        
+        expected = formal_ffa.compute_ffa(X[first], targets[first], None)
+        hits = formal_ffa.verdict_cache.stats()['hits']
+        np.testing.assert_allclose(formal_ffa.compute_ffa(X[second], targets[second], None), expected)
+        self.assertGreater(formal_ffa.verdict_cache.stats()['hits'], hits)
+        
+        subset = [0, 1, 2, 3, 4]
+        received = {}
+        result = FormalFFA(self.model, self.feature_bounds, oracle=self.oracle).explain_grouped(
+            X[subset + [first, second]], targets[subset + [first, second]], n_jobs=1,
+            on_result=lambda i, attribution, error: received.__setitem__(i, attribution),
+            n_combinations=None)
+        isolated = [FormalFFA(self.model, self.feature_bounds, oracle=self.oracle).compute_ffa(x, t, None)
+                    for x, t in zip(X[subset + [first, second]], targets[subset + [first, second]])]
+        
+        self.assertEqual(result['errors'], {})
+        self.assertEqual(result['n_groups'], len(np.unique(result['groups'])))
+        self.assertEqual(result['groups'][-1], result['groups'][-2])
+        self.assertEqual(sorted(received), list(range(7)))
+        np.testing.assert_allclose(result['attributions'], np.array(isolated))
+        
+        leaf_result = formal_ffa.explain_grouped(X[:5], targets[:5], n_jobs=1, by='leaf')
+        self.assertEqual(leaf_result['attributions'].shape, (5, 5))
+        with self.assertRaises(ValueError):
+            formal_ffa.explain_grouped(X[:5], targets[:5], by='tree')
 
 
 if __name__ == '__main__':
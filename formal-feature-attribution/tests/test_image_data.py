@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Adiciona src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from image_data import load_image_dataset, parse_image_dataset, resize_images
+
+
+class TestImageData(unittest.TestCase):
+    
+    def test_parse_name(self):
+        """Testa a interpretação dos nomes usados em plots/img"""
+        self.assertEqual(parse_image_dataset('10,10_mnist_1v3'), ((10, 10), 'mnist', (1, 3)))
+        with self.assertRaises(ValueError):
+            parse_image_dataset('mnist_1v3')
+    
+    def test_resize_preserves_mean(self):
+        """Testa a redução e a ampliação por média de área"""
+        images = np.random.RandomState(0).random_sample((3, 28, 28))
+        
+        reduced = resize_images(images, (10, 10))
+        self.assertEqual(reduced.shape, (3, 10, 10))
+        np.testing.assert_allclose(reduced.mean(axis=(1, 2)), images.mean(axis=(1, 2)))
+        
+        blocks = resize_images(np.arange(4.0).reshape(1, 2, 2), (4, 4))
+        np.testing.assert_array_equal(blocks[0, :2, :2], 0)
+        np.testing.assert_array_equal(blocks[0, 2:, 2:], 3)
+    
+    def test_load_digits_pair(self):
+        """Testa o carregamento de um par de dígitos sem download"""
+        data = load_image_dataset('10,10_digits_1v3', binarize=True)
+        
+        self.assertEqual(data['X_train'].shape[1], 100)
+        self.assertEqual(len(data['feature_bounds']), 100)
+        self.assertEqual(set(np.unique(data['X_test'])), {0.0, 1.0})
+        self.assertEqual(set(np.unique(data['y_train'])), {0, 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
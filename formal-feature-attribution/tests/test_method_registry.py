@@ -0,0 +1,181 @@
+import unittest
+import json
+import tempfile
+import warnings
+import numpy as np
+import subprocess
+import sys
+import os
+
+# Adiciona src ao path
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.append(SRC)
+
+import method_registry
+from unittest import mock
+from approximation_methods import ApproximationMethods
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.datasets import make_classification
+
+
+# Executado em um interpretador novo: importa os módulos de atribuição,
+# explica com os métodos FFA e informa o tempo e as dependências carregadas
+STARTUP_SCRIPT = """
+import json, sys, time
+
+def heavy():
+    return [m for m in ('sklearn', 'scipy', 'lime', 'matplotlib', 'seaborn', 'z3', 'xgboost', 'pandas')
+            if m in sys.modules]
+
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import method_registry, formal_ffa, approximation_methods, profiling, utils.metrics
+imported = time.perf_counter() - start
+loaded = {'import': heavy()}
+
+import numpy as np
+
+class Threshold:
+    def predict(self, X):
+        return (np.asarray(X)[:, 0] > 0.5).astype(int)
+    def predict_proba(self, X):
+        p = np.clip(np.asarray(X)[:, 0], 0, 1)
+        return np.column_stack([1 - p, p])
+
+X = np.random.RandomState(0).random_sample((3, 4))
+method_registry.explain('heuristic', Threshold(), X, n_samples=10)
+loaded['heuristic'] = heavy()
+method_registry.explain('formal', Threshold(), X, n_combinations=3)
+loaded['formal'] = heavy()
+print(json.dumps({'import': imported, 'total': time.perf_counter() - start, 'loaded': loaded}))
+"""
+
+
+class TestMethodRegistry(unittest.TestCase):
+    
+    def setUp(self):
+        """Configuração para os testes"""
+        X, y = make_classification(
+            n_samples=100, n_features=4, n_informative=3, n_redundant=0,
+            n_classes=3, n_clusters_per_class=1, random_state=0
+        )
+        self.X = (X - X.min(axis=0)) / (X.max(axis=0) - X.min(axis=0) + 1e-8)
+        self.y = y
+        self.model = RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X, y)
+    
+    def test_cold_start_is_light(self):
+        """Testa que importar e explicar com FFA não carrega dependências pesadas"""
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, os.path.abspath(SRC)],
+                                capture_output=True, text=True, check=True).stdout
+        startup = json.loads(output.strip().splitlines()[-1])
+        
+        self.assertEqual(startup['loaded']['import'], [])
+        self.assertEqual(startup['loaded']['heuristic'], [])
+        # A enumeração de AXps (MARCO) usa o z3, carregado só pelo FFA formal
+        self.assertEqual(startup['loaded']['formal'], ['z3'])
+        # lime + scikit-learn sozinhos levam mais de um segundo para importar;
+        # limites folgados para máquinas lentas, ajustáveis com FFA_STARTUP_LIMIT
+        # (segundos para importar; o dobro para importar e explicar)
+        limit = float(os.environ.get('FFA_STARTUP_LIMIT', 5.0))
+        self.assertLess(startup['import'], limit)
+        self.assertLess(startup['total'], 2 * limit)
+    
+    def test_builtin_methods(self):
+        """Testa os métodos embutidos pelo nome e a classe alvo de cada instância"""
+        self.assertEqual(set(method_registry.available()),
+                         {'formal', 'heuristic', 'lime', 'shap', 'permutation'})
+        X = self.X[:4]
+        targets = np.array([0, 2, 1, 2])
+        
+        for name in method_registry.available():
+            options = {'n_combinations': 3} if name == 'formal' else {}
+            result = method_registry.explain(name, self.model, X, targets, **options)
+            self.assertEqual(result['attributions'].shape, (4, 4), name)
+            self.assertEqual(result['errors'], {}, name)
+        
+        methods = ApproximationMethods(self.model, [f'F{i}' for i in range(4)])
+        shap = method_registry.explain('shap', self.model, X, targets)['attributions']
+        for i, target in enumerate(targets):
+            np.testing.assert_allclose(shap[i], methods.shap_approximation(X, i, target=int(target)))
+        
+        lime = method_registry.explain('lime', self.model, X, targets, num_samples=500)['attributions']
+        np.testing.assert_allclose(lime[1], methods.lime_attributions(X, [1], num_samples=500, target=2)[0])
+        
+        with self.assertRaises(KeyError):
+            method_registry.get('anchors')
+    
+    def test_labels_mapped_to_columns(self):
+        """Testa rótulos que não começam em 0: colunas de predict_proba via classes_"""
+        y = np.where(self.y == 0, 1, 2)
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(self.X, y)
+        X = self.X[:4]
+        targets = np.array([1, 2, 2, 1])
+        np.testing.assert_array_equal(method_registry.class_columns(model, targets), [0, 1, 1, 0])
+        
+        methods = ApproximationMethods(model, [f'F{i}' for i in range(4)])
+        shap = method_registry.explain('shap', model, X, targets)
+        self.assertEqual(shap['errors'], {})
+        for i, target in enumerate(targets):
+            np.testing.assert_allclose(shap['attributions'][i],
+                                       methods.shap_approximation(X, i, target=int(target) - 1))
+        
+        for name in ('lime', 'heuristic'):
+            options = {'num_samples': 200} if name == 'lime' else {'n_samples': 5}
+            result = method_registry.explain(name, model, X, targets, **options)
+            self.assertEqual(result['errors'], {}, name)
+            self.assertFalse(np.allclose(result['attributions'], 0.25), name)
+        
+        formal = method_registry.explain('formal', model, X, n_combinations=3)
+        self.assertEqual(formal['errors'], {})
+        
+        # Rótulos que não são classes do modelo falham em vez de explicar outra classe
+        targets = np.array([1, 0, 2, 3])
+        for name in ('shap', 'lime', 'heuristic'):
+            options = {'num_samples': 200} if name == 'lime' else {}
+            result = method_registry.explain(name, model, X, targets, **options)
+            self.assertEqual(sorted(result['errors']), [1, 3], name)
+            self.assertTrue(np.all(np.isnan(result['attributions'][[1, 3]])), name)
+            self.assertTrue(np.all(np.isfinite(result['attributions'][[0, 2]])), name)
+    
+    def test_plugin_loaded_on_first_use(self):
+        """Testa o registro de plugins por 'módulo:função' importados no primeiro uso"""
+        spec = method_registry.register('global_permutation', 'method_registry:explain_permutation',
+                                        'Permutação registrada como plugin')
+        self.addCleanup(method_registry._methods.pop, 'global_permutation')
+        
+        self.assertFalse(spec.loaded)
+        self.assertIn('global_permutation', method_registry.available())
+        result = method_registry.explain('global_permutation', self.model, self.X, y=self.y, n_repeats=2)
+        self.assertTrue(spec.loaded)
+        self.assertEqual(result['attributions'].shape, self.X.shape)
+        np.testing.assert_allclose(result['attributions'][0], result['attributions'][-1])
+        
+        with self.assertRaises(ValueError):
+            method_registry.register('global_permutation', 'method_registry:explain_permutation')
+    
+    def test_discover_entry_points(self):
+        """Testa a descoberta de plugins anunciados como entry points (Python 3.9 e 3.10+)"""
+        group = 'formal_feature_attribution.test_methods'
+        with tempfile.TemporaryDirectory() as tmp:
+            dist_info = os.path.join(tmp, 'ffa_test_plugin-1.0.dist-info')
+            os.makedirs(dist_info)
+            with open(os.path.join(dist_info, 'METADATA'), 'w') as f:
+                f.write('Metadata-Version: 2.1\nName: ffa-test-plugin\nVersion: 1.0\n')
+            with open(os.path.join(dist_info, 'entry_points.txt'), 'w') as f:
+                f.write(f'[{group}]\nplugin_permutation = method_registry:explain_permutation\n')
+            sys.path.insert(0, tmp)
+            self.addCleanup(sys.path.remove, tmp)
+            
+            for version in ((3, 9), sys.version_info):
+                with mock.patch.object(sys, 'version_info', version), warnings.catch_warnings():
+                    # SelectableGroups.get é obsoleto no 3.10 e 3.11
+                    warnings.simplefilter('ignore', DeprecationWarning)
+                    self.assertEqual(method_registry.discover(group), ['plugin_permutation'])
+                self.assertFalse(method_registry._methods['plugin_permutation'].loaded)
+                method_registry._methods.pop('plugin_permutation')
+        
+        self.assertEqual(method_registry.discover('formal_feature_attribution.missing'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+import sys
+import os
+from scipy.stats import kendalltau, spearmanr
+
+# Adiciona src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.metrics import (kendall_tau_rows, spearman_rows, top_k_overlap_rows, manhattan_rows,
+                           rbo_rows, compare_attributions, calculate_manhattan_distance, PAIRWISE_METRICS)
+
+
+class TestMetrics(unittest.TestCase):
+    
+    def setUp(self):
+        """Configuração para os testes"""
+        rng = np.random.RandomState(0)
+        # Valores discretos para gerar empates
+        self.A = rng.randint(0, 4, size=(40, 6)).astype(float)
+        self.B = rng.randint(0, 4, size=(40, 6)).astype(float)
+        self.A[0] = 1.0
+    
+    def test_correlations_match_scipy(self):
+        """Testa Kendall tau-b e Spearman contra o scipy, inclusive com empates"""
+        expected_tau = np.nan_to_num([kendalltau(a, b)[0] for a, b in zip(self.A, self.B)])
+        np.testing.assert_allclose(kendall_tau_rows(self.A, self.B, max_elements=100), expected_tau, atol=1e-12)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rows = [spearmanr(a, b)[0] if np.ptp(a) > 0 else np.nan for a, b in zip(self.A, self.B)]
+        np.testing.assert_allclose(spearman_rows(self.A, self.B), np.nan_to_num(rows), atol=1e-12)
+    
+    def test_ranking_overlaps(self):
+        """Testa top-k, RBO e Manhattan contra definições diretas"""
+        a = np.array([[0.5, 0.3, 0.1, 0.1]])
+        b = np.array([[0.1, 0.3, 0.5, 0.1]])
+        self.assertAlmostEqual(top_k_overlap_rows(a, b, k=2)[0], 0.5)
+        self.assertAlmostEqual(manhattan_rows(a, b)[0], calculate_manhattan_distance(a[0], b[0]))
+        np.testing.assert_allclose(rbo_rows(self.A, self.A), 1.0)
+        
+        # RBO extrapolado pela definição, profundidade a profundidade
+        p = 0.8
+        order_a, order_b = [0, 1, 2, 3], [2, 1, 0, 3]
+        overlap = [len(set(order_a[:d]) & set(order_b[:d])) / d for d in range(1, 5)]
+        expected = overlap[-1] * p ** 4 + (1 - p) / p * sum(x * p ** d for d, x in enumerate(overlap, 1))
+        self.assertAlmostEqual(rbo_rows(a, b, p=p)[0], expected)
+    
+    def test_compare_attributions_table(self):
+        """Testa a tabela longa com todos os pares de métodos"""
+        methods = {'ffa': self.A, 'lime': self.B, 'shap': self.A[::-1]}
+        table = compare_attributions(methods, k=2, instances=np.arange(100, 140))
+        
+        self.assertEqual(len(table), 3 * 40)
+        self.assertEqual(list(table.columns), ['instance', 'method_a', 'method_b', *PAIRWISE_METRICS])
+        pair = table[(table.method_a == 'ffa') & (table.method_b == 'lime')]
+        np.testing.assert_array_equal(pair['instance'], np.arange(100, 140))
+        np.testing.assert_allclose(pair['kendall'], kendall_tau_rows(self.A, self.B))
+        
+        with self.assertRaises(ValueError):
+            compare_attributions({'ffa': self.A, 'lime': self.B[:, :3]})
+
+
+if __name__ == '__main__':
+    unittest.main()
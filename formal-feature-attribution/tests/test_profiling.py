@@ -0,0 +1,104 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+# Adiciona src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import profiling
+from approximation_methods import ApproximationMethods
+from formal_ffa import FormalFFA
+from profiling import Profiler, ProfiledModel
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.datasets import make_classification
+
+
+class TestProfiling(unittest.TestCase):
+    
+    def setUp(self):
+        """Configuração para os testes"""
+        X, y = make_classification(
+            n_samples=100, n_features=4, n_informative=2,
+            n_redundant=0, random_state=42
+        )
+        self.X = (X - X.min(axis=0)) / (X.max(axis=0) - X.min(axis=0) + 1e-8)
+        self.y = y
+        self.model = RandomForestClassifier(n_estimators=10, random_state=42).fit(self.X, y)
+    
+    def tearDown(self):
+        profiling.disable()
+    
+    def test_disabled_is_transparent(self):
+        """Testa que, sem Profiler ativo, nada é registrado nem envolvido"""
+        self.assertIsNone(profiling.active())
+        self.assertIs(profiling.profiled(self.model), self.model)
+        
+        with profiling.stage('noop', size=3):
+            pass
+        
+        formal_ffa = FormalFFA(self.model, [(0, 1)] * 4)
+        scores = formal_ffa.compute_ffa(self.X[0], int(self.model.predict(self.X[:1])[0]), n_combinations=5)
+        self.assertEqual(scores.shape, (4,))
+        self.assertIsNone(profiling.active())
+    
+    def test_stages_and_model_calls(self):
+        """Testa etapas aninhadas e a contagem de chamadas e linhas do modelo"""
+        profiler = profiling.enable()
+        model = profiling.profiled(self.model)
+        self.assertIsInstance(model, ProfiledModel)
+        
+        formal_ffa = FormalFFA(model, [(0, 1)] * 4)
+        target = int(self.model.predict(self.X[:1])[0])
+        with profiling.stage('experiment', dataset='test'):
+            formal_ffa.compute_ffa(self.X[0], target, n_combinations=5)
+        methods = ApproximationMethods(model, [f'F{i}' for i in range(4)])
+        methods.permutation_scores(self.X, self.y, n_repeats=2, n_jobs=2)
+        
+        summary = profiler.summary()
+        stages = summary['stages']
+        self.assertEqual(stages['experiment']['count'], 1)
+        self.assertEqual(stages['formal.compute_ffa']['count'], 1)
+        self.assertEqual(stages['permutation']['count'], 1)
+        self.assertGreater(stages['formal.verify_subset']['count'], 0)
+        self.assertLessEqual(stages['formal.compute_ffa']['total'], stages['experiment']['total'])
+        
+        calls = summary['models']
+        self.assertEqual(sum(entry['calls'] for entry in calls.values()), model.calls)
+        self.assertEqual(sum(entry['rows'] for entry in calls.values()), model.rows)
+        self.assertIn('model.predict', calls)
+    
+    def test_export_json_and_chrome_trace(self):
+        """Testa a exportação do resumo e dos eventos trace-event"""
+        profiler = Profiler()
+        profiling.enable(profiler)
+        model = ProfiledModel(self.model, 'forest')
+        with profiling.stage('outer', n=2):
+            model.predict_proba(self.X[:10])
+            model.predict(self.X[:5])
+        self.assertIs(profiling.disable(), profiler)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler.save_trace(os.path.join(tmp, 'trace.json'))
+            profiler.save_json(os.path.join(tmp, 'profile.json'))
+            with open(os.path.join(tmp, 'trace.json')) as f:
+                trace = json.load(f)
+            with open(os.path.join(tmp, 'profile.json')) as f:
+                profile = json.load(f)
+        
+        events = {event['name']: event for event in trace['traceEvents']}
+        self.assertEqual(set(events), {'outer', 'forest.predict_proba', 'forest.predict'})
+        self.assertTrue(all(event['ph'] == 'X' and event['dur'] >= 0 for event in events.values()))
+        self.assertEqual(events['outer']['args'], {'n': 2})
+        self.assertEqual(events['forest.predict_proba']['args'], {'rows': 10})
+        self.assertLessEqual(events['outer']['ts'], events['forest.predict_proba']['ts'])
+        
+        self.assertEqual(profile['summary']['models']['forest.predict'],
+                         {'calls': 1, 'rows': 5, 'time': profile['summary']['models']['forest.predict']['time']})
+        self.assertEqual(len(profile['events']), 3)
+        self.assertIn('forest.predict', profiler.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
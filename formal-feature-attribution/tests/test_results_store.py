@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+import sys
+import os
+import tempfile
+
+# Adiciona src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from results_store import ResultsStore
+
+
+class TestResultsStore(unittest.TestCase):
+    
+    def setUp(self):
+        """Configuração para os testes"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'results', 'results.jsonl')
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_resume(self):
+        """Testa que unidades gravadas são reconhecidas ao reabrir o arquivo"""
+        store = ResultsStore(self.path)
+        store.append('ds', 3, 'formal', np.array([0.5, 0.25, 0.25]))
+        store.append('ds', None, 'performance', train_accuracy=0.9, test_accuracy=0.8)
+        
+        reopened = ResultsStore(self.path)
+        self.assertTrue(reopened.has('ds', 3, 'formal'))
+        self.assertTrue(reopened.has('ds', None, 'performance'))
+        self.assertFalse(reopened.has('ds', 3, 'lime'))
+        
+        attributions = reopened.attributions('ds', 'formal')
+        np.testing.assert_allclose(attributions[3], [0.5, 0.25, 0.25])
+        
+        performance = next(reopened.iter_records(method='performance'))
+        self.assertEqual(performance['test_accuracy'], 0.8)
+    
+    def test_partial_line(self):
+        """Testa a recuperação após uma escrita interrompida"""
+        store = ResultsStore(self.path)
+        store.append('ds', 0, 'formal', np.ones(2))
+        with open(self.path, 'a') as f:
+            f.write('{"dataset": "ds", "instance": 1, "met')
+        
+        store = ResultsStore(self.path)
+        self.assertFalse(store.has('ds', 1, 'formal'))
+        store.append('ds', 1, 'formal', np.zeros(2))
+        
+        self.assertEqual(sorted(ResultsStore(self.path).attributions('ds', 'formal')), [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
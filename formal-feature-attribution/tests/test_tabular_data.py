@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+import sys
+import os
+import tempfile
+
+# Adiciona src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tabular_data import discover_datasets, load_tabular
+
+
+class TestTabularData(unittest.TestCase):
+    
+    def setUp(self):
+        """Configuração para os testes"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        for split, rows in (('complete', 6), ('train', 4)):
+            dataset_dir = os.path.join(self.root, split, 'toy')
+            os.makedirs(dataset_dir)
+            with open(os.path.join(dataset_dir, 'toy.csv'), 'w') as f:
+                f.write('age,color,score,label\n')
+                for i in range(rows):
+                    f.write(f"{20 + i},{'red' if i % 2 else 'blue'},{i * 0.5},{i % 2}\n")
+            with open(os.path.join(dataset_dir, 'toy_data.csv'), 'w') as f:
+                f.write('ignored\n1\n')
+        with open(os.path.join(self.root, 'complete', 'toy', 'toy.csv.catcol'), 'w') as f:
+            f.write('1\n')
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_discover(self):
+        """Testa a descoberta dos datasets e a escolha do CSV principal"""
+        datasets = discover_datasets(self.root)
+        self.assertEqual(sorted(datasets['toy']), ['complete', 'train'])
+        self.assertTrue(datasets['toy']['complete'].endswith('toy.csv'))
+    
+    def test_columnar_cache(self):
+        """Testa tipos, limites e reutilização do cache mapeado em memória"""
+        dataset = load_tabular('toy', 'complete', root=self.root)
+        
+        self.assertEqual(dataset.feature_names, ['age', 'color', 'score'])
+        self.assertEqual(dataset.categorical_features, [1])
+        self.assertEqual(dataset.categories[1], ['blue', 'red'])
+        self.assertEqual(dataset.feature_bounds(), [(20.0, 25.0), (0.0, 1.0), (0.0, 2.5)])
+        np.testing.assert_array_equal(dataset.X[:, 1], [0, 1, 0, 1, 0, 1])
+        np.testing.assert_array_equal(dataset.y, [0, 1, 0, 1, 0, 1])
+        self.assertTrue(np.issubdtype(dataset.columns[0].dtype, np.integer))
+        
+        reloaded = load_tabular('toy', 'complete', root=self.root)
+        self.assertIsInstance(reloaded.columns[0], np.memmap)
+        np.testing.assert_array_equal(reloaded.X, dataset.X)
+    
+    def test_categories_shared_across_splits(self):
+        """Testa que a mesma categoria tem o mesmo código em todas as divisões"""
+        dataset_dir = os.path.join(self.root, 'test', 'toy')
+        os.makedirs(dataset_dir)
+        with open(os.path.join(dataset_dir, 'toy.csv'), 'w') as f:
+            f.write('age,color,score,label\n30,red,1.0,1\n31,green,1.5,0\n')
+        
+        train = load_tabular('toy', 'train', root=self.root)
+        test = load_tabular('toy', 'test', root=self.root)
+        
+        self.assertEqual(train.categories[1], ['blue', 'green', 'red'])
+        self.assertEqual(test.categories[1], train.categories[1])
+        np.testing.assert_array_equal(train.X[:, 1], [0, 2, 0, 2])
+        np.testing.assert_array_equal(test.X[:, 1], [2, 1])
+        self.assertEqual(test.feature_bounds()[1], (1.0, 2.0))
+        
+        # Uma nova categoria em outra divisão invalida o cache desta
+        with open(os.path.join(dataset_dir, 'toy.csv'), 'a') as f:
+            f.write('32,amber,2.0,1\n')
+        train = load_tabular('toy', 'train', root=self.root)
+        self.assertEqual(train.categories[1], ['amber', 'blue', 'green', 'red'])
+        np.testing.assert_array_equal(train.X[:, 1], [1, 3, 1, 3])
+    
+    def test_missing_dataset(self):
+        """Testa o erro para datasets inexistentes"""
+        with self.assertRaises(ValueError):
+            load_tabular('toy', 'test', root=self.root)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Adiciona src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tree_evaluator import CompiledTreeEnsemble
+from formal_ffa import FormalFFA, HeuristicFFA
+from sklearn.datasets import make_classification
+from xgboost import XGBClassifier
+
+
+class TestCompiledTreeEnsemble(unittest.TestCase):
+    
+    def setUp(self):
+        """Configuração para os testes"""
+        X, y = make_classification(
+            n_samples=300, n_features=6, n_informative=4,
+            n_redundant=0, n_classes=3, n_clusters_per_class=1, random_state=42
+        )
+        self.X = (X - X.min(axis=0)) / (X.max(axis=0) - X.min(axis=0) + 1e-8)
+        self.y = y
+        self.X_eval = np.random.RandomState(0).random_sample((500, 6))
+    
+    def _assert_matches(self, model):
+        compiled = CompiledTreeEnsemble(model, chunk_size=128)
+        
+        np.testing.assert_array_equal(compiled.predict(self.X_eval), model.predict(self.X_eval))
+        np.testing.assert_allclose(compiled.predict_proba(self.X_eval),
+                                   model.predict_proba(self.X_eval), rtol=1e-5, atol=1e-6)
+        np.testing.assert_array_equal(compiled.apply(self.X_eval), model.apply(self.X_eval))
+    
+    def test_binary_booster(self):
+        """Testa predições idênticas às do booster binário"""
+        model = XGBClassifier(n_estimators=25, max_depth=3, random_state=42)
+        model.fit(self.X, self.y == 0)
+        self._assert_matches(model)
+    
+    def test_multiclass_booster(self):
+        """Testa predições idênticas às do booster multiclasse"""
+        model = XGBClassifier(n_estimators=20, max_depth=4, random_state=42)
+        model.fit(self.X, self.y)
+        self._assert_matches(model)
+    
+    def test_missing_values(self):
+        """Testa a direção padrão para valores ausentes"""
+        X_train = self.X.copy()
+        X_train[::7, 2] = np.nan
+        model = XGBClassifier(n_estimators=10, max_depth=3, random_state=42)
+        model.fit(X_train, self.y == 1)
+        
+        X_eval = self.X_eval.copy()
+        X_eval[::3, 2] = np.nan
+        compiled = CompiledTreeEnsemble(model)
+        
+        np.testing.assert_array_equal(compiled.predict(X_eval), model.predict(X_eval))
+    
+    def test_drop_in_model(self):
+        """Testa o uso como modelo em FormalFFA e HeuristicFFA"""
+        model = XGBClassifier(n_estimators=25, max_depth=3, random_state=42)
+        model.fit(self.X, self.y == 0)
+        compiled = CompiledTreeEnsemble(model)
+        instance = self.X[0]
+        target = int(compiled.predict([instance])[0])
+        
+        formal_ffa = FormalFFA(compiled, [(0, 1)] * 6)
+        heuristic_ffa = HeuristicFFA(compiled, [f'F{i}' for i in range(6)], 6)
+        
+        self.assertTrue(formal_ffa.check_axp(instance, set(range(6)), target))
+        self.assertEqual(formal_ffa.compute_ffa(instance, target).shape, (6,))
+        self.assertEqual(heuristic_ffa.compute(instance, target, n_samples=10).shape, (6,))
+
+
+if __name__ == '__main__':
+    unittest.main()